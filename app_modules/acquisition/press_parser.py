@@ -0,0 +1,122 @@
+"""Press frame parser - turns the raw press byte stream into PressData as reports complete"""
+
+#%% Dependencies:
+
+import re
+from datetime import date
+from typing import Any, List, Optional
+
+#%% Constants:
+
+# Fields are located with bytes.find() on their labels, then read with an anchored match (no full-line scans):
+LOAD_LABEL = b"Fm ["                                                    # "Fm [ kN    ]: 45.32" -> load (kN)
+LOAD_VALUE_PATTERN = re.compile(rb" *kN *\]: *(\d+(?:\.\d+)?)")
+STRENGTH_LABEL = b"Rm ["                                                # "Rm [ MPa   ]: 20.14" -> strength (MPa)
+STRENGTH_VALUE_PATTERN = re.compile(rb" *MPa *\]: *(\d+(?:\.\d+)?)")
+DATE_PATTERN = re.compile(rb"(\d{2})/(\d{2})/(\d{2})\s+\d{2}:\d{2}:\d{2}")  # "04/02/25       14:34:36" (DD/MM/YY)
+
+LINE_BREAK_PATTERN = re.compile(rb"[\r\n]")
+MAX_PENDING_BYTES = 4096  # A line longer than this is garbage (e.g., wrong baud rate) and is dropped
+
+#%% Press Frame Parser:
+
+class PressFrameParser:
+    """Incremental parser: feed() arbitrary byte chunks, get PressData for every completed report"""
+
+    def __init__(self, press_data_class: type,  # PressData
+                 load_decimals: int = 0,
+                 strength_decimals: int = 2):
+        """Initialize parser state"""
+
+        self.PressData = press_data_class
+        self.load_decimals = load_decimals
+        self.strength_decimals = strength_decimals
+
+        self.last_test_date: Optional[date] = None  # Date printed with the most recently emitted report
+        self.reset()
+
+
+    def reset(self) -> None:
+        """Drop partial lines and partially collected report fields"""
+
+        self._pending = b""
+        self._load = None
+        self._strength = None
+        self._test_date = None
+
+
+    def feed(self, chunk: bytes) -> List[Any]:  # PressData for each report completed by this chunk
+        """Consume a raw chunk (partial lines allowed)"""
+
+        # Mid-line chunk (the common case at serial read sizes) - just accumulate:
+        if b"\n" not in chunk and b"\r" not in chunk:
+            self._pending += chunk
+            if len(self._pending) > MAX_PENDING_BYTES:
+                self._pending = b""
+            return []
+
+        data = self._pending + chunk if self._pending else chunk
+        lines = LINE_BREAK_PATTERN.split(data)
+        self._pending = lines.pop()  # Last element is the unterminated remainder
+
+        if len(self._pending) > MAX_PENDING_BYTES:
+            self._pending = b""
+
+        results = []
+        for line in lines:
+            if line:
+                result = self._parse_line(line)
+                if result is not None:
+                    results.append(result)
+
+        return results
+
+
+    def feed_line(self, line: bytes) -> Optional[Any]:  # PressData if the line completed a report
+        """Consume one already-framed line (e.g., a SerialFrame payload)"""
+
+        results = self.feed(line + b"\n")
+        return results[-1] if results else None
+
+
+    def _parse_line(self, line: bytes) -> Optional[Any]:
+        """Collect fields from a complete line; emit once load and strength are both known"""
+
+        position = line.find(LOAD_LABEL)
+        if position >= 0:
+            match = LOAD_VALUE_PATTERN.match(line, position + len(LOAD_LABEL))
+            if match:
+                self._load = float(match.group(1))
+
+        position = line.find(STRENGTH_LABEL)
+        if position >= 0:
+            match = STRENGTH_VALUE_PATTERN.match(line, position + len(STRENGTH_LABEL))
+            if match:
+                self._strength = float(match.group(1))
+
+        # Every "/" is a date candidate (other fields may contain one, e.g. "N/mm²" before the date):
+        position = line.find(b"/", 2)
+        while position >= 0:
+            match = DATE_PATTERN.match(line, position - 2)
+            if match:
+                day, month, year = match.groups()
+                try:
+                    self._test_date = date(2000 + int(year), int(month), int(day))
+                except ValueError:
+                    self._test_date = None
+                break
+            position = line.find(b"/", position + 1)
+
+        if self._load is None or self._strength is None:
+            return None
+
+        press_data = self.PressData(load=self._load * 1000.0,  # kN -> N
+                                    strength=self._strength,    # MPa == N/mm²
+                                    load_decimals=self.load_decimals,
+                                    strength_decimals=self.strength_decimals)
+
+        self.last_test_date = self._test_date
+        self._load = self._strength = self._test_date = None
+        return press_data
+
+#%%
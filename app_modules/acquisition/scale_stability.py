@@ -0,0 +1,122 @@
+"""Scale stability detector - decides when a live mass stream has settled (WeightStable? decision)"""
+
+#%% Dependencies:
+
+from collections import deque
+from typing import Any, Optional
+
+#%% Constants:
+
+EMPTY = "empty"        # Nothing (or less than min_load) on the scale
+SETTLING = "settling"  # Specimen placed, readings still moving
+STABLE = "stable"      # Window satisfied the thresholds - reading committed
+LIFTED = "lifted"      # Specimen removed before a stable reading was committed
+OCCUPIED = "occupied"  # The previous specimen is still on the scale - nothing is measured until it leaves
+
+#%% Stability Detector:
+
+class ScaleStabilityDetector:
+    """Sliding-window variance/drift check over consecutive scale readings, updated in O(1) per sample"""
+
+    def __init__(self, window_size: int = 5,      # Consecutive samples that must agree
+                 max_std: float = 0.002,          # Maximum standard deviation inside the window (kg)
+                 max_drift: float = 0.005,        # Maximum |last - first| inside the window (kg)
+                 min_load: float = 0.1,           # Readings below this count as an empty scale (kg)
+                 min_change: float = 0.05):       # Mass change that shows the previous specimen was replaced (kg)
+        """Initialize detector thresholds"""
+
+        self.window_size = max(1, window_size)
+        self.max_variance = max_std ** 2
+        self.max_drift = max_drift
+        self.min_load = min_load
+        self.min_change = min_change
+        self.occupied_mass = None  # Mass of a previous specimen that must leave the scale first
+        self.reset()
+
+
+    @classmethod
+    def from_config(cls, stability_config: Any) -> "ScaleStabilityDetector":
+        """Build detector from a devices.scale.stability block (missing keys use defaults)"""
+
+        stability_config = stability_config or {}
+        return cls(**{key: stability_config[key]
+                      for key in ('window_size', 'max_std', 'max_drift', 'min_load', 'min_change')
+                      if key in stability_config})
+
+
+    def reset(self) -> None:
+        """Forget all samples (new specimen)"""
+
+        self._window = deque()
+        self._shift = None       # First loaded sample; sums are kept relative to it to avoid cancellation
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self.loaded = False      # A specimen has been seen on the scale since the last reset
+        self.committed = None    # Mass committed by the last STABLE result
+        self.samples_seen = 0
+
+
+    def expect_removal(self, previous_mass: Optional[float]  # Mass committed for the previous specimen (kg)
+                      ) -> None:
+        """Ignore readings until the scale is emptied or the mass clearly changes (next specimen)"""
+
+        self.occupied_mass = previous_mass
+
+
+    def update(self, mass: float  # Latest reading (kg)
+              ) -> str:           # EMPTY / SETTLING / STABLE / LIFTED / OCCUPIED
+        """Feed one reading and return the resulting scale state"""
+
+        self.samples_seen += 1
+
+        # The previous specimen must not be committed again as this one:
+        if self.occupied_mass is not None:
+            if mass >= self.min_load and abs(mass - self.occupied_mass) <= self.min_change:
+                return OCCUPIED
+            self.occupied_mass = None
+
+        # Empty scale - either not placed yet or lifted too early:
+        if mass < self.min_load:
+            was_loaded = self.loaded
+            self.reset()
+            return LIFTED if was_loaded else EMPTY
+
+        if self._shift is None:
+            self._shift = mass
+        self.loaded = True
+
+        # Slide window, updating the shifted running sums:
+        value = mass - self._shift
+        self._window.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+
+        if len(self._window) > self.window_size:
+            old = self._window.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+
+        if len(self._window) < self.window_size:
+            return SETTLING
+
+        n = len(self._window)
+        mean = self._sum / n
+        variance = max(0.0, self._sum_sq / n - mean * mean)
+        drift = abs(self._window[-1] - self._window[0])
+
+        if variance <= self.max_variance and drift <= self.max_drift:
+            self.committed = mean + self._shift
+            return STABLE
+
+        return SETTLING
+
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the current window (kg) or None when empty"""
+
+        if not self._window:
+            return None
+        return self._sum / len(self._window) + self._shift
+
+#%%
@@ -0,0 +1,149 @@
+"""Specimen scheduler - scale and press run as separate workers, so specimen N+1 is weighed while N is in the press"""
+
+#%% Dependencies:
+
+import queue
+import threading
+from typing import Any, Iterator, List, Optional, Tuple
+
+#%% Exceptions:
+
+class AcquisitionCancelled(Exception):
+    """Raised inside a device wait once the scheduler has been cancelled (not an application error)"""
+
+#%% Order Tracking:
+
+class OrderTracker:
+    """Which specimens have been weighed and pressed - results stay tied to their specimen numbers"""
+
+    def __init__(self, first_index: int,  # Index of the first specimen still to measure
+                 set_size: int):
+
+        self.first_index = first_index
+        self.set_size = set_size
+        self.weighed: List[int] = []  # Specimen indices in weighing order
+        self.pressed: List[int] = []  # Specimen indices in pressing order
+        self._lock = threading.Lock()
+
+
+    def mark_weighed(self, index: int) -> None:
+        """Record a committed scale reading"""
+
+        with self._lock:
+            self.weighed.append(index)
+
+
+    def mark_pressed(self, index: int) -> None:
+        """Record a press result (only weighed specimens may be pressed, in weighing order)"""
+
+        with self._lock:
+            expected = self.weighed[len(self.pressed)] if len(self.pressed) < len(self.weighed) else None
+            if index != expected:
+                raise RuntimeError(f"Press result for specimen {index + 1} out of order (expected {expected})")
+            self.pressed.append(index)
+
+
+    def progress(self) -> str:
+        """Display string, e.g. "scale 3/3, press 1/3" """
+
+        with self._lock:
+            return (f"scale {self.first_index + len(self.weighed)}/{self.set_size}, "
+                    f"press {self.first_index + len(self.pressed)}/{self.set_size}")
+
+#%% Specimen Scheduler:
+
+class SpecimenScheduler:
+    """Scale worker feeds weighed specimens to the press worker through a FIFO; results come back in specimen order"""
+
+    def __init__(self, ctx: Any,          # Context object
+                 handler: Any,            # Protocol handler with weigh_specimen/press_specimen
+                 first_index: int,        # Index of the first specimen still to measure (>0 when resuming)
+                 set_size: int):
+        """Prepare queues and workers (nothing runs before run())"""
+
+        self.ctx = ctx
+        self.handler = handler
+        self.first_index = first_index
+        self.set_size = set_size
+        self.tracker = OrderTracker(first_index, set_size)
+
+        self._press_queue: "queue.Queue[Optional[Tuple[int, Any]]]" = queue.Queue()  # (index, ScaleData), None ends
+        self._results: "queue.Queue[Optional[Tuple[int, Any]]]" = queue.Queue()      # (index, SpecimenData), None ends
+        self._error: Optional[BaseException] = None
+        self._workers = [threading.Thread(target=self._scale_worker, name="scale-worker", daemon=True),
+                         threading.Thread(target=self._press_worker, name="press-worker", daemon=True)]
+
+
+    def run(self) -> Iterator[Tuple[int, Any]]:  # (specimen index, SpecimenData) in specimen order
+        """Start both workers and yield completed specimens; re-raises the first worker error once drained"""
+
+        self.handler.cancelled.clear()
+        for worker in self._workers:
+            worker.start()
+
+        try:
+            while True:
+                item = self._results.get()
+                if item is None:
+                    break
+                yield item
+
+            if self._error is not None:
+                raise self._error
+
+        finally:
+            # Stops the workers if the consumer stopped early (interrupt, error while recording):
+            self.handler.cancelled.set()
+            for worker in self._workers:
+                worker.join()
+
+
+    def _scale_worker(self) -> None:
+        """Weigh the remaining specimens in order, handing each to the press queue"""
+
+        try:
+            for index in range(self.first_index, self.set_size):
+                scale_data = self.handler.weigh_specimen(self.ctx, index + 1)
+                self.tracker.mark_weighed(index)
+                self._press_queue.put((index, scale_data))
+                self.ctx.logger.info(f"Progress: {self.tracker.progress()}", target="user")
+
+        except BaseException as e:
+            # Specimens already weighed still go through the press before the error surfaces:
+            self._fail(e)
+
+        finally:
+            self._press_queue.put(None)
+
+
+    def _press_worker(self) -> None:
+        """Press weighed specimens in the order they left the scale"""
+
+        try:
+            while not self.handler.cancelled.is_set():
+                item = self._press_queue.get()
+                if item is None:
+                    break
+
+                index, scale_data = item
+                specimen_data = self.handler.press_specimen(self.ctx, index + 1, scale_data)
+                self.tracker.mark_pressed(index)
+                self._results.put((index, specimen_data))
+                self.ctx.logger.info(f"Progress: {self.tracker.progress()}", target="user")
+
+        except BaseException as e:
+            # Nothing downstream of the press - stop the scale too:
+            self._fail(e)
+            self.handler.cancelled.set()
+
+        finally:
+            self._results.put(None)
+
+
+    def _fail(self, error: BaseException) -> None:
+        """Keep the first real error (cancellation is only the consequence of one)"""
+
+        if self._error is None and not isinstance(error, AcquisitionCancelled):
+            self._error = error
+
+#%%
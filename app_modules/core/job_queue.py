@@ -0,0 +1,136 @@
+"""Job queue - runs finished sets' dissemination in the background while the state machine starts the next set"""
+
+#%% Dependencies:
+
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+#%% Constants:
+
+DEFAULT_MAX_PENDING = 3  # Queued sets before the state machine waits for the worker (bounds memory and backlog)
+
+#%% Failures:
+
+@dataclass(frozen=True)
+class JobFailure:
+    """A job that raised on the worker, kept until the state machine picks it up"""
+
+    label: str          # Label the job was submitted with
+    error: Exception    # What the job raised
+    payload: Any = None # Data submitted with the job (e.g., the SetData), for error handling
+
+#%% Job Queue:
+
+class JobQueue:
+    """One worker running named jobs in submission order; status lines go to the user log (GUI log panel)"""
+
+    def __init__(self, ctx: Any,                        # Context object
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 name: str = "dissemination"):          # Worker thread name prefix
+        """Start the worker"""
+
+        self.ctx = ctx
+        self.max_pending = max_pending
+        self.completed = 0
+        self.failed = 0
+
+        self._jobs: "queue.Queue[Optional[Tuple[str, Callable[[], Any], Any]]]" = queue.Queue(maxsize=max_pending)
+        self._failures: "deque[JobFailure]" = deque()  # Reported back to the state machine by take_failure()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name=f"{name}-worker", daemon=True)
+        self._worker.start()
+
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued or running"""
+
+        return self._jobs.unfinished_tasks
+
+
+    def submit(self, label: str,           # Shown in status lines (e.g., the set ID)
+               job: Callable[[], Any],     # Runs on the worker; exceptions are kept for take_failure()
+               payload: Any = None         # Returned with the failure if the job raises
+              ) -> None:
+        """Queue a job, waiting for room when max_pending jobs are already queued"""
+
+        if self._closed:
+            raise self.ctx.errors.StateMachineError(f"Job queue closed - cannot queue {label}")
+
+        if self._jobs.full():
+            self.ctx.logger.info(f"{label}: waiting for {self.pending} earlier set(s) to finish", target="user")
+
+        self._jobs.put((label, job, payload))
+        self.ctx.logger.info(f"{label}: queued ({self.pending} pending)", target="user")
+
+
+    def take_failure(self) -> Optional[JobFailure]:
+        """Oldest failure not yet handled by the state machine (None when every job succeeded)"""
+
+        try:
+            return self._failures.popleft()
+        except IndexError:
+            return None
+
+
+    def close(self) -> None:
+        """Stop accepting jobs and finish everything already queued"""
+
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.pending:
+            self.ctx.logger.info(f"Waiting for {self.pending} queued set(s) to finish...", target="user")
+
+        self._jobs.put(None)
+        self._worker.join()
+
+
+    def _run(self) -> None:
+        """Worker loop: run jobs until the close sentinel"""
+
+        while True:
+            item = self._jobs.get()
+            try:
+                if item is None:
+                    return
+
+                label, job, payload = item
+                self.ctx.logger.info(f"{label}: processing", target="user")
+                started = time.perf_counter()
+
+                try:
+                    job()
+                    self.completed += 1
+                    self.ctx.logger.info(f"{label}: done in {time.perf_counter() - started:.1f} s "
+                                         f"({self.pending - 1} pending)", target="user")
+
+                except Exception as e:
+                    # The set's measurements are already journaled; the failure must not stop later sets,
+                    # so it is kept for the state machine (picked up in the idle state):
+                    self.failed += 1
+                    self.ctx.logger.exception(f"Background job {label} failed: {str(e)}")
+                    self.ctx.logger.error(f"{label}: failed - {str(e)}", target="both")
+                    self._failures.append(JobFailure(label, e, payload))
+
+            finally:
+                self._jobs.task_done()
+
+
+    def __enter__(self):
+        """Context manager entry"""
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - drains queued jobs"""
+
+        self.close()
+
+#%%
@@ -4,6 +4,8 @@
 
 from typing import Any
 
+from app_modules.utils.metrics import timed
+
 #%% State Machine Class:
 
 class StateMachine:
@@ -36,7 +38,7 @@ class StateMachine:
                                    "input_state": ["acquisition_state", "error_state", "idle_state"],
                                    "acquisition_state": ["dissemination_state", "error_state"],
                                    "dissemination_state": ["idle_state", "error_state"],
-                                   "error_state": ["idle_state", "input_state"]}
+                                   "error_state": ["idle_state", "input_state", "acquisition_state"]}
 
         self.ctx.logger.info("StateMachine initialized")
 
@@ -56,7 +58,8 @@ class StateMachine:
             while self.running:
                 try:
                     # Execute current state:
-                    next_state_name, next_state_data = self.current_state.execute(self.ctx)
+                    with timed(self.ctx, f"{self.current_state_name}.execute"):
+                        next_state_name, next_state_data = self.current_state.execute(self.ctx)
 
                     # Check for stop condition:
                     if next_state_name == "stop":
@@ -78,11 +81,19 @@ class StateMachine:
                     error_obj = self.ctx.errors.StateMachineError(f"Unexpected error: {str(e)}")
                     self._transition_to("error_state", {"error": error_obj, "source_state": self.current_state_name})
 
+                # Periodic timing summary (between states, never inside one):
+                if self.ctx.metrics is not None:
+                    self.ctx.metrics.report_if_due(self.ctx.logger)
+
         except Exception as e:
             self.ctx.logger.exception(f"Critical error in state machine: {str(e)}")
             raise self.ctx.errors.StateMachineError(f"State machine failed: {str(e)}")
 
         finally:
+            # Timing summary for the whole session:
+            if self.ctx.metrics is not None and self.ctx.metrics.enabled:
+                self.ctx.logger.info(self.ctx.metrics.summary())
+
             self._cleanup()
 
 
@@ -146,15 +157,18 @@ class StateMachine:
                 self.ctx.logger.error(error_msg)
                 raise self.ctx.errors.StateMachineError(error_msg)
 
-            # Exit current state:
-            if self.current_state:
-                self.current_state.exit(self.ctx)
-
-            # Load and enter new state:
             previous_state = self.current_state_name
-            self._load_state(target_state)
-            self.state_data = data
-            self.current_state.enter(self.ctx, data)
+            with timed(self.ctx, f"transition {previous_state} -> {target_state}"):
+                # Exit current state:
+                if self.current_state:
+                    with timed(self.ctx, f"{previous_state}.exit"):
+                        self.current_state.exit(self.ctx)
+
+                # Load and enter new state:
+                self._load_state(target_state)
+                self.state_data = data
+                with timed(self.ctx, f"{target_state}.enter"):
+                    self.current_state.enter(self.ctx, data)
 
             self.ctx.logger.info(f"Transitioned from {previous_state} to {target_state}")
 
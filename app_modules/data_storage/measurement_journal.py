@@ -0,0 +1,338 @@
+"""Measurement journal - append-only JSON Lines log of device frames and readings with an offset index"""
+
+#%% Dependencies:
+
+import os
+import json
+import time
+import zlib
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+#%% Constants:
+
+JOURNAL_FILENAME = "measurements.jsonl"
+INDEX_FILENAME = "measurements.idx"
+
+# Index entry per record: byte offset, byte length, wall time, crc32 of the record key (0 = no key):
+INDEX_ENTRY = struct.Struct("<QIdI")
+
+DEFAULT_BATCH_SIZE = 32       # Records written before an fsync is forced
+DEFAULT_SYNC_INTERVAL = 1.0   # Seconds a written record may wait for its fsync
+
+#%% Helper Functions:
+
+def _key_hash(key: Optional[str]) -> int:
+    """Stable 32-bit key hash stored in the index (0 reserved for keyless records)"""
+
+    if key is None:
+        return 0
+    return zlib.crc32(key.encode("utf-8")) or 1
+
+#%% Measurement Journal:
+
+class MeasurementJournal:
+    """Durable append-only journal: every append is flushed, fsyncs are batched by count and time"""
+
+    def __init__(self, ctx: Any,                                   # Context object
+                 journal_dir: Path,                                # Directory holding journal + index
+                 batch_size: int = DEFAULT_BATCH_SIZE,             # Records per forced fsync
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL):    # Maximum fsync delay (seconds)
+        """Initialize journal paths (files are opened by open())"""
+
+        self.ctx = ctx
+        self.journal_path = Path(journal_dir) / JOURNAL_FILENAME
+        self.index_path = Path(journal_dir) / INDEX_FILENAME
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+
+        self._data_file = None
+        self._index_file = None
+        self._lock = threading.Lock()
+        self._records = 0          # Records in the journal (== index entries)
+        self._keyed: Dict[int, List[Tuple[int, int]]] = {}  # Key hash -> (offset, length) of keyed records
+        self._unsynced = 0         # Records written since the last fsync
+        self._first_unsynced = None
+        self._stop_event = threading.Event()
+        self._sync_thread = None
+
+
+    def open(self) -> "MeasurementJournal":
+        """Open (or create) the journal, repairing a torn tail left by a crash"""
+
+        try:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._data_file = open(self.journal_path, "ab+")
+            self._index_file = open(self.index_path, "ab+")
+            self._recover()
+
+            self._stop_event.clear()
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="journal-sync", daemon=True)
+            self._sync_thread.start()
+
+            self.ctx.logger.info(f"Measurement journal opened: {self.journal_path} ({self._records} records)")
+            return self
+
+        except Exception as e:
+            error_msg = f"Failed to open measurement journal: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def append(self, kind: str,                    # Record type (e.g., "frame", "specimen")
+               key: Optional[str] = None,          # Lookup key (e.g., set_id) for records_for()
+               **fields: Any                       # JSON-serializable payload
+              ) -> int:                            # Record number
+        """Append one record"""
+
+        record = {"kind": kind, "key": key, "time": time.time(), **fields}
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+        try:
+            with self._lock:
+                offset = self._data_file.tell()
+                self._data_file.write(line)
+                self._data_file.flush()  # Survives a process crash; fsync covers power loss
+                self._index_file.write(INDEX_ENTRY.pack(offset, len(line), record["time"], _key_hash(key)))
+                self._index_file.flush()
+                self._remember_key(_key_hash(key), offset, len(line))
+
+                record_number = self._records
+                self._records += 1
+                self._unsynced += 1
+                if self._first_unsynced is None:
+                    self._first_unsynced = time.monotonic()
+
+                if self._unsynced >= self.batch_size:
+                    self._sync_locked()
+
+                return record_number
+
+        except Exception as e:
+            error_msg = f"Failed to append {kind} record to journal: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def record_frame(self, frame: Any) -> None:
+        """Journal a raw SerialFrame consumed by an acquisition (payload kept byte-exact via latin-1)"""
+
+        self.append("frame", device=frame.device, payload=frame.payload.decode("latin-1"),
+                    frame_time=frame.wall_time)
+
+
+    def record_specimen(self, set_id: str,              # Set identifier (record key)
+                        specimen_number: int,           # 1-based specimen position
+                        specimen_data: Any) -> None:    # SpecimenData
+        """Journal a parsed specimen as soon as it is collected"""
+
+        self.append("specimen", key=set_id, specimen_number=specimen_number,
+                    data=specimen_data.model_dump(mode="json"))
+
+
+    def sync(self) -> None:
+        """Force pending records to disk"""
+
+        with self._lock:
+            self._sync_locked()
+
+
+    def __len__(self) -> int:
+        return self._records
+
+
+    def replay(self, start: int = 0,               # First record number to read
+               kind: Optional[str] = None          # Only records of this kind
+              ) -> Iterator[Dict[str, Any]]:       # Records in append order
+        """Iterate records from a record number on, seeking straight to its offset"""
+
+        entries = self._read_index(start)
+        if not entries:
+            return
+
+        with open(self.journal_path, "rb") as f:
+            f.seek(entries[0][0])
+            for offset, length, _, _ in entries:
+                line = f.read(length)
+                record = json.loads(line)
+                if kind is None or record["kind"] == kind:
+                    yield record
+
+
+    def records_for(self, key: str,               # Record key (e.g., set_id)
+                    kind: Optional[str] = None     # Only records of this kind
+                   ) -> List[Dict[str, Any]]:      # Matching records in append order
+        """Read only the records stored under a key (in-memory key map - the index file is not scanned)"""
+
+        with self._lock:
+            locations = list(self._keyed.get(_key_hash(key), ()))
+        results = []
+
+        with open(self.journal_path, "rb") as f:
+            for offset, length in locations:
+                f.seek(offset)
+                record = json.loads(f.read(length))
+                if record["key"] == key and (kind is None or record["kind"] == kind):
+                    results.append(record)
+
+        return results
+
+
+    def records_since(self, wall_time: float) -> Iterator[Dict[str, Any]]:
+        """Iterate records appended at or after a wall-clock time (binary search on the index)"""
+
+        entries = self._read_index(0)
+        low, high = 0, len(entries)
+        while low < high:
+            middle = (low + high) // 2
+            if entries[middle][2] < wall_time:
+                low = middle + 1
+            else:
+                high = middle
+
+        return self.replay(start=low)
+
+
+    def _read_index(self, start: int) -> List[tuple]:
+        """Load index entries from a record number on"""
+
+        with self._lock:
+            count = self._records
+
+        if start >= count:
+            return []
+
+        with open(self.index_path, "rb") as f:
+            f.seek(start * INDEX_ENTRY.size)
+            data = f.read((count - start) * INDEX_ENTRY.size)
+
+        return list(INDEX_ENTRY.iter_unpack(data))
+
+
+    def _remember_key(self, key_hash: int, offset: int, length: int) -> None:
+        """Add a keyed record to the key map (keyless frames are not tracked)"""
+
+        if key_hash:
+            self._keyed.setdefault(key_hash, []).append((offset, length))
+
+
+    def _sync_locked(self) -> None:
+        """fsync data before index so the index never points past durable data (lock held)"""
+
+        if not self._unsynced:
+            return
+
+        os.fsync(self._data_file.fileno())
+        os.fsync(self._index_file.fileno())
+        self._unsynced = 0
+        self._first_unsynced = None
+
+
+    def _sync_loop(self) -> None:
+        """Background fsync for records that did not fill a batch"""
+
+        while not self._stop_event.wait(self.sync_interval / 2):
+            try:
+                with self._lock:
+                    if self._first_unsynced is not None and \
+                       time.monotonic() - self._first_unsynced >= self.sync_interval:
+                        self._sync_locked()
+            except Exception as e:
+                self.ctx.logger.warning(f"Journal background sync failed: {str(e)}")
+
+
+    def _recover(self) -> None:
+        """Make index and journal agree after an unclean shutdown"""
+
+        data_size = self.journal_path.stat().st_size
+        index_size = self.index_path.stat().st_size
+
+        # Drop a partially written index entry:
+        entries = index_size // INDEX_ENTRY.size
+        if index_size % INDEX_ENTRY.size:
+            self._index_file.truncate(entries * INDEX_ENTRY.size)
+
+        # Drop index entries pointing past the durable data:
+        valid_end = 0
+        self._keyed = {}
+        if entries:
+            with open(self.index_path, "rb") as f:
+                index = list(INDEX_ENTRY.iter_unpack(f.read(entries * INDEX_ENTRY.size)))
+            while index and index[-1][0] + index[-1][1] > data_size:
+                index.pop()
+            if len(index) != entries:
+                self.ctx.logger.warning(f"Journal index had {entries - len(index)} dangling entries - truncated")
+                self._index_file.truncate(len(index) * INDEX_ENTRY.size)
+            entries = len(index)
+            if index:
+                valid_end = index[-1][0] + index[-1][1]
+            for offset, length, _, key_hash in index:
+                self._remember_key(key_hash, offset, length)
+
+        # Re-index complete records written after the last index entry, drop a torn last line:
+        if valid_end < data_size:
+            with open(self.journal_path, "rb") as f:
+                f.seek(valid_end)
+                tail = f.read()
+
+            offset = valid_end
+            for line in tail.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                key_hash = _key_hash(record.get("key"))
+                self._index_file.write(INDEX_ENTRY.pack(offset, len(line), record.get("time", 0.0), key_hash))
+                self._remember_key(key_hash, offset, len(line))
+                offset += len(line)
+                entries += 1
+
+            if offset < data_size:
+                self.ctx.logger.warning(f"Journal had a torn tail of {data_size - offset} bytes - truncated")
+                self._data_file.truncate(offset)
+
+            self._index_file.flush()
+
+        self._data_file.seek(0, os.SEEK_END)
+        self._index_file.seek(0, os.SEEK_END)
+        self._records = entries
+
+
+    def close(self) -> None:
+        """Sync and close journal files"""
+
+        try:
+            self._stop_event.set()
+            if self._sync_thread:
+                self._sync_thread.join(2.0)
+                self._sync_thread = None
+
+            with self._lock:
+                if self._data_file:
+                    self._sync_locked()
+                    self._data_file.close()
+                    self._index_file.close()
+                    self._data_file = self._index_file = None
+
+            self.ctx.logger.info("Measurement journal closed")
+
+        except Exception as e:
+            self.ctx.logger.warning(f"Error closing measurement journal: {str(e)}")
+
+
+    def __enter__(self):
+        """Context manager entry"""
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - ensures cleanup"""
+
+        self.close()
+
+#%%
@@ -0,0 +1,326 @@
+"""Registry manager - SQLite-backed register of every tested set with indexed queries"""
+
+#%% Dependencies:
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app_modules.models.statistics_engine import statistics_for
+
+#%% Constants:
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sets (
+    id             INTEGER PRIMARY KEY,
+    set_id         TEXT    NOT NULL,
+    protocol       TEXT    NOT NULL,
+    client         TEXT    NOT NULL,
+    concrete_class TEXT    NOT NULL,
+    sampling_date  TEXT    NOT NULL,  -- ISO YYYY-MM-DD so ranges sort correctly
+    testing_date   TEXT    NOT NULL,  -- ISO YYYY-MM-DD
+    project_title  TEXT,
+    element        TEXT,
+    set_size       INTEGER NOT NULL,
+    specimen_count INTEGER NOT NULL,
+    min_strength   REAL,
+    max_strength   REAL,
+    avg_strength   REAL,
+    receipts       TEXT,              -- JSON list of generated receipt paths
+    input_data     TEXT    NOT NULL,  -- Full InputData as JSON
+    created_at     TEXT    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS specimens (
+    set_row       INTEGER NOT NULL REFERENCES sets(id) ON DELETE CASCADE,
+    number        INTEGER NOT NULL,
+    mass          REAL,
+    mass_unit     TEXT,
+    load          REAL,
+    load_unit     TEXT,
+    strength      REAL,
+    strength_unit TEXT,
+    PRIMARY KEY (set_row, number)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sets_client         ON sets(client, testing_date);
+CREATE INDEX IF NOT EXISTS idx_sets_concrete_class ON sets(concrete_class, testing_date);
+CREATE INDEX IF NOT EXISTS idx_sets_set_id         ON sets(set_id);
+CREATE INDEX IF NOT EXISTS idx_sets_protocol       ON sets(protocol, testing_date);
+CREATE INDEX IF NOT EXISTS idx_sets_testing_date   ON sets(testing_date);
+"""
+
+# Query filters accepted by query()/count() and the column each one maps to:
+EQUALITY_FILTERS = {"client": "client",
+                    "concrete_class": "concrete_class",
+                    "protocol": "protocol",
+                    "set_id": "set_id"}
+
+#%% Helper Functions:
+
+def _to_iso_date(value: Union[str, date, datetime]) -> str:
+    """Normalize DD.MM.YYYY strings, dates and datetimes to ISO YYYY-MM-DD"""
+
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return datetime.strptime(value, "%d.%m.%Y").date().isoformat()
+
+
+#%% Registry Manager:
+
+class RegistryManager:
+    """Transactional register of completed sets (one SQLite file, safe to share across threads)"""
+
+    def __init__(self, ctx: Any,            # Context object
+                 registry_path: Path):      # SQLite database file
+        """Initialize registry without opening the database"""
+
+        self.ctx = ctx
+        self.registry_path = Path(registry_path)
+        self._connection = None
+        self._lock = threading.Lock()
+
+
+    def open(self) -> "RegistryManager":
+        """Open the database and create or upgrade the schema"""
+
+        try:
+            self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.registry_path, check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+
+            # WAL keeps readers off the writer's back; NORMAL sync is durable at transaction commit in WAL mode:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                with self._connection:
+                    self._connection.executescript(SCHEMA)
+                    self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+            self.ctx.logger.info(f"Registry opened: {self.registry_path} ({self.count()} sets)")
+            return self
+
+        except Exception as e:
+            error_msg = f"Failed to open registry: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def add_set(self, set_data: Any,                     # SetData
+                receipts: Optional[List[Any]] = None     # Generated receipt paths
+               ) -> int:                                 # Registry row id
+        """Insert a set and all its specimens in one transaction"""
+
+        try:
+            input_data = set_data.input_data
+            strength = statistics_for(set_data).strength
+            present = strength.count > 0
+
+            set_row = (input_data.set_id,
+                       input_data.protocol,
+                       input_data.client,
+                       input_data.concrete_class,
+                       _to_iso_date(input_data.sampling_date),
+                       _to_iso_date(input_data.testing_date),
+                       input_data.project_title,
+                       input_data.element,
+                       input_data.set_size,
+                       len(set_data.specimens),
+                       strength.min if present else None,
+                       strength.max if present else None,
+                       strength.mean if present else None,
+                       json.dumps([str(path) for path in receipts or []]),
+                       input_data.model_dump_json(),
+                       datetime.now().isoformat(timespec="seconds"))
+
+            with self._lock, self._connection:
+                cursor = self._connection.execute(
+                    "INSERT INTO sets (set_id, protocol, client, concrete_class, sampling_date, testing_date, "
+                    "project_title, element, set_size, specimen_count, min_strength, max_strength, avg_strength, "
+                    "receipts, input_data, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    set_row)
+                row_id = cursor.lastrowid
+
+                self._connection.executemany(
+                    "INSERT INTO specimens (set_row, number, mass, mass_unit, load, load_unit, strength, strength_unit) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._specimen_row(row_id, number, specimen)
+                     for number, specimen in enumerate(set_data.specimens, 1)])
+
+            self.ctx.logger.info(f"Registered set {input_data.set_id} as registry entry {row_id}")
+            return row_id
+
+        except Exception as e:
+            error_msg = f"Failed to register set: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def query(self, date_from: Optional[Union[str, date]] = None,  # Inclusive testing date lower bound
+              date_to: Optional[Union[str, date]] = None,          # Inclusive testing date upper bound
+              limit: Optional[int] = None,                         # Maximum rows (newest first)
+              **filters: str                                       # client / concrete_class / protocol / set_id
+             ) -> List[Dict[str, Any]]:                            # Matching sets (without specimens)
+        """Find sets, e.g. query(client="X", date_from=date(2025, 5, 1), date_to=date(2025, 5, 31))"""
+
+        where, parameters = self._build_where(date_from, date_to, filters)
+        sql = f"SELECT * FROM sets{where} ORDER BY testing_date DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+
+        try:
+            with self._lock:
+                rows = self._connection.execute(sql, parameters).fetchall()
+            return [self._set_row_to_dict(row) for row in rows]
+
+        except Exception as e:
+            error_msg = f"Registry query failed: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def count(self, date_from: Optional[Union[str, date]] = None,
+              date_to: Optional[Union[str, date]] = None,
+              **filters: str) -> int:
+        """Count sets matching the same filters as query()"""
+
+        where, parameters = self._build_where(date_from, date_to, filters)
+
+        try:
+            with self._lock:
+                return self._connection.execute(f"SELECT COUNT(*) FROM sets{where}", parameters).fetchone()[0]
+
+        except Exception as e:
+            error_msg = f"Registry count failed: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def get_specimens(self, row_id: int) -> List[Dict[str, Any]]:
+        """Specimen measurements of one registry entry in test order"""
+
+        try:
+            with self._lock:
+                rows = self._connection.execute("SELECT * FROM specimens WHERE set_row = ? ORDER BY number",
+                                                (row_id,)).fetchall()
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            error_msg = f"Failed to read specimens for registry entry {row_id}: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def specimen_rows(self, date_from: Optional[Union[str, date]] = None,
+                      date_to: Optional[Union[str, date]] = None,
+                      **filters: str
+                     ) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:  # (set, its specimens) oldest first
+        """Sets matching query() filters with their specimens, read in one joined query (for MeasurementStore)"""
+
+        where, parameters = self._build_where(date_from, date_to, filters)
+        sql = ("SELECT sets.id, sets.set_id, sets.protocol, sets.input_data, specimens.number, specimens.mass, "
+               "specimens.mass_unit, specimens.load, specimens.load_unit, specimens.strength, specimens.strength_unit "
+               f"FROM sets LEFT JOIN specimens ON specimens.set_row = sets.id{where} "
+               "ORDER BY sets.testing_date, sets.id, specimens.number")
+
+        try:
+            with self._lock:
+                rows = self._connection.execute(sql, parameters).fetchall()
+
+            result, current_id = [], None
+            for row in rows:
+                if row["id"] != current_id:
+                    current_id = row["id"]
+                    result.append(({"set_id": row["set_id"], "protocol": row["protocol"],
+                                    "input_data": json.loads(row["input_data"])}, []))
+                if row["number"] is not None:  # LEFT JOIN row of a set without specimens
+                    result[-1][1].append({key: row[key] for key in ("mass", "mass_unit", "load", "load_unit",
+                                                                    "strength", "strength_unit")})
+            return result
+
+        except Exception as e:
+            error_msg = f"Registry specimen query failed: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DataStorageError(error_msg)
+
+
+    def _build_where(self, date_from: Any, date_to: Any, filters: Dict[str, str]) -> tuple:
+        """Translate query filters into an indexed WHERE clause"""
+
+        clauses, parameters = [], []
+
+        for name, value in filters.items():
+            if name not in EQUALITY_FILTERS:
+                raise self.ctx.errors.DataStorageError(f"Unknown registry filter '{name}'. "
+                                                       f"Available: {list(EQUALITY_FILTERS)}")
+            if value is not None:
+                clauses.append(f"{EQUALITY_FILTERS[name]} = ?")
+                parameters.append(value)
+
+        if date_from is not None:
+            clauses.append("testing_date >= ?")
+            parameters.append(_to_iso_date(date_from))
+        if date_to is not None:
+            clauses.append("testing_date <= ?")
+            parameters.append(_to_iso_date(date_to))
+
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, parameters
+
+
+    def _specimen_row(self, row_id: int, number: int, specimen: Any) -> tuple:
+        """Flatten a SpecimenData for insertion"""
+
+        scale, press = specimen.scale_data, specimen.press_data
+        return (row_id, number,
+                scale.mass if scale else None, scale.mass_unit if scale else None,
+                press.load if press else None, press.load_unit if press else None,
+                press.strength if press else None, press.strength_unit if press else None)
+
+
+    def _set_row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Decode JSON columns of a sets row"""
+
+        result = dict(row)
+        result["receipts"] = json.loads(result["receipts"] or "[]")
+        result["input_data"] = json.loads(result["input_data"])
+        return result
+
+
+    def close(self) -> None:
+        """Close the database connection"""
+
+        try:
+            with self._lock:
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
+            self.ctx.logger.info("Registry closed")
+
+        except Exception as e:
+            self.ctx.logger.warning(f"Error closing registry: {str(e)}")
+
+
+    def __enter__(self):
+        """Context manager entry"""
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - ensures cleanup"""
+
+        self.close()
+
+#%%
@@ -0,0 +1,167 @@
+"""Device detector - hot-plug watching and port matching for serial devices"""
+
+#%% Dependencies:
+
+import os
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from serial.tools import list_ports
+
+#%% Constants:
+
+DEFAULT_SCAN_INTERVAL = 0.25  # Seconds between port scans
+
+# A port is given up on (devices without USB ids) once it produced this much without one recognizable frame
+# (a swapped device at the wrong baud rate produces bytes but rarely complete lines):
+PROBE_FRAMES = 5
+PROBE_BYTES = 512
+
+#%% Device Detector:
+
+class DeviceDetector:
+    """Scans serial ports and points SerialManager readers at their devices as they appear"""
+
+    def __init__(self, ctx: Any,          # Context object
+                 serial_manager: Any):    # SerialManager owning the port readers
+        """Initialize detector from devices configuration"""
+
+        self.ctx = ctx
+        self.serial_manager = serial_manager
+        self.scan_interval = ctx.config.devices.get('scan_interval', DEFAULT_SCAN_INTERVAL)
+
+        self._present: Dict[str, Optional[str]] = {}  # Device name -> port path seen in the last scan
+        self._rejected: Dict[str, Set[str]] = {}      # Device name -> ports whose output was not that device
+        self._port_list: Tuple[str, ...] = ()         # Ports of the last scan (a change clears _rejected)
+        self._thread = None
+        self._stop_event = threading.Event()
+
+
+    def start(self) -> None:
+        """Start the background scanning thread"""
+
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="device-detector", daemon=True)
+        self._thread.start()
+        self.ctx.logger.info(f"Device detector started (scan interval {self.scan_interval}s)")
+
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop scanning"""
+
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.ctx.logger.info("Device detector stopped")
+
+
+    def locate(self, device_name: str,     # Device name from config
+               ports: list                 # list_ports.comports() result
+              ) -> Optional[str]:          # Port path or None if the device is absent
+        """Find the current port of a device by USB identifiers, or by probing ports for its output"""
+
+        device_config = self.ctx.config.devices[device_name]
+        vid = device_config.get('vid')
+        pid = device_config.get('pid')
+        serial_number = device_config.get('serial_number')
+
+        # Match by USB identifiers when configured (port paths change across replugs):
+        if vid is not None and pid is not None:
+            for port in ports:
+                if port.vid != vid or port.pid != pid:
+                    continue
+                if serial_number is not None and port.serial_number != serial_number:
+                    continue
+                return port.device
+            return None
+
+        return self._probe(device_name, ports)
+
+
+    def _probe(self, device_name: str, ports: list) -> Optional[str]:
+        """Keep the reader's port while its output is recognizable, otherwise move it to the next free port"""
+
+        reader = self.serial_manager.readers[device_name]
+        rejected = self._rejected.setdefault(device_name, set())
+
+        if reader.connected and reader.frames_recognized == 0 and \
+           (reader.frames_seen >= PROBE_FRAMES or reader.bytes_seen >= PROBE_BYTES):
+            if reader.port not in rejected:
+                self.ctx.logger.warning(f"{device_name} output not recognized on {reader.port} - probing other ports")
+            rejected.add(reader.port)
+
+        if reader.port not in rejected and os.path.exists(reader.port):
+            return reader.port
+
+        # A port whose reader recognized its device is taken; one held by an unconfirmed reader is only
+        # available if that reader may take this reader's port in exchange (swapped cables):
+        for port in ports:
+            if port.device in rejected:
+                continue
+            holder = self._holder(device_name, port.device)
+            if holder is None or (not holder.frames_recognized and
+                                  reader.port not in self._rejected.get(holder.device_name, ())):
+                return port.device
+
+        return None
+
+
+    def _holder(self, device_name: str, port: str) -> Any:
+        """Reader of another device currently on a port (None if the port is free)"""
+
+        for name, other in self.serial_manager.readers.items():
+            if name != device_name and other.port == port:
+                return other
+        return None
+
+
+    def scan(self) -> None:
+        """Run one detection pass and request reconnects for devices that (re)appeared"""
+
+        ports = list_ports.comports()
+
+        # Replugged or renumbered devices - every port is worth probing again:
+        port_list = tuple(sorted(port.device for port in ports))
+        if port_list != self._port_list:
+            self._port_list = port_list
+            self._rejected.clear()
+
+        for device_name, reader in self.serial_manager.readers.items():
+            port = self.locate(device_name, ports)
+            previous = self._present.get(device_name)
+            self._present[device_name] = port
+
+            if port is None:
+                if previous is not None:
+                    self.ctx.logger.info(f"{device_name} no longer present (was {previous})")
+                continue
+
+            # Reopen right away on replug or when the device shows up on another path:
+            if port != previous or port != reader.port:
+                self.ctx.logger.info(f"{device_name} detected on {port}")
+
+                # Probing onto a port another reader holds - that reader takes the vacated port:
+                holder = self._holder(device_name, port)
+                if holder is not None and reader.port != port:
+                    self.serial_manager.request_reconnect(holder.device_name, reader.port)
+                    self._present[holder.device_name] = reader.port
+
+                self.serial_manager.request_reconnect(device_name, port)
+
+
+    def _run(self) -> None:
+        """Detection loop"""
+
+        while not self._stop_event.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                self.ctx.logger.warning(f"Device scan failed: {str(e)}")
+
+            self._stop_event.wait(self.scan_interval)
+
+#%%
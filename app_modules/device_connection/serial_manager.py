@@ -0,0 +1,471 @@
+"""Serial manager - persistent device connections with one background reader per port"""
+
+#%% Dependencies:
+
+import re
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import serial
+
+#%% Constants:
+
+PARITY_MAPPING = {"none": serial.PARITY_NONE,
+                  "even": serial.PARITY_EVEN,
+                  "odd": serial.PARITY_ODD,
+                  "mark": serial.PARITY_MARK,
+                  "space": serial.PARITY_SPACE}
+
+DEFAULT_BUFFER_SIZE = 256      # Frames kept per device before the oldest are dropped
+DEFAULT_RECONNECT_DELAY = 1.0  # Seconds between reopen attempts after a port error
+READ_CHUNK_SIZE = 256          # Maximum bytes pulled from the port per read call
+
+# Output that identifies a device on whatever port it appears (used to probe ports without USB ids):
+FRAME_SIGNATURES = {"scale": re.compile(rb"^\s*[+-]?\d+\.\d+\s*(?:kg|g)?\s*$"),  # "7649.0 g", "7649.0"
+                    "press": re.compile(rb"(?:Fm|Rm) \[")}                         # "Fm [ kN    ]: 45.32"
+
+#%% Frames and Buffers:
+
+@dataclass(frozen=True)
+class SerialFrame:
+    """One complete message received from a device"""
+
+    device: str        # Device name from config (e.g., "scale", "press")
+    payload: bytes     # Frame content without line terminators
+    timestamp: float   # time.monotonic() when the frame was completed (ordering/timeouts)
+    wall_time: float   # time.time() when the frame was completed (journaling)
+
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Decode payload the way the legacy readers did"""
+
+        return self.payload.decode(encoding, errors="ignore").strip()
+
+
+@dataclass(frozen=True)
+class DeviceEvent:
+    """Connection state change published by a port reader"""
+
+    device: str        # Device name from config
+    connected: bool    # True on (re)connect, False on disconnect
+    port: str          # Port path at the time of the event
+    timestamp: float   # time.monotonic() of the change
+
+
+class FrameBuffer:
+    """Bounded, thread-safe ring buffer of frames for a single device"""
+
+    def __init__(self, maxlen: int = DEFAULT_BUFFER_SIZE):
+        self._frames = deque(maxlen=maxlen)
+        self._condition = threading.Condition()
+        self.dropped = 0  # Frames overwritten because nobody consumed them in time
+
+
+    def put(self, frame: SerialFrame) -> None:
+        """Append a frame, overwriting the oldest one when full"""
+
+        with self._condition:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+            self._condition.notify_all()
+
+
+    def get(self, timeout: Optional[float] = None,  # Seconds to wait, None waits forever
+            newer_than: Optional[float] = None      # Discard frames completed before this monotonic time
+           ) -> Optional[SerialFrame]:              # Oldest matching frame or None on timeout
+        """Pop the oldest frame, blocking until one is available"""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                # Skip stale frames (e.g., readings left over from the previous specimen):
+                while self._frames and newer_than is not None and self._frames[0].timestamp < newer_than:
+                    self._frames.popleft()
+
+                if self._frames:
+                    return self._frames.popleft()
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+
+                self._condition.wait(remaining)
+
+
+    def drain(self) -> List[SerialFrame]:
+        """Pop and return every buffered frame"""
+
+        with self._condition:
+            frames = list(self._frames)
+            self._frames.clear()
+            return frames
+
+
+    def clear(self) -> None:
+        """Discard every buffered frame"""
+
+        with self._condition:
+            self._frames.clear()
+
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._frames)
+
+
+class LineFramer:
+    """Splits a byte stream into newline-terminated frames, keeping partial lines between chunks"""
+
+    def __init__(self):
+        self._pending = bytearray()
+
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Consume a raw chunk and return every completed, non-empty line"""
+
+        self._pending.extend(chunk)
+        if b"\n" not in chunk:
+            return []
+
+        *lines, tail = bytes(self._pending).split(b"\n")
+        self._pending = bytearray(tail)
+        return [line.rstrip(b"\r") for line in lines if line.strip()]
+
+
+    def reset(self) -> None:
+        """Drop any partial line (called when the connection is lost)"""
+
+        self._pending.clear()
+
+#%% Port Reader:
+
+class SerialPortReader:
+    """Keeps one port open and reads it on a dedicated daemon thread into a FrameBuffer"""
+
+    def __init__(self, ctx: Any,                   # Context object
+                 device_name: str,                 # Device name from config
+                 device_config: Any,               # devices.<name> configuration block
+                 framer_factory: Callable = LineFramer,
+                 on_event: Optional[Callable] = None,   # Called with a DeviceEvent on connect/disconnect
+                 signature: Any = None):                # Compiled pattern found in this device's output
+        """Initialize reader without opening the port"""
+
+        self.ctx = ctx
+        self.device_name = device_name
+        self.device_config = device_config
+        self.framer = framer_factory()
+        self.on_event = on_event
+        self.signature = signature
+
+        self.port = device_config.port
+        self.buffer = FrameBuffer(device_config.get('buffer_size', DEFAULT_BUFFER_SIZE))
+        self.reconnect_delay = device_config.get('reconnect_delay', DEFAULT_RECONNECT_DELAY)
+
+        self._serial = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._connected = threading.Event()
+        self._wakeup = threading.Event()  # Cuts the reconnect delay short (e.g., on hot-plug)
+        self._reopen = threading.Event()  # Port path changed - reader thread must reopen
+
+        # What the current port produced since it was opened (port probing):
+        self.bytes_seen = 0
+        self.frames_seen = 0
+        self.frames_recognized = 0  # Frames matching the device signature
+
+
+    @property
+    def connected(self) -> bool:
+        """True while the port is open and readable"""
+
+        return self._connected.is_set()
+
+
+    def start(self) -> None:
+        """Start the background reader thread"""
+
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"serial-{self.device_name}", daemon=True)
+        self._thread.start()
+        self.ctx.logger.info(f"Started serial reader for {self.device_name} on {self.port}")
+
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the reader thread and close the port"""
+
+        self._stop_event.set()
+        self._wakeup.set()
+        self._close()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.ctx.logger.info(f"Stopped serial reader for {self.device_name}")
+
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the port is open (or the timeout expires)"""
+
+        return self._connected.wait(timeout)
+
+
+    def request_reconnect(self, port: Optional[str] = None) -> None:
+        """Reopen immediately, optionally on a different port path"""
+
+        if port is not None and port != self.port:
+            self.ctx.logger.info(f"{self.device_name} moved from {self.port} to {port}")
+            self.port = port
+            self.bytes_seen = self.frames_seen = self.frames_recognized = 0
+            self._reopen.set()  # Handled on the reader thread, which owns the port object
+
+        self._wakeup.set()
+
+
+    def _open(self) -> None:
+        """Open the configured port"""
+
+        config = self.device_config
+        self._serial = serial.Serial(port=self.port,
+                                     baudrate=config.baudrate,
+                                     bytesize=config.get('bytesize', 8),
+                                     parity=PARITY_MAPPING[str(config.get('parity', 'none')).lower()],
+                                     stopbits=config.get('stopbits', 1),
+                                     xonxoff=config.get('xonxoff', False),
+                                     timeout=config.timeout)
+        self.bytes_seen = self.frames_seen = self.frames_recognized = 0
+        self._connected.set()
+        self.ctx.logger.info(f"Opened {self.device_name} port {self.port}")
+        self._publish(True)
+
+
+    def _close(self) -> None:
+        """Close the port if open, dropping any partial frame"""
+
+        was_connected = self._connected.is_set()
+        self._connected.clear()
+        self.framer.reset()
+
+        if self._serial is not None:
+            try:
+                self._serial.close()
+            except Exception as e:
+                self.ctx.logger.warning(f"Error closing {self.device_name} port: {str(e)}")
+            self._serial = None
+
+        if was_connected:
+            self._publish(False)
+
+
+    def _publish(self, connected: bool) -> None:
+        """Forward a connection state change to the owner"""
+
+        if self.on_event is None:
+            return
+
+        try:
+            self.on_event(DeviceEvent(device=self.device_name,
+                                      connected=connected,
+                                      port=self.port,
+                                      timestamp=time.monotonic()))
+        except Exception as e:
+            self.ctx.logger.warning(f"Device event handler failed for {self.device_name}: {str(e)}")
+
+
+    def _wait_before_reconnect(self) -> None:
+        """Sleep for reconnect_delay unless woken by request_reconnect() or stop()"""
+
+        self._wakeup.wait(self.reconnect_delay)
+        self._wakeup.clear()
+
+
+    def _run(self) -> None:
+        """Reader loop: (re)open the port, then push framed data into the buffer"""
+
+        while not self._stop_event.is_set():
+            try:
+                if self._reopen.is_set():
+                    self._reopen.clear()
+                    self._close()
+
+                if self._serial is None:
+                    self._open()
+
+                # Block up to config.timeout for the first byte, then take whatever else is waiting:
+                chunk = self._serial.read(max(1, min(self._serial.in_waiting, READ_CHUNK_SIZE)))
+                if not chunk:
+                    continue
+
+                self.bytes_seen += len(chunk)
+                for payload in self.framer.feed(chunk):
+                    self.frames_seen += 1
+                    if self.signature is not None and self.signature.search(payload):
+                        self.frames_recognized += 1
+                    frame = SerialFrame(device=self.device_name,
+                                        payload=payload,
+                                        timestamp=time.monotonic(),
+                                        wall_time=time.time())
+                    self.buffer.put(frame)
+
+            except (serial.SerialException, OSError) as e:
+                if self._stop_event.is_set():
+                    break
+
+                if self.connected:
+                    self.ctx.logger.warning(f"Lost connection to {self.device_name} on {self.port}: {str(e)}")
+                self._close()
+                self._wait_before_reconnect()
+
+            except Exception as e:
+                self.ctx.logger.error(f"Unexpected error in {self.device_name} reader: {str(e)}")
+                self._close()
+                self._wait_before_reconnect()
+
+        self._close()
+
+#%% Serial Manager:
+
+class SerialManager:
+    """Owns one persistent SerialPortReader per configured device"""
+
+    def __init__(self, ctx: Any,                                  # Context object
+                 framer_factories: Optional[Dict[str, Callable]] = None,  # Optional per-device framer override
+                 journal: Any = None):                            # MeasurementJournal for consumed frames
+        """Initialize readers for every device in config.devices"""
+
+        self.ctx = ctx
+        self.readers: Dict[str, SerialPortReader] = {}
+        self.detector = None
+        self.journal = journal
+        framer_factories = framer_factories or {}
+
+        try:
+            for device_name, device_config in ctx.config.devices.items():
+                if not isinstance(device_config, dict):
+                    continue  # Skip global device settings (e.g., devices.simulate)
+
+                self.readers[device_name] = SerialPortReader(ctx, device_name, device_config,
+                                                             framer_factories.get(device_name, LineFramer),
+                                                             on_event=self._publish,
+                                                             signature=FRAME_SIGNATURES.get(device_name))
+
+            self.ctx.logger.info(f"SerialManager initialized for devices: {', '.join(self.readers)}")
+
+        except Exception as e:
+            error_msg = f"Failed to initialize serial manager: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.ConfigurationError(error_msg)
+
+
+    def start(self) -> None:
+        """Start every reader plus the hot-plug detector; unplugged ports are retried in the background"""
+
+        from app_modules.device_connection.device_detector import DeviceDetector
+
+        for reader in self.readers.values():
+            reader.start()
+
+        self.detector = DeviceDetector(self.ctx, self)
+        self.detector.start()
+
+
+    def _publish(self, event: DeviceEvent) -> None:
+        """Log a reader connect/disconnect (recovery waits on the reader itself via wait_for_device)"""
+
+        state = "connected" if event.connected else "disconnected"
+        self.ctx.logger.info(f"Device event: {event.device} {state} ({event.port})")
+
+
+    def is_connected(self, device_name: str) -> bool:
+        """Check whether a device port is currently open"""
+
+        return self._get_reader(device_name).connected
+
+
+    def wait_for_device(self, device_name: str,          # Device name from config
+                        timeout: Optional[float] = None  # Seconds to wait, None waits forever
+                       ) -> bool:                        # True once connected, False on timeout
+        """Block until a device is connected - returns as soon as its reader reopens the port"""
+
+        return self._get_reader(device_name).wait_connected(timeout)
+
+
+    def request_reconnect(self, device_name: str,        # Device name from config
+                          port: Optional[str] = None     # New port path, None keeps the current one
+                         ) -> None:
+        """Ask a reader to reopen its port now instead of after reconnect_delay"""
+
+        self._get_reader(device_name).request_reconnect(port)
+
+
+    def read_frame(self, device_name: str,                # Device name from config
+                   timeout: Optional[float] = None,       # Seconds to wait for a frame
+                   newer_than: Optional[float] = None     # Ignore frames completed before this monotonic time
+                  ) -> Optional[SerialFrame]:             # Next frame or None on timeout
+        """Consume the next buffered frame from a device (journaled - idle chatter that nobody reads is not)"""
+
+        frame = self._get_reader(device_name).buffer.get(timeout=timeout, newer_than=newer_than)
+
+        if frame is not None and self.journal is not None:
+            try:
+                self.journal.record_frame(frame)
+            except Exception as e:
+                self.ctx.logger.warning(f"Could not journal {device_name} frame: {str(e)}")
+
+        return frame
+
+
+    def get_buffer(self, device_name: str) -> FrameBuffer:
+        """Direct access to a device's frame buffer"""
+
+        return self._get_reader(device_name).buffer
+
+
+    def _get_reader(self, device_name: str) -> SerialPortReader:
+        """Look up a reader by device name"""
+
+        if device_name not in self.readers:
+            error_msg = f"Unknown device '{device_name}'. Available: {list(self.readers)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DeviceError(error_msg)
+
+        return self.readers[device_name]
+
+
+    def close(self) -> None:
+        """Stop all readers and close all ports"""
+
+        try:
+            self.ctx.logger.info("Shutting down serial manager...")
+
+            if self.detector is not None:
+                self.detector.stop()
+                self.detector = None
+
+            for reader in self.readers.values():
+                reader.stop()
+
+            self.ctx.logger.info("Serial manager shutdown completed")
+
+        except Exception as e:
+            self.ctx.logger.warning(f"Error during serial manager shutdown: {str(e)}")
+
+
+    def __enter__(self):
+        """Context manager entry"""
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - ensures cleanup"""
+
+        self.close()
+
+#%%
@@ -4,8 +4,9 @@
 
 import time
 import queue
+import threading
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 import jpype
 from jpype.types import *
@@ -27,6 +28,7 @@ class CLIBridge:
         self.session_active = False
         self.interface_locked = False
         self.continue_testing = True  # Flag to control testing continuation
+        self.session_ended = threading.Event()  # Set once the user leaves the CLI session
 
 
     def setup(self, ctx: Any) -> None:
@@ -46,6 +48,7 @@ class CLIBridge:
             # Mark session as active:
             self.session_active = True
             self.continue_testing = True
+            self.session_ended.clear()
 
             self.ctx.logger.info("CLI bridge setup completed successfully")
 
@@ -123,15 +126,27 @@ class CLIBridge:
                 self.ctx.logger.info("User chose to exit application", target="user")
                 self.session_active = False
                 self.continue_testing = False
+                self.session_ended.set()
 
         except Exception as e:
             error_msg = f"Failed to unlock CLI interface: {str(e)}"
             self.ctx.logger.error(error_msg)
             self.session_active = False
             self.continue_testing = False
+            self.session_ended.set()
             raise self.ctx.errors.DeviceError(error_msg)
 
 
+    def wait_for_trigger(self, timeout: Optional[float] = None  # Unused: the CLI prompt itself is the wait
+                        ) -> Tuple[str, Any]:                    # ("start_testing", None) or ("exit_application", None)
+        """Report whether the next cycle should start. unlock_interface() already asked the user, so this never blocks"""
+
+        if self.session_ended.is_set() or not self.is_session_active():
+            return ("exit_application", None)
+
+        return ("start_testing", None)
+
+
     def cleanup(self) -> None:
         """Clean shutdown of CLI and JVM resources"""
 
@@ -141,6 +156,7 @@ class CLIBridge:
 
             # Mark session as inactive:
             self.session_active = False
+            self.session_ended.set()
 
             # Shutdown JVM:
             if self.jvm_started and jpype.isJVMStarted():
@@ -25,6 +25,8 @@ public class AppController extends Application {
     private static CountDownLatch startupLatch = new CountDownLatch(1);
     private Runnable onDataSubmittedCallback;
     private volatile boolean callbackRegistered = false;    
+    private Runnable onApplicationClosedCallback;
+    private volatile boolean closedNotified = false;
     
     // Static method to get the application instance
     public static AppController getInstance() {
@@ -75,6 +77,7 @@ public class AppController extends Application {
         primaryStage.setTitle("Achiziție de date - Controlled by Python");
         primaryStage.setScene(scene);
         primaryStage.setMaximized(true);
+        primaryStage.setOnHidden(event -> triggerApplicationClosedCallback());
         primaryStage.show();
         
         // Signal that the application has started
@@ -205,45 +208,85 @@ public class AppController extends Application {
         }
     }
 
+    // Method to register the window-closed callback from Python
+    public void setOnApplicationClosedCallback(Runnable callback) {
+        this.onApplicationClosedCallback = callback;
+        System.out.println("Close callback registered successfully from Python");
+
+        // Window may already be gone by the time Python registers:
+        if (primaryStage != null && !primaryStage.isShowing()) {
+            triggerApplicationClosedCallback();
+        }
+    }
+
+    // Method to notify Python once that the window was closed
+    public void triggerApplicationClosedCallback() {
+        if (onApplicationClosedCallback == null || closedNotified) {
+            return;
+        }
+        closedNotified = true;
+
+        // Run callback in a separate thread so Python never blocks the JavaFX thread
+        new Thread(() -> {
+            try {
+                onApplicationClosedCallback.run();
+            } catch (Exception e) {
+                System.err.println("Error in Python close callback: " + e.getMessage());
+                e.printStackTrace();
+            }
+        }).start();
+    }
+
     /**
      * Log a message with timestamp from Python
      */
     public void logMessage(String level, String message, String timestamp) {
         if (logger != null) {
-            LoggerPanel.LogLevel logLevel;
-            try {
-                logLevel = LoggerPanel.LogLevel.valueOf(level.toUpperCase());
-            } catch (IllegalArgumentException e) {
-                logLevel = LoggerPanel.LogLevel.INFO;
+            addLogMessage(toLogEntry(level, message, timestamp));
+        }
+    }
+
+    /**
+     * Log a frame's worth of messages from Python with one call and one UI update
+     */
+    public void logMessages(String[] levels, String[] messages, String[] timestamps) {
+        if (logger != null) {
+            java.util.List<LoggerPanel.LogEntry> entries = new java.util.ArrayList<>(messages.length);
+            for (int i = 0; i < messages.length; i++) {
+                entries.add(toLogEntry(levels[i], messages[i], timestamps[i]));
             }
-            
-            // Try to parse timestamp, use current time if parsing fails
-            java.time.LocalDateTime dateTime;
-            try {
-                if (timestamp.contains("T")) {
-                    // Full ISO datetime
-                    dateTime = java.time.LocalDateTime.parse(timestamp);
-                } else if (timestamp.matches("\\d{2}:\\d{2}:\\d{2}")) {
-                    // Time only - combine with today's date
-                    java.time.LocalTime time = java.time.LocalTime.parse(timestamp);
-                    dateTime = java.time.LocalDate.now().atTime(time);
-                } else {
-                    // Fallback to current time
-                    dateTime = java.time.LocalDateTime.now();
-                }
-            } catch (Exception e) {
-                System.err.println("Failed to parse timestamp: " + timestamp + ", using current time");
+            logger.addLogEntries(entries);
+        }
+    }
+
+    private LoggerPanel.LogEntry toLogEntry(String level, String message, String timestamp) {
+        LoggerPanel.LogLevel logLevel;
+        try {
+            logLevel = LoggerPanel.LogLevel.valueOf(level.toUpperCase());
+        } catch (IllegalArgumentException e) {
+            logLevel = LoggerPanel.LogLevel.INFO;
+        }
+        
+        // Try to parse timestamp, use current time if parsing fails
+        java.time.LocalDateTime dateTime;
+        try {
+            if (timestamp.contains("T")) {
+                // Full ISO datetime
+                dateTime = java.time.LocalDateTime.parse(timestamp);
+            } else if (timestamp.matches("\\d{2}:\\d{2}:\\d{2}")) {
+                // Time only - combine with today's date
+                java.time.LocalTime time = java.time.LocalTime.parse(timestamp);
+                dateTime = java.time.LocalDate.now().atTime(time);
+            } else {
+                // Fallback to current time
                 dateTime = java.time.LocalDateTime.now();
             }
-            
-            LoggerPanel.LogEntry logEntry = new LoggerPanel.LogEntry(
-                logLevel,
-                message,
-                dateTime
-            );
-            
-            addLogMessage(logEntry);
+        } catch (Exception e) {
+            System.err.println("Failed to parse timestamp: " + timestamp + ", using current time");
+            dateTime = java.time.LocalDateTime.now();
         }
+        
+        return new LoggerPanel.LogEntry(logLevel, message, dateTime);
     }
 
     
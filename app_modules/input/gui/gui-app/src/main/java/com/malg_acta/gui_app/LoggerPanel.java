@@ -97,6 +97,27 @@ public class LoggerPanel extends ScrollPane {
             setVvalue(1.0);
         });
     }    
+
+    // Accept a whole batch of entries with a single UI update (one Platform.runLater per frame)
+    public void addLogEntries(List<LogEntry> entries) {
+        Platform.runLater(() -> {
+            logHistory.addAll(entries);
+
+            // Maintain max log entries
+            if (logHistory.size() > maxLogEntries) {
+                logHistory.subList(0, logHistory.size() - maxLogEntries).clear();
+                // Clear and rebuild text flow to prevent memory leaks
+                rebuildTextFlow();
+            } else {
+                for (LogEntry entry : entries) {
+                    addEntryToTextFlow(entry);
+                }
+            }
+
+            // Auto-scroll to bottom
+            setVvalue(1.0);
+        });
+    }
     
     private void addEntryToTextFlow(LogEntry entry) {
         // Create timestamp
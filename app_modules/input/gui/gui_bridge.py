@@ -6,13 +6,20 @@ import time
 import json
 import queue
 import threading
-from typing import Any
+from typing import Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
 import jpype
 from jpype.types import *
 
+#%% Constants:
+
+GUI_CLOSED = None            # Sentinel put on data_queue to wake up waiters when the window closes
+LIVENESS_CHECK_PERIOD = 1.0  # Seconds between isRunning() checks if the close callback is unavailable
+LAUNCH_POLL_INTERVAL = 0.05  # Seconds between instance/isRunning() checks while the window comes up
+GUI_STARTUP_TIMEOUT = 5.0    # Seconds to wait for isRunning() once the instance exists
+
 #%% GUI Bridge Strategy (Implements InputStrategy):
 
 class GUIBridge:
@@ -25,6 +32,8 @@ class GUIBridge:
         self.data_queue = queue.Queue()
         self.app_instance = None
         self.callback_registered = False
+        self.close_callback_registered = False
+        self.gui_closed = threading.Event()
         self.jvm_started = False
 
 
@@ -42,8 +51,9 @@ class GUIBridge:
             # Launch JavaFX application:
             self._launch_gui()
 
-            # Setup data submission callback:
+            # Setup data submission and window-closed callbacks:
             self._setup_callback()
+            self._setup_close_callback()
 
             self.ctx.logger.info("GUI bridge setup completed successfully")
 
@@ -66,33 +76,27 @@ class GUIBridge:
                 except queue.Empty:
                     break
 
-            # Wait for user submission:
+            # Wait for user submission (woken by the submit or close callbacks):
             while True:
                 try:
-                    # Check if GUI is still running with debug info:
-                    if self.app_instance:
-                        is_running = self.app_instance.isRunning()
-                        self.ctx.logger.info(f"DEBUG: GUI isRunning() = {is_running}")
-                        if not is_running:
-                            error_msg = "GUI application was closed by user"
-                            self.ctx.logger.error(error_msg)
-                            raise self.ctx.errors.ValidationError(error_msg)
-                    else:
+                    if self.app_instance is None:
                         error_msg = "GUI app_instance is None"
                         self.ctx.logger.error(error_msg)
                         raise self.ctx.errors.ValidationError(error_msg)
 
-                    # Check for submitted data with timeout:
-                    try:
-                        submitted_data = self.data_queue.get(timeout=1.0)
+                    trigger, submitted_data = self.wait_for_trigger(timeout=LIVENESS_CHECK_PERIOD)
+
+                    if trigger == "exit_application":
+                        error_msg = "GUI application was closed by user"
+                        self.ctx.logger.error(error_msg)
+                        raise self.ctx.errors.ValidationError(error_msg)
+
+                    if trigger == "start_testing":
                         self.ctx.logger.info("User submitted data through GUI")
 
                         # Interface submission completed:
                         return submitted_data['data']
 
-                    except queue.Empty:
-                        continue  # Continue waiting for input
-
                 except KeyboardInterrupt:
                     error_msg = "User interrupted GUI input"
                     self.ctx.logger.info(error_msg)
@@ -106,6 +110,29 @@ class GUIBridge:
             raise self.ctx.errors.DeviceError(error_msg)
 
 
+    def wait_for_trigger(self, timeout: Optional[float] = None  # Seconds to block, None blocks until an event
+                        ) -> Tuple[str, Any]:                    # ("start_testing", data), ("exit_application", None) or ("wait", None)
+        """Block until the user submits data or closes the GUI, without polling the JVM"""
+
+        if self.gui_closed.is_set():
+            return ("exit_application", None)
+
+        try:
+            submitted_data = self.data_queue.get(timeout=timeout)
+        except queue.Empty:
+            # Only poll the JVM if the close event cannot be delivered by callback:
+            if not self.close_callback_registered and not self._is_gui_running():
+                self.gui_closed.set()
+                return ("exit_application", None)
+            return ("wait", None)
+
+        if submitted_data is GUI_CLOSED:
+            self.data_queue.put(GUI_CLOSED)  # Keep the sentinel for any other waiter
+            return ("exit_application", None)
+
+        return ("start_testing", submitted_data)
+
+
     def unlock_interface(self) -> None:
         """Unlock GUI interface after testing completes. Ready for next testing cycle"""
 
@@ -135,6 +162,27 @@ class GUIBridge:
                 self.ctx.logger.warning(f"Failed to log to GUI: {str(e)}")
 
 
+    def log_batch_to_gui(self, entries: List[Tuple[str, str, str]]  # (level, message, ISO timestamp)
+                        ) -> None:
+        """Log one frame of messages to the GUI logger panel with a single JPype call and JavaFX update"""
+
+        try:
+            if self.app_instance and entries:
+                if not hasattr(self.app_instance, "logMessages"):  # GUI built before batching - one call each
+                    for level, message, timestamp in entries:
+                        self.app_instance.logMessage(level, message, timestamp)
+                    return
+
+                levels, messages, timestamps = zip(*entries)
+                self.app_instance.logMessages(JArray(JString)(levels), JArray(JString)(messages),
+                                              JArray(JString)(timestamps))
+
+        except Exception as e:
+            # If GUI logging fails, don't raise error, just warn developers:
+            if self.ctx:
+                self.ctx.logger.warning(f"Failed to log batch to GUI: {str(e)}")
+
+
     def cleanup(self) -> None:
         """Clean shutdown of GUI and JVM resources"""
 
@@ -237,37 +285,39 @@ class GUIBridge:
             javafx_thread = threading.Thread(target=AppController.launchApp, daemon=True)
             javafx_thread.start()
 
-            # Wait for GUI instance creation with timeout and retry logic:
+            # Wait for GUI instance creation with timeout and retry logic (polled, so a fast start is not padded):
             retry_count = getattr(self.ctx.config.input, 'retry_count', 3)
             max_wait_time = retry_count * 2  # 2 seconds per retry
+            launch_started = time.monotonic()
 
-            for attempt in range(max_wait_time):
-                self.ctx.logger.info(f"Waiting for GUI instance creation... (attempt {attempt + 1}/{max_wait_time})")
-                time.sleep(1)
-
+            self.ctx.logger.info(f"Waiting for GUI instance creation (up to {max_wait_time} s)...")
+            deadline = launch_started + max_wait_time
+            while time.monotonic() < deadline:
                 self.app_instance = AppController.getInstance()
                 if self.app_instance is not None:
                     break
+                time.sleep(LAUNCH_POLL_INTERVAL)
 
             if self.app_instance is None:
-                error_msg = f"Failed to get GUI application instance after {max_wait_time} attempts"
+                error_msg = f"Failed to get GUI application instance after {max_wait_time} seconds"
                 self.ctx.logger.error(error_msg)
                 raise self.ctx.errors.DeviceError(error_msg)
 
             # Wait for GUI to actually start running (fix race condition):
             self.ctx.logger.info("GUI instance created, waiting for startup...")
-            for startup_attempt in range(5):  # 5 second timeout for startup
-                time.sleep(1)
+            deadline = time.monotonic() + GUI_STARTUP_TIMEOUT
+            while time.monotonic() < deadline:
                 try:
                     if self.app_instance.isRunning():
-                        self.ctx.logger.info("GUI application started successfully, isRunning() = True")
+                        self.ctx.logger.info(f"GUI application started successfully, isRunning() = True "
+                                             f"({time.monotonic() - launch_started:.2f} s after launch)")
                         return  # Success - GUI is fully running
                 except Exception as e:
                     self.ctx.logger.warning(f"Error checking GUI running status: {str(e)}")
-                    continue
+                time.sleep(LAUNCH_POLL_INTERVAL)
 
             # GUI instance exists but not running - warn but don't fail:
-            self.ctx.logger.warning("GUI instance created but not running after 5 seconds")
+            self.ctx.logger.warning(f"GUI instance created but not running after {GUI_STARTUP_TIMEOUT:.0f} seconds")
             try:
                 is_running = self.app_instance.isRunning()
                 self.ctx.logger.info(f"Final GUI status check: isRunning() = {is_running}")
@@ -301,6 +351,46 @@ class GUIBridge:
             raise self.ctx.errors.DeviceError(error_msg)
 
 
+    def _setup_close_callback(self) -> None:
+        """Setup window-closed callback so waiters are woken instead of polling isRunning()"""
+
+        if not self.app_instance or self.close_callback_registered:
+            return
+
+        try:
+            java_callback = jpype.JProxy("java.lang.Runnable", dict(run=self._gui_closed_callback))
+            self.app_instance.setOnApplicationClosedCallback(java_callback)
+            self.close_callback_registered = True
+
+            self.ctx.logger.info("Window-closed callback registered successfully")
+
+        except Exception as e:
+            # Older GUI builds lack the hook - fall back to periodic liveness checks:
+            self.ctx.logger.warning(f"Failed to register window-closed callback, using liveness checks: {str(e)}")
+
+
+    def _gui_closed_callback(self) -> None:
+        """Internal callback function called when the user closes the GUI window"""
+
+        try:
+            self.ctx.logger.info("GUI was closed by user")
+            self.gui_closed.set()
+            self.data_queue.put(GUI_CLOSED)
+
+        except Exception as e:
+            self.ctx.logger.error(f"Error in window-closed callback: {str(e)}")
+
+
+    def _is_gui_running(self) -> bool:
+        """Check GUI liveness through the JVM (fallback path only)"""
+
+        try:
+            return bool(self.app_instance) and bool(self.app_instance.isRunning())
+        except Exception:
+            # If we can't check GUI status, assume it's still running:
+            return True
+
+
     def _data_submitted_callback(self) -> None:
         """Internal callback function called when user submits data in GUI"""
 
@@ -2,7 +2,7 @@
 
 #%% Dependencies:
 
-from typing import Any, Protocol
+from typing import Any, Optional, Protocol, Tuple
 from pydantic import ValidationError
 
 #%% Bridge Protocol:
@@ -20,6 +20,14 @@ class InputStrategy(Protocol):
         ...
 
 
+    def wait_for_trigger(self, timeout: Optional[float] = None) -> Tuple[str, Any]:
+        """
+        Block until the user starts a testing cycle or leaves the application
+        Returns ("start_testing", data), ("exit_application", None) or ("wait", None) on timeout
+        """
+        ...
+
+
     def unlock_interface(self) -> None:
         """
         GUI: Ready for next cycle
@@ -87,6 +95,17 @@ class InputInterface:
                         # If GUI logging fails, don't raise - just warn developers:
                         self.ctx.logger.warning(f"GUI user message failed: {str(e)}")
 
+                def user_batch_func(entries: list) -> None:
+                    """Send one frame of (level, message, timestamp) entries to the GUI log panel in a single call"""
+                    if hasattr(self.strategy, 'log_batch_to_gui'):
+                        self.strategy.log_batch_to_gui(entries)
+                    else:
+                        for level, message, _ in entries:
+                            user_message_func(level, message)
+
+                # Used by the asynchronous logging pipeline (the logger falls back to per-message calls otherwise):
+                self.ctx.logger.user_batch_handler = user_batch_func
+
             else:  # CLI
 
                 def user_message_func(level: str, message: str) -> None:
@@ -147,6 +166,19 @@ class InputInterface:
             raise self.ctx.errors.DeviceError(error_msg)
 
 
+    def wait_for_trigger(self, timeout: Optional[float] = None  # Seconds to block, None blocks until an event
+                        ) -> Tuple[str, Any]:                    # (trigger, data) as returned by the strategy
+        """Block until the strategy reports a user trigger (submission, GUI closed, CLI session end)"""
+
+        try:
+            return self.strategy.wait_for_trigger(timeout)
+
+        except Exception as e:
+            error_msg = f"Failed to wait for user trigger: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.DeviceError(error_msg)
+
+
     def unlock_interface(self) -> None:
         """
         Signal that testing has completed and unlock the interface:
@@ -3,9 +3,18 @@
 #%% Dependencies:
 
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Literal, Any
 from pydantic import BaseModel, Field, field_validator
 
+#%% Helper Functions:
+
+@lru_cache(maxsize=1024)
+def _parse_date(value: str) -> datetime:
+    """strptime for DD.MM.YYYY, cached - a session only sees a handful of distinct dates"""
+
+    return datetime.strptime(value, "%d.%m.%Y")
+
 #%% Main Class:
 
 class InputData(BaseModel):
@@ -57,7 +66,7 @@ class InputData(BaseModel):
 
         try:
             # Parse the date to validate format:
-            datetime.strptime(v, "%d.%m.%Y")
+            _parse_date(v)
         except ValueError:
             raise ValueError("Date must be in DD.MM.YYYY format")
 
@@ -99,8 +108,8 @@ class InputData(BaseModel):
         """Calculate sample age in days as testing_date - sampling_date"""
 
         try:
-            sampling_dt = datetime.strptime(self.sampling_date, "%d.%m.%Y")
-            testing_dt = datetime.strptime(self.testing_date, "%d.%m.%Y")
+            sampling_dt = _parse_date(self.sampling_date)
+            testing_dt = _parse_date(self.testing_date)
             age_delta = testing_dt - sampling_dt
             age_days = age_delta.days
 
@@ -0,0 +1,286 @@
+"""Measurement store - columnar (array-backed) specimens for analytics over many sets"""
+
+#%% Dependencies:
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app_modules.models.unit_conversion import QUANTITIES, factor, format_values
+
+#%% Constants:
+
+MISSING = math.nan  # Value of a measurement the specimen does not have (e.g., mass for beam protocols)
+
+BASE_UNITS = {"mass": "kg", "load": "N", "strength": "N/mm²"}
+
+#%% Dictionary Encoding:
+
+class EncodedColumn:
+    """Repeated strings (units, protocols) stored as small integer codes into a shared vocabulary"""
+
+    def __init__(self):
+
+        self.codes = array("H")
+        self.values: List[Any] = []
+        self._index: Dict[Any, int] = {}
+
+
+    def append(self, value: Any) -> None:
+        """Encode and append one value"""
+
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+
+    def __getitem__(self, position: int) -> Any:
+        """Decoded value at a row"""
+
+        return self.values[self.codes[position]]
+
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+#%% Measurement Store:
+
+class MeasurementStore:
+    """
+    One array per measured field instead of one Pydantic object per measurement:
+    - specimen columns: mass, load, strength (float64, NaN = not measured), their decimals and encoded units;
+    - set columns: encoded protocol, set_id and input data, with offsets into the specimen columns.
+    Converts to and from SetData/BatchData without loss.
+    """
+
+    def __init__(self):
+        """Create an empty store"""
+
+        # Specimen columns (one row per specimen):
+        self.mass = array("d")
+        self.load = array("d")
+        self.strength = array("d")
+        self.mass_decimals = array("b")
+        self.load_decimals = array("b")
+        self.strength_decimals = array("b")
+        self.mass_unit = EncodedColumn()
+        self.load_unit = EncodedColumn()
+        self.strength_unit = EncodedColumn()
+
+        # Set columns (one row per set); specimens of set i are rows set_offsets[i]:set_offsets[i + 1]:
+        self.protocol = EncodedColumn()
+        self.set_ids: List[str] = []
+        self.input_data: List[Any] = []  # InputData instances, or dicts when loaded from the registry
+        self.set_offsets = array("L", [0])
+
+
+    @property
+    def set_count(self) -> int:
+        """Number of sets"""
+
+        return len(self.set_ids)
+
+
+    def __len__(self) -> int:
+        """Number of specimens"""
+
+        return len(self.mass)
+
+#%% Conversion:
+
+    @classmethod
+    def from_sets(cls, sets: Iterable[Any]) -> "MeasurementStore":
+        """Columnar copy of SetData instances"""
+
+        store = cls()
+        for set_data in sets:
+            store.append_set(set_data)
+        return store
+
+
+    @classmethod
+    def from_batch(cls, batch: Any) -> "MeasurementStore":
+        """Columnar copy of a BatchData"""
+
+        return cls.from_sets(batch.sets)
+
+
+    @classmethod
+    def from_registry(cls, registry: Any,  # RegistryManager
+                      **query: Any         # RegistryManager.query() filters (date_from, client, ...)
+                     ) -> "MeasurementStore":
+        """Load registry history straight into columns (no model objects are built)"""
+
+        store = cls()
+        for set_row, specimens in registry.specimen_rows(**query):
+            store._append_set_columns(set_row["protocol"], set_row["set_id"], set_row["input_data"])
+            for specimen in specimens:
+                store._append_specimen_columns(specimen["mass"], None, specimen["mass_unit"],
+                                               specimen["load"], None, specimen["load_unit"],
+                                               specimen["strength"], None, specimen["strength_unit"])
+            store.set_offsets.append(len(store))
+        return store
+
+
+    def append_set(self, set_data: Any) -> None:
+        """Append one SetData"""
+
+        input_data = set_data.input_data
+        self._append_set_columns(input_data.protocol, input_data.set_id, input_data)
+
+        for specimen in set_data.specimens:
+            scale, press = specimen.scale_data, specimen.press_data
+            self._append_specimen_columns(scale.mass if scale else None,
+                                          scale.mass_decimals if scale else None,
+                                          scale.mass_unit if scale else None,
+                                          press.load if press else None,
+                                          press.load_decimals if press else None,
+                                          press.load_unit if press else None,
+                                          press.strength if press else None,
+                                          press.strength_decimals if press else None,
+                                          press.strength_unit if press else None)
+
+        self.set_offsets.append(len(self))
+
+
+    def to_sets(self, data_models: Sequence  # (InputData, ScaleData, PressData, SpecimenData, SetData)
+               ) -> List[Any]:               # SetData instances in store order
+        """Rebuild SetData instances (the inverse of from_sets)"""
+
+        InputData, ScaleData, PressData, SpecimenData, SetData = data_models
+        sets = []
+
+        for set_index in range(self.set_count):
+            input_data = self.input_data[set_index]
+            if isinstance(input_data, dict):
+                input_data = InputData(**input_data)
+
+            set_data = SetData(input_data=input_data)
+            for row in range(self.set_offsets[set_index], self.set_offsets[set_index + 1]):
+                scale_data = None
+                if not math.isnan(self.mass[row]):
+                    scale_data = ScaleData(mass=self.mass[row], mass_unit=self.mass_unit[row],
+                                           **self._decimals("mass_decimals", self.mass_decimals[row]))
+
+                press_data = None
+                if not math.isnan(self.load[row]):
+                    press_data = PressData(load=self.load[row], load_unit=self.load_unit[row],
+                                           strength=self.strength[row], strength_unit=self.strength_unit[row],
+                                           **self._decimals("load_decimals", self.load_decimals[row]),
+                                           **self._decimals("strength_decimals", self.strength_decimals[row]))
+
+                set_data.specimens.append(SpecimenData(scale_data=scale_data, press_data=press_data))
+            sets.append(set_data)
+
+        return sets
+
+
+    def to_batch(self, data_models: Sequence,  # (InputData, ScaleData, PressData, SpecimenData, SetData)
+                 batch_class: type             # BatchData
+                ) -> Any:
+        """Rebuild a BatchData"""
+
+        return batch_class(sets=self.to_sets(data_models))
+
+
+    def _append_set_columns(self, protocol: str, set_id: str, input_data: Any) -> None:
+        """Append one row to the set columns (offsets are closed by the caller)"""
+
+        self.protocol.append(protocol)
+        self.set_ids.append(set_id)
+        self.input_data.append(input_data)
+
+
+    def _append_specimen_columns(self, mass: Optional[float], mass_decimals: Optional[int], mass_unit: Optional[str],
+                                 load: Optional[float], load_decimals: Optional[int], load_unit: Optional[str],
+                                 strength: Optional[float], strength_decimals: Optional[int],
+                                 strength_unit: Optional[str]) -> None:
+        """Append one specimen row (None -> NaN value, -1 decimals = model default)"""
+
+        for values, value in ((self.mass, mass), (self.load, load), (self.strength, strength)):
+            values.append(MISSING if value is None else value)
+        for decimals, value in ((self.mass_decimals, mass_decimals), (self.load_decimals, load_decimals),
+                                (self.strength_decimals, strength_decimals)):
+            decimals.append(-1 if value is None else value)
+        for units, value in ((self.mass_unit, mass_unit), (self.load_unit, load_unit),
+                             (self.strength_unit, strength_unit)):
+            units.append(value)
+
+
+    def _decimals(self, field: str, value: int) -> Dict[str, int]:
+        """Model keyword for a decimals column (-1 leaves the model default)"""
+
+        return {} if value < 0 else {field: value}
+
+#%% Vectorized Operations:
+
+    def values(self, quantity: str,            # "mass", "load" or "strength"
+               unit: Optional[str] = None      # Target unit (None = base unit: kg, N, N/mm²)
+              ) -> array:                      # One float per specimen, NaN where not measured
+        """Whole column converted to one unit (one factor lookup per distinct unit, not per value)"""
+
+        if quantity not in QUANTITIES:
+            raise KeyError(f"Unknown quantity '{quantity}'. Available: {list(QUANTITIES)}")
+
+        target = unit or BASE_UNITS[quantity]
+
+        # Factor per vocabulary code, applied to the raw column in one pass (NaN stays NaN):
+        units = getattr(self, QUANTITIES[quantity][1])
+        factors = [factor(quantity, name, target) if name is not None else 1.0 for name in units.values]
+        raw = getattr(self, quantity)
+        if len(factors) == 1:
+            multiplier = factors[0]
+            return array("d", raw) if multiplier == 1.0 else array("d", [value * multiplier for value in raw])
+        return array("d", [value * factors[code] for value, code in zip(raw, units.codes)])
+
+
+    def formatted(self, quantity: str,     # "mass", "load" or "strength"
+                  unit: str,               # Target unit (appended to every string)
+                  decimals: int
+                 ) -> List[str]:           # One string per specimen ("-" where not measured)
+        """Whole column converted and formatted for receipts and exports"""
+
+        return format_values(self.values(quantity, unit), decimals, unit)
+
+
+    def aggregate(self, quantity: str,            # "mass", "load" or "strength"
+                  unit: Optional[str] = None,     # Target unit (None = base unit)
+                  by: Optional[str] = None        # None (everything), "protocol" or "set"
+                 ) -> Dict[str, Dict[str, float]]:  # Group -> count, mean, std, min, max
+        """Statistics of a converted column, skipping specimens without that measurement"""
+
+        converted = self.values(quantity, unit)
+
+        if by is None:
+            return {"all": _statistics(converted)}
+
+        if by == "set":
+            return {self.set_ids[index]: _statistics(converted[self.set_offsets[index]:self.set_offsets[index + 1]])
+                    for index in range(self.set_count)}
+
+        if by == "protocol":
+            groups: Dict[str, array] = {}
+            for index in range(self.set_count):
+                group = groups.setdefault(self.protocol[index], array("d"))
+                group.extend(converted[self.set_offsets[index]:self.set_offsets[index + 1]])
+            return {protocol: _statistics(group) for protocol, group in groups.items()}
+
+        raise KeyError(f"Unknown grouping '{by}'. Available: None, 'protocol', 'set'")
+
+#%% Helper Functions:
+
+def _statistics(values: Sequence[float]) -> Dict[str, float]:
+    """count/mean/std (sample)/min/max over the non-NaN values"""
+
+    present = [value for value in values if value == value]  # NaN != NaN
+    count = len(present)
+    if not count:
+        return {"count": 0, "mean": MISSING, "std": MISSING, "min": MISSING, "max": MISSING}
+
+    mean = math.fsum(present) / count
+    std = math.sqrt(math.fsum((value - mean) ** 2 for value in present) / (count - 1)) if count > 1 else 0.0
+    return {"count": count, "mean": mean, "std": std, "min": min(present), "max": max(present)}
+
+#%%
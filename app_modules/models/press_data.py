@@ -14,6 +14,16 @@ class PressData(BaseModel):
     ALLOWED_LOAD_UNITS: ClassVar[set] = {"N", "kN", "MN"}
     ALLOWED_STRENGTH_UNITS: ClassVar[set] = {"N/mm²", "MPa", "Pa", "kPa", "GPa"}
 
+    # Conversion factors relative to base units (N, N/mm²):
+    LOAD_CONVERSIONS: ClassVar[dict] = {"N": 1.0,        # Newton
+                                        "kN": 0.001,     # kilo Newton
+                                        "MN": 0.000001}  # mega Newton
+    STRENGTH_CONVERSIONS: ClassVar[dict] = {"N/mm²": 1.0,     # Not SI, but practical standard
+                                            "MPa": 1.0,       # 1 N/mm² = 1 MPa
+                                            "Pa": 1000000.0,  # 1 N/mm² = 1,000,000 Pa
+                                            "kPa": 1000.0,    # 1 N/mm² = 1,000 kPa
+                                            "GPa": 0.001}     # 1 N/mm² = 0.001 GPa
+
     # Measurement fields:
     load: float = Field(..., description="Maximum force reached (assumed in Newtons unless specified otherwise)", ge=0.0)
     strength: float = Field(..., description="Calculated peak strength (assumed in N/mm² unless specified otherwise)", ge=0.0)
@@ -68,13 +78,8 @@ class PressData(BaseModel):
             if unit not in self.ALLOWED_LOAD_UNITS:
                 raise ctx.errors.ValidationError(f"Load unit must be one of: {', '.join(sorted(self.ALLOWED_LOAD_UNITS))}")
 
-            # Define conversion factors relative to base SI unit (N):
-            load_conversions = {"N": 1.0,        # Newton
-                                "kN": 0.001,     # kilo Newton
-                                "MN": 0.000001}  # mega Newton
-
-            current_factor = load_conversions[self.load_unit]
-            new_factor = load_conversions[unit]
+            current_factor = self.LOAD_CONVERSIONS[self.load_unit]
+            new_factor = self.LOAD_CONVERSIONS[unit]
 
             # Convert value - first to base unit (N), then to target unit:
             old_load = self.load
@@ -96,15 +101,8 @@ class PressData(BaseModel):
             if unit not in self.ALLOWED_STRENGTH_UNITS:
                 raise ctx.errors.ValidationError(f"Strength unit must be one of: {', '.join(sorted(self.ALLOWED_STRENGTH_UNITS))}")
 
-            # Define conversion factors relative to base SI unit (N/mm²):
-            strength_conversions = {"N/mm²": 1.0,     # Not SI, but practical standard
-                                    "MPa": 1.0,       # 1 N/mm² = 1 MPa
-                                    "Pa": 1000000.0,  # 1 N/mm² = 1,000,000 Pa
-                                    "kPa": 1000.0,    # 1 N/mm² = 1,000 kPa
-                                    "GPa": 0.001}     # 1 N/mm² = 0.001 GPa
-
-            current_factor = strength_conversions[self.strength_unit]
-            new_factor = strength_conversions[unit]
+            current_factor = self.STRENGTH_CONVERSIONS[self.strength_unit]
+            new_factor = self.STRENGTH_CONVERSIONS[unit]
 
             # Convert value - first to base unit (N/mm²), then to target unit:
             old_strength = self.strength
@@ -13,6 +13,14 @@ class ScaleData(BaseModel):
     # Allowed units:
     ALLOWED_MASS_UNITS: ClassVar[set] = {"kg", "g", "mg", "t", "lb", "oz"}
 
+    # Conversion factors relative to base SI unit (kg):
+    MASS_CONVERSIONS: ClassVar[dict] = {"kg": 1.0,        # Kilogram
+                                        "g": 1000.0,      # Gram
+                                        "mg": 1000000.0,  # Miligram
+                                        "t": 0.001,       # Metric ton
+                                        "lb": 2.20462,    # Pounds
+                                        "oz": 35.274}     # Ounces
+
     # Measurement field:
     mass: float = Field(..., description="Mass of the specimen (assumed in kilograms unless specified otherwise)", ge=0.0)
 
@@ -48,16 +56,8 @@ class ScaleData(BaseModel):
             if unit not in self.ALLOWED_MASS_UNITS:
                 raise ctx.errors.ValidationError(f"Mass unit must be one of: {', '.join(sorted(self.ALLOWED_MASS_UNITS))}")
             
-            # Define conversion factors relative to base SI unit (kg):
-            mass_conversions = {"kg": 1.0,        # Kilogram
-                                "g": 1000.0,      # Gram
-                                "mg": 1000000.0,  # Miligram
-                                "t": 0.001,       # Metric ton
-                                "lb": 2.20462,    # Pounds
-                                "oz": 35.274}     # Ounces
-
-            current_factor = mass_conversions[self.mass_unit]
-            new_factor = mass_conversions[unit]
+            current_factor = self.MASS_CONVERSIONS[self.mass_unit]
+            new_factor = self.MASS_CONVERSIONS[unit]
 
             # Convert value - first to base unit (kg), then to target unit:
             old_mass = self.mass
@@ -3,7 +3,9 @@
 #%% Dependencies:
 
 from typing import List, Any
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+from app_modules.models.statistics_engine import SetStatistics, add_specimen
 
 #%% Main Class:
 
@@ -16,6 +18,10 @@ class SetData(BaseModel):
     # Collection of specimens (size must match input_data.set_size):
     specimens: List[Any] = Field(default_factory=list, description="List of specimen measurements")
 
+    # Running statistics, updated per added specimen (not part of the model's data):
+    _statistics: Any = PrivateAttr(default=None)
+    _counted: List[Any] = PrivateAttr(default_factory=list)  # Specimens already included in _statistics, in order
+
 
     @field_validator('specimens')
     @classmethod
@@ -47,6 +53,33 @@ class SetData(BaseModel):
         self.specimens.append(specimen)
         ctx.logger.info(f"Added specimen to set. Count: {len(self.specimens)}/{self.input_data.set_size}")
 
+        # Live set statistics for the GUI log panel (O(1) per specimen):
+        strength = self.statistics.strength
+        if strength.count:
+            spread = f", s {strength.std:.2f}, CV {strength.cv:.1f} %" if strength.std is not None else ""
+            ctx.logger.info(f"Set so far: {strength.count} result(s), mean {strength.mean:.2f} N/mm²{spread} "
+                            f"(min {strength.min:.2f}, max {strength.max:.2f})", target="user")
+
+
+    @property
+    def statistics(self) -> SetStatistics:
+        """Running mass/load/strength statistics - appended specimens are folded in, any other change rebuilds"""
+
+        # Counted specimens must still lead the list (same objects) - replaced or removed ones force a rebuild:
+        counted = len(self._counted)
+        if self._statistics is None or counted > len(self.specimens) or \
+           any(specimen is not self.specimens[index] for index, specimen in enumerate(self._counted)):
+            self._statistics = SetStatistics(self.input_data.set_id, self.input_data.protocol,
+                                             self.input_data.concrete_class)
+            self._counted, counted = [], 0
+
+        # Specimens added without add_specimen (e.g., loaders extending the list) are folded in once:
+        for specimen in self.specimens[counted:]:
+            add_specimen(self._statistics, specimen)
+            self._counted.append(specimen)
+
+        return self._statistics
+
 
     def is_complete(self) -> bool:
         """Check if the set has all required specimens"""
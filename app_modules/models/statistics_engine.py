@@ -0,0 +1,278 @@
+"""Statistics engine - single-pass set and cross-set statistics with characteristic strength and conformity checks"""
+
+#%% Dependencies:
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app_modules.models.unit_conversion import factor
+
+#%% Constants:
+
+CHARACTERISTIC_FRACTILE = 1.645  # 5 % fractile of the normal distribution (characteristic strength estimate)
+
+# Conformity criteria for compressive strength (EN 206, Table 14), all in N/mm²:
+INITIAL_PRODUCTION_GROUP = 3        # Smallest group the criteria apply to
+INITIAL_PRODUCTION_MARGIN = 4.0     # Criterion 1, initial production: fcm >= fck + 4
+CONTINUOUS_PRODUCTION_GROUP = 15    # Results needed for the continuous production criterion
+CONTINUOUS_PRODUCTION_FACTOR = 1.48 # Criterion 1, continuous production: fcm >= fck + 1.48 σ
+INDIVIDUAL_MARGIN = 4.0             # Criterion 2, any group: every fci >= fck - 4
+
+# Protocols whose strengths are cube compressive strengths (the class' second number, e.g. 30 in C25/30) -
+# beam compression halves are not cubes, so EN 206 cube criteria do not apply to them:
+COMPRESSION_PROTOCOLS = {"cube_compression_testing"}
+
+CONCRETE_CLASS_PATTERN = re.compile(r"^\s*L?C\s*(\d+(?:[.,]\d+)?)\s*/\s*(\d+(?:[.,]\d+)?)", re.IGNORECASE)
+
+#%% Running Statistics:
+
+class RunningStats:
+    """Welford accumulator: count, mean, variance, min and max in one pass, mergeable across sets"""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0       # Sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+
+    def add(self, value: Optional[float]) -> None:
+        """Include one value (None/NaN are ignored)"""
+
+        if value is None or value != value:
+            return
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+
+    def merge(self, other: "RunningStats") -> None:
+        """Combine another accumulator into this one (Chan et al. parallel update)"""
+
+        if not other.count:
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance (None below two values)"""
+
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation"""
+
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+
+    @property
+    def cv(self) -> Optional[float]:
+        """Coefficient of variation in percent"""
+
+        std = self.std
+        return std / self.mean * 100.0 if std is not None and self.mean else None
+
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """Plain values (None where undefined)"""
+
+        present = self.count > 0
+        return {"count": self.count,
+                "mean": self.mean if present else None,
+                "std": self.std,
+                "cv": self.cv,
+                "min": self.min if present else None,
+                "max": self.max if present else None}
+
+
+def summarize(values: Iterable[Optional[float]]) -> RunningStats:
+    """Statistics of any value sequence in one pass"""
+
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+
+def receipt_mean(values: Iterable[Optional[float]]  # A receipt's displayed (already rounded) column
+                ) -> float:                          # 0.0 when there is nothing to average
+    """Average printed next to a receipt row - computed from the printed values so the "Media" cell matches them"""
+
+    present = [value for value in values if value is not None and value == value]  # NaN != NaN
+    return sum(present) / len(present) if present else 0.0
+
+#%% Conformity:
+
+def parse_concrete_class(concrete_class: str) -> Optional[Tuple[float, float]]:
+    """(fck,cyl, fck,cube) in N/mm² from a class such as "C25/30" (None if not a strength class)"""
+
+    match = CONCRETE_CLASS_PATTERN.match(concrete_class or "")
+    if match is None:
+        return None
+    return float(match.group(1).replace(",", ".")), float(match.group(2).replace(",", "."))
+
+
+@dataclass(frozen=True)
+class Conformity:
+    """Outcome of the compressive strength conformity criteria for one group of results"""
+
+    fck: float              # Characteristic cube strength of the declared class (N/mm²)
+    criterion: str          # "initial production" (n < 15) or "continuous production"
+    required_mean: float    # Criterion 1 threshold for the mean
+    required_minimum: float # Criterion 2 threshold for every individual result
+    mean_ok: bool
+    minimum_ok: bool
+
+    @property
+    def conforms(self) -> bool:
+        """Both criteria met"""
+
+        return self.mean_ok and self.minimum_ok
+
+
+    def describe(self) -> str:
+        """One-line verdict for logs and summaries"""
+
+        verdict = "conform" if self.conforms else "NOT conform"
+        return (f"{verdict} ({self.criterion}: mean >= {self.required_mean:.2f}, "
+                f"each >= {self.required_minimum:.2f} N/mm²)")
+
+
+def check_conformity(concrete_class: str,   # Declared class, e.g. "C25/30"
+                     strength: RunningStats # Cube compressive strengths (N/mm²)
+                    ) -> Optional[Conformity]:  # None if the class is unknown or too few results
+    """EN 206 criteria 1 and 2 for the group's mean and minimum"""
+
+    strengths = parse_concrete_class(concrete_class)
+    if strengths is None or strength.count < INITIAL_PRODUCTION_GROUP:
+        return None
+
+    fck = strengths[1]
+    if strength.count >= CONTINUOUS_PRODUCTION_GROUP:
+        criterion, required_mean = "continuous production", fck + CONTINUOUS_PRODUCTION_FACTOR * strength.std
+    else:
+        criterion, required_mean = "initial production", fck + INITIAL_PRODUCTION_MARGIN
+    required_minimum = fck - INDIVIDUAL_MARGIN
+
+    return Conformity(fck=fck, criterion=criterion, required_mean=required_mean, required_minimum=required_minimum,
+                      mean_ok=strength.mean >= required_mean, minimum_ok=strength.min >= required_minimum)
+
+#%% Set Statistics:
+
+@dataclass
+class SetStatistics:
+    """Statistics of one set in base units (mass kg, load N, strength N/mm²)"""
+
+    set_id: str
+    protocol: str
+    concrete_class: str
+    mass: RunningStats = field(default_factory=RunningStats)
+    load: RunningStats = field(default_factory=RunningStats)
+    strength: RunningStats = field(default_factory=RunningStats)
+
+    @property
+    def conformity(self) -> Optional[Conformity]:
+        """Conformity of this set's strengths (cube compression only)"""
+
+        if self.protocol not in COMPRESSION_PROTOCOLS:
+            return None
+        return check_conformity(self.concrete_class, self.strength)
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain values (e.g., for receipt data sent to worker processes)"""
+
+        conformity = self.conformity
+        return {"mass": self.mass.to_dict(),
+                "load": self.load.to_dict(),
+                "strength": self.strength.to_dict(),
+                "conformity": conformity.describe() if conformity else None}
+
+
+def set_statistics(set_data: Any) -> SetStatistics:
+    """Mass, load and strength statistics of a SetData in one pass over its specimens"""
+
+    input_data = set_data.input_data
+    statistics = SetStatistics(input_data.set_id, input_data.protocol, input_data.concrete_class)
+    for specimen in set_data.specimens:
+        add_specimen(statistics, specimen)
+    return statistics
+
+
+def statistics_for(set_data: Any) -> SetStatistics:
+    """A set's statistics - the running ones SetData keeps (O(1)), computed for other set types (e.g., records)"""
+
+    running = getattr(set_data, "statistics", None)
+    return running if running is not None else set_statistics(set_data)
+
+
+def add_specimen(statistics: SetStatistics, specimen: Any) -> None:
+    """Include one SpecimenData, converted to base units"""
+
+    scale, press = specimen.scale_data, specimen.press_data
+    if scale is not None:
+        statistics.mass.add(scale.mass * factor("mass", scale.mass_unit, "kg"))
+    if press is not None:
+        statistics.load.add(press.load * factor("load", press.load_unit, "N"))
+        statistics.strength.add(press.strength * factor("strength", press.strength_unit, "N/mm²"))
+
+#%% Cross-Set Statistics:
+
+@dataclass
+class ClassStatistics:
+    """Compressive strength statistics of every set declared with one concrete class"""
+
+    concrete_class: str
+    sets: int = 0
+    strength: RunningStats = field(default_factory=RunningStats)
+
+    @property
+    def characteristic_strength(self) -> Optional[float]:
+        """Estimated characteristic strength of the results (mean - 1.645 σ)"""
+
+        std = self.strength.std
+        return self.strength.mean - CHARACTERISTIC_FRACTILE * std if std is not None else None
+
+
+    @property
+    def conformity(self) -> Optional[Conformity]:
+        """Conformity of all results of the class taken as one group"""
+
+        return check_conformity(self.concrete_class, self.strength)
+
+
+def class_statistics(statistics: Iterable[SetStatistics]  # Per-set statistics (e.g., a day's or a batch's sets)
+                    ) -> Dict[str, ClassStatistics]:      # Concrete class -> merged statistics
+    """Merge per-set strength accumulators by concrete class (cube compression only, no rescans)"""
+
+    classes: Dict[str, ClassStatistics] = {}
+    for set_stats in statistics:
+        if set_stats.protocol not in COMPRESSION_PROTOCOLS:
+            continue
+        group = classes.setdefault(set_stats.concrete_class, ClassStatistics(set_stats.concrete_class))
+        group.sets += 1
+        group.strength.merge(set_stats.strength)
+    return classes
+
+#%%
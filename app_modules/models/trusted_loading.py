@@ -0,0 +1,152 @@
+"""
+Trusted loading - lightweight records for data read back from our own journal/registry
+Records skip Pydantic validation (the data was validated when it was measured) and upgrade to models on demand.
+model_construct is not used: with pydantic-core it is slower than validated construction for these small models.
+"""
+
+#%% Dependencies:
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from app_modules.models.press_data import PressData
+from app_modules.models.scale_data import ScaleData
+from app_modules.models.set_data import SetData
+
+#%% Records:
+
+class ScaleRecord:
+    """Read-only stand-in for ScaleData (same fields and formatting, defaults mirror ScaleData)"""
+
+    __slots__ = ("mass", "mass_decimals", "mass_unit")
+
+    def __init__(self, mass: float, mass_decimals: int = 1, mass_unit: str = "kg"):
+
+        self.mass = mass
+        self.mass_decimals = mass_decimals
+        self.mass_unit = mass_unit
+
+
+    get_formatted_mass = ScaleData.get_formatted_mass
+
+
+    def to_model(self, data_models: Sequence) -> Any:
+        """Validated ScaleData"""
+
+        return data_models[1](mass=self.mass, mass_decimals=self.mass_decimals, mass_unit=self.mass_unit)
+
+
+class PressRecord:
+    """Read-only stand-in for PressData (same fields and formatting, defaults mirror PressData)"""
+
+    __slots__ = ("load", "strength", "load_decimals", "strength_decimals", "load_unit", "strength_unit")
+
+    def __init__(self, load: float, strength: float, load_decimals: int = 0, strength_decimals: int = 2,
+                 load_unit: str = "N", strength_unit: str = "N/mm²"):
+
+        self.load = load
+        self.strength = strength
+        self.load_decimals = load_decimals
+        self.strength_decimals = strength_decimals
+        self.load_unit = load_unit
+        self.strength_unit = strength_unit
+
+
+    get_formatted_load = PressData.get_formatted_load
+    get_formatted_strength = PressData.get_formatted_strength
+
+
+    def to_model(self, data_models: Sequence) -> Any:
+        """Validated PressData"""
+
+        return data_models[2](load=self.load, strength=self.strength, load_decimals=self.load_decimals,
+                              strength_decimals=self.strength_decimals, load_unit=self.load_unit,
+                              strength_unit=self.strength_unit)
+
+
+class SpecimenRecord:
+    """Read-only stand-in for SpecimenData"""
+
+    __slots__ = ("scale_data", "press_data")
+
+    def __init__(self, scale_data: Optional[ScaleRecord] = None, press_data: Optional[PressRecord] = None):
+
+        self.scale_data = scale_data
+        self.press_data = press_data
+
+
+    def to_model(self, data_models: Sequence) -> Any:
+        """Validated SpecimenData"""
+
+        return data_models[3](scale_data=self.scale_data.to_model(data_models) if self.scale_data else None,
+                              press_data=self.press_data.to_model(data_models) if self.press_data else None)
+
+
+class SetRecord:
+    """Read-only stand-in for SetData (input_data is a validated InputData - one per set is cheap)"""
+
+    __slots__ = ("input_data", "specimens")
+
+    def __init__(self, input_data: Any, specimens: Optional[List[SpecimenRecord]] = None):
+
+        self.input_data = input_data
+        self.specimens = specimens if specimens is not None else []
+
+
+    is_complete = SetData.is_complete
+
+
+    def to_model(self, data_models: Sequence) -> Any:
+        """Validated SetData (specimens attached afterwards so partial sets upgrade too)"""
+
+        set_data = data_models[4](input_data=self.input_data)
+        set_data.specimens.extend(specimen.to_model(data_models) for specimen in self.specimens)
+        return set_data
+
+#%% Record Construction:
+
+def specimen_record(data: Dict[str, Optional[Dict[str, Any]]]  # SpecimenData.model_dump() output
+                   ) -> SpecimenRecord:
+    """SpecimenRecord from a journaled specimen"""
+
+    scale_data, press_data = data.get("scale_data"), data.get("press_data")
+    return SpecimenRecord(ScaleRecord(**scale_data) if scale_data else None,
+                          PressRecord(**press_data) if press_data else None)
+
+
+def upgrade(record: Any, data_models: Sequence) -> Any:
+    """Validated model for a record; models pass through unchanged (e.g., before resuming acquisition)"""
+
+    return record.to_model(data_models) if hasattr(record, "to_model") else record
+
+#%% Storage Loaders:
+
+def specimens_from_journal(journal: Any,   # MeasurementJournal
+                           set_id: str
+                          ) -> List[SpecimenRecord]:  # In specimen order
+    """Specimens journaled for a set (latest record wins when a specimen was re-measured)"""
+
+    records = {record["specimen_number"]: record["data"] for record in journal.records_for(set_id, kind="specimen")}
+    return [specimen_record(records[number]) for number in sorted(records)]
+
+
+def sets_from_registry(registry: Any,          # RegistryManager
+                       data_models: Sequence,  # (InputData, ScaleData, PressData, SpecimenData, SetData)
+                       **query: Any            # RegistryManager.query() filters (date_from, client, ...)
+                      ) -> List[SetRecord]:    # Oldest first
+    """Registered sets with their specimens from one joined query, as records"""
+
+    InputData = data_models[0]
+    sets = []
+
+    for set_row, rows in registry.specimen_rows(**query):
+        specimens = [SpecimenRecord(ScaleRecord(row["mass"], mass_unit=row["mass_unit"])
+                                    if row["mass"] is not None else None,
+                                    PressRecord(row["load"], row["strength"], load_unit=row["load_unit"],
+                                                strength_unit=row["strength_unit"])
+                                    if row["load"] is not None else None)
+                     for row in rows]
+        sets.append(SetRecord(InputData(**set_row["input_data"]), specimens))
+
+    return sets
+
+#%%
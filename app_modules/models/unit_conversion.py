@@ -0,0 +1,120 @@
+"""Unit conversion - whole-column conversion and formatting of measurements using precomputed factor tables"""
+
+#%% Dependencies:
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app_modules.models.press_data import PressData
+from app_modules.models.scale_data import ScaleData
+
+#%% Constants:
+
+MISSING_TEXT = "-"  # Formatted value of a missing measurement (None or NaN)
+
+# Measured quantity -> (model field, unit field, decimals field, factors relative to the base unit):
+QUANTITIES = {"mass": ("mass", "mass_unit", "mass_decimals", ScaleData.MASS_CONVERSIONS),
+              "load": ("load", "load_unit", "load_decimals", PressData.LOAD_CONVERSIONS),
+              "strength": ("strength", "strength_unit", "strength_decimals", PressData.STRENGTH_CONVERSIONS)}
+
+#%% Factor Tables:
+
+def _factor_matrix(conversions: Dict[str, float]) -> Dict[Tuple[str, str], float]:
+    """(from unit, to unit) -> multiplier, for every pair of units of one quantity"""
+
+    return {(source, target): conversions[target] / conversions[source]
+            for source in conversions for target in conversions}
+
+
+# Built once at import - a conversion is one dict lookup and one multiplication per value:
+FACTORS = {quantity: _factor_matrix(conversions) for quantity, (_, _, _, conversions) in QUANTITIES.items()}
+
+
+def factor(quantity: str,     # "mass", "load" or "strength"
+           source: str,       # Unit the values are in
+           target: str        # Unit wanted
+          ) -> float:
+    """Multiplier converting one unit to another"""
+
+    if quantity not in FACTORS:
+        raise KeyError(f"Unknown quantity '{quantity}'. Available: {list(FACTORS)}")
+
+    try:
+        return FACTORS[quantity][(source, target)]
+    except KeyError:
+        raise KeyError(f"Cannot convert {quantity} from '{source}' to '{target}'. "
+                       f"Available units: {list(QUANTITIES[quantity][3])}") from None
+
+#%% Bulk Conversion:
+
+def convert(quantity: str,                        # "mass", "load" or "strength"
+            values: Sequence[Optional[float]],    # Measurements (None/NaN stay missing)
+            source: Union[str, Sequence[str]],    # One unit for all values, or one unit per value
+            target: str                           # Unit wanted
+           ) -> List[Optional[float]]:
+    """Convert a whole column in one pass (one factor lookup per distinct unit, not per value)"""
+
+    if isinstance(source, str):
+        multiplier = factor(quantity, source, target)
+        if multiplier == 1.0:
+            return list(values)
+        return [None if value is None else value * multiplier for value in values]
+
+    multipliers = {unit: factor(quantity, unit, target) for unit in set(source) if unit is not None}
+    return [None if value is None or unit is None else value * multipliers[unit]
+            for value, unit in zip(values, source)]
+
+
+def format_values(values: Iterable[Optional[float]],  # Measurements
+                  decimals: int,
+                  unit: Optional[str] = None,           # Appended after a space when given
+                  missing: str = MISSING_TEXT           # Text for None/NaN values
+                 ) -> List[str]:
+    """Format a whole column with one precompiled format string"""
+
+    template = f"{{:.{decimals}f}} {unit}" if unit else f"{{:.{decimals}f}}"
+    render = template.format
+    return [missing if value is None or math.isnan(value) else render(value) for value in values]
+
+
+def column(models: Sequence[Any],  # ScaleData or PressData instances (None entries allowed)
+           quantity: str,          # "mass", "load" or "strength"
+           unit: str               # Unit wanted
+          ) -> List[Optional[float]]:
+    """Read one quantity out of models, converted to one unit"""
+
+    field, unit_field, _, _ = QUANTITIES[quantity]
+    values = [getattr(model, field) if model is not None else None for model in models]
+    units = [getattr(model, unit_field) if model is not None else None for model in models]
+    return convert(quantity, values, units, unit)
+
+
+def convert_models(ctx: Any,                       # Context object
+                   models: Sequence[Any],          # ScaleData or PressData instances (None entries skipped)
+                   quantity: str,                  # "mass", "load" or "strength"
+                   unit: Optional[str] = None,     # Target unit (None keeps units)
+                   decimals: Optional[int] = None  # New display decimals (None keeps them)
+                  ) -> None:
+    """Bulk equivalent of set_mass_format/set_load_format/set_strength_format (one log line for all models)"""
+
+    field, unit_field, decimals_field, conversions = QUANTITIES[quantity]
+    present = [model for model in models if model is not None]
+
+    if unit is not None:
+        if unit not in conversions:
+            raise ctx.errors.ValidationError(f"{quantity.capitalize()} unit must be one of: "
+                                             f"{', '.join(sorted(conversions))}")
+
+        converted = column(present, quantity, unit)
+        for model, value in zip(present, converted):
+            setattr(model, field, value)
+            setattr(model, unit_field, unit)
+
+    if decimals is not None:
+        for model in present:
+            setattr(model, decimals_field, decimals)
+
+    ctx.logger.info(f"Converted {len(present)} {quantity} value(s)"
+                    f"{f' to {unit}' if unit else ''}{f' ({decimals} decimals)' if decimals is not None else ''}")
+
+#%%
@@ -2,7 +2,7 @@
 
 #%% Dependencies:
 
-from typing import Any, Protocol, List
+from typing import Any, Protocol, List, Optional, Tuple
 from pathlib import Path
 
 #%% Output Strategy Protocol:
@@ -22,6 +22,22 @@ class OutputStrategy(Protocol):
         ...
 
 
+    def generate_receipts_concurrently(self, set_data: Any,       # Complete SetData instance
+                                       output_formats: List[str]  # Formats in the order requested
+                                      ) -> List[Tuple[str, Optional[Path], Optional[Exception]]]:
+        """Optional: generate several formats in parallel, returning (format, path, error) in request order"""
+        ...
+
+
+    def render_batch(self, batch: Any,                     # BatchData or list of SetData
+                     output_format: str = "PDF",           # "PDF" or "Excel"
+                     combine: bool = False,                # One combined document for the whole batch
+                     progress: Any = None                  # Optional callback receiving BatchProgress
+                    ) -> Any:                              # BatchResult
+        """Optional: render many sets at once (e.g., month-end reprints)"""
+        ...
+
+
     def cleanup(self) -> None:
         """Cleanup resources when application shuts down"""
         ...
@@ -38,6 +54,7 @@ class OutputInterface:
         self.ctx = ctx
         self.plugin_manager = plugin_manager
         self.strategies = {}
+        self.concurrent = ctx.config.get('output', {}).get('concurrent_generation', False)
 
         try:
             # Load available output strategies:
@@ -59,6 +76,12 @@ class OutputInterface:
             receipt_strategy.setup(self.ctx, self.ctx.config)
             self.strategies["receipt_generator"] = receipt_strategy
 
+            # Load printer strategy when printing is enabled:
+            if self.ctx.config.printing.enabled:
+                printer_strategy = self.plugin_manager.get_strategy("output", "printer")
+                printer_strategy.setup(self.ctx, self.ctx.config)
+                self.strategies["printer"] = printer_strategy
+
             self.ctx.logger.info("Output strategies loaded successfully")
 
         except Exception as e:
@@ -82,6 +105,28 @@ class OutputInterface:
             generated_files = []
             receipt_strategy = self.strategies["receipt_generator"]
 
+            # Concurrent mode: every format in flight at once, results gathered in request order:
+            if self.concurrent and len(output_formats) > 1 and \
+               hasattr(receipt_strategy, "generate_receipts_concurrently"):
+                self.ctx.logger.info(f"Generating {len(output_formats)} receipts concurrently...")
+                results = receipt_strategy.generate_receipts_concurrently(set_data, output_formats)
+
+                failures = []
+                for format_type, file_path, error in results:
+                    if error is not None:
+                        failures.append(f"{format_type}: {str(error)}")
+                    else:
+                        generated_files.append(file_path)
+                        self.ctx.logger.info(f"{format_type} receipt generated: {file_path.name}")
+
+                if failures:
+                    error_msg = f"Failed to generate receipts - {'; '.join(failures)}"
+                    self.ctx.logger.error(error_msg)
+                    raise self.ctx.errors.OutputError(error_msg)
+
+                self.ctx.logger.info(f"Successfully generated {len(generated_files)} receipt files")
+                return generated_files
+
             for format_type in output_formats:
                 self.ctx.logger.info(f"Generating {format_type} receipt...")
 
@@ -106,6 +151,45 @@ class OutputInterface:
             raise self.ctx.errors.OutputError(error_msg)
 
 
+    def print_receipts(self, set_data: Any,        # Complete SetData instance
+                       generated_files: List[Path] # Receipts from generate_receipts
+                      ) -> Optional[str]:          # Print job ID, None when nothing was queued
+        """Queue receipts for printing without waiting for the printer (printing problems never fail a set)"""
+
+        printer_strategy = self.strategies.get("printer")
+        if printer_strategy is None:
+            self.ctx.logger.info("Printing is disabled (printing.enabled) - receipts not printed", target="user")
+            return None
+
+        try:
+            return printer_strategy.print_receipts(set_data, generated_files)
+
+        except Exception as e:
+            self.ctx.logger.warning(f"Could not queue receipts for printing: {str(e)}", target="both")
+            return None
+
+
+    def render_batch(self, batch: Any,                     # BatchData, list of SetData or sets_from_registry() output
+                     output_format: str = "PDF",           # "PDF" or "Excel"
+                     combine: bool = False,                # One combined document for the whole batch
+                     progress: Any = None                  # Optional callback receiving BatchProgress
+                    ) -> Any:                              # BatchResult
+        """Render receipts for a whole batch through the receipt generator"""
+
+        receipt_strategy = self.strategies.get("receipt_generator")
+        if receipt_strategy is None or not hasattr(receipt_strategy, "render_batch"):
+            error_msg = "Receipt generator does not support batch rendering"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.OutputError(error_msg)
+
+        result = receipt_strategy.render_batch(batch, output_format, combine, progress)
+
+        if result.failures:
+            self.ctx.logger.warning(f"{len(result.failures)} receipts failed in batch: "
+                                    f"{', '.join(set_id for set_id, _ in result.failures)}", target="both")
+        return result
+
+
     def cleanup(self) -> None:
         """Clean shutdown of output interface and strategies"""
 
@@ -0,0 +1,442 @@
+"""Printer plugin - persistent print spool with batched, retried submission to CUPS (lp) or a local stand-in"""
+
+#%% Dependencies:
+
+import os
+import re
+import json
+import time
+import shutil
+import threading
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Any, List, Optional, Set
+
+#%% Constants:
+
+DEFAULT_BATCH_WINDOW = 2.0       # Seconds a new job waits for more receipts to join its batch
+DEFAULT_BATCH_SIZE = 10          # Files per lp request
+DEFAULT_RETRY_INTERVAL = 5.0     # First retry delay (seconds), doubled after each failure
+MAX_RETRY_INTERVAL = 300.0       # Retry delay cap
+DEFAULT_MAX_ATTEMPTS = 20        # Failed submissions before a job is moved to <spool_dir>/failed
+LP_TIMEOUT = 30                  # Seconds lp/lpstat may take before the attempt counts as failed
+
+REQUEST_ID_PATTERN = re.compile(r"request id is (\S+)")           # "request id is Office-42 (2 file(s))"
+DEFAULT_DESTINATION_PATTERN = re.compile(r"destination:\s*(\S+)")  # "system default destination: Office"
+
+#%% Print Jobs:
+
+@dataclass
+class PrintJob:
+    """One print request as stored in the spool (<spool_dir>/<job_id>.json)"""
+
+    job_id: str
+    files: List[str]
+    title: str
+    copies: int = 1
+    created: float = 0.0  # time.time() at submission
+    attempts: int = 0     # Failed submissions so far (offline waits do not count)
+
+
+def spooled_files(spool_dir: Path  # printing.spool_dir
+                 ) -> Set[Path]:   # Resolved paths of files in pending and failed jobs
+    """Files the spool still needs, read from the job files (e.g., by the receipt cache)"""
+
+    spool_dir = Path(spool_dir)
+    files = set()
+    for path in [*spool_dir.glob("*.json"), *(spool_dir / "failed").glob("*.json")]:
+        try:
+            files.update(Path(file).resolve() for file in json.loads(path.read_text(encoding="utf-8"))["files"])
+        except FileNotFoundError:
+            continue  # Printed and removed meanwhile
+    return files
+
+#%% Backends:
+
+class CupsBackend:
+    """Submits through the CUPS command line tools (lp, lpstat)"""
+
+    def __init__(self, ctx: Any, printer: Optional[str] = None):  # None = system default destination
+
+        self.ctx = ctx
+        self.printer = printer
+
+
+    def is_available(self) -> bool:
+        """CUPS client tools installed"""
+
+        return shutil.which("lp") is not None and shutil.which("lpstat") is not None
+
+
+    def is_online(self) -> bool:
+        """Destination exists and is accepting jobs (not disabled/paused)"""
+
+        if not self.is_available():
+            return False
+
+        printer = self.printer
+        if printer is None:
+            default = self._run(["lpstat", "-d"])
+            match = DEFAULT_DESTINATION_PATTERN.search(default.stdout) if default.returncode == 0 else None
+            if match is None:
+                return False
+            printer = match.group(1)
+
+        status = self._run(["lpstat", "-p", printer])
+        return status.returncode == 0 and "disabled" not in status.stdout
+
+
+    def submit(self, files: List[Path], title: str, copies: int) -> str:  # CUPS request ID
+        """Send files as one lp request"""
+
+        command = ["lp"] + (["-d", self.printer] if self.printer else []) + ["-n", str(copies), "-t", title, "--"]
+        result = self._run(command + [str(path) for path in files])
+
+        if result.returncode != 0:
+            raise self.ctx.errors.OutputError(f"lp failed ({result.returncode}): {result.stderr.strip()}")
+
+        match = REQUEST_ID_PATTERN.search(result.stdout)
+        return match.group(1) if match else result.stdout.strip()
+
+
+    def _run(self, command: List[str]) -> subprocess.CompletedProcess:
+        """Run a CUPS tool with a timeout"""
+
+        return subprocess.run(command, capture_output=True, text=True, timeout=LP_TIMEOUT)
+
+
+class FakeCupsBackend:
+    """Local stand-in for lp/lpstat: "prints" by copying files to <output_dir>/<request id>/ (development and tests)"""
+
+    def __init__(self, ctx: Any, output_dir: Path):
+
+        self.ctx = ctx
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.online = True   # Tests may switch the fake printer off
+        self.requests = 0
+
+
+    def is_available(self) -> bool:
+        """Always installed"""
+
+        return True
+
+
+    def is_online(self) -> bool:
+        """Offline when switched off or while an OFFLINE file exists in output_dir"""
+
+        return self.online and not (self.output_dir / "OFFLINE").exists()
+
+
+    def submit(self, files: List[Path], title: str, copies: int) -> str:  # Fake request ID
+        """Copy the files and a manifest into a per-request directory"""
+
+        self.requests += 1
+        request_id = f"fake-{time.time_ns()}-{self.requests}"
+        request_dir = self.output_dir / request_id
+        request_dir.mkdir()
+
+        for index, path in enumerate(files, 1):
+            shutil.copyfile(path, request_dir / f"{index:02d}_{path.name}")
+
+        manifest = {"title": title, "copies": copies, "files": [path.name for path in files]}
+        (request_dir / "request.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return request_id
+
+#%% Print Spooler:
+
+class PrintSpooler:
+    """Persistent job queue drained by a background thread: submitting a job is a small file write, never a print"""
+
+    def __init__(self, ctx: Any,                                      # Context object
+                 spool_dir: Path,                                     # Pending jobs survive restarts here
+                 backend: Any,                                        # CupsBackend or FakeCupsBackend
+                 batch_window: float = DEFAULT_BATCH_WINDOW,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 retry_interval: float = DEFAULT_RETRY_INTERVAL,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """Initialize spool directory (call start() to load pending jobs and print)"""
+
+        self.ctx = ctx
+        self.spool_dir = Path(spool_dir)
+        self.failed_dir = self.spool_dir / "failed"
+        self.backend = backend
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.max_attempts = max_attempts
+
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._jobs: List[PrintJob] = []
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._offline_reported = False
+        self._sequence = 0
+        self._thread: Optional[threading.Thread] = None
+
+
+    @property
+    def pending(self) -> int:
+        """Jobs waiting to be printed"""
+
+        with self._condition:
+            return len(self._jobs)
+
+
+    def start(self) -> None:
+        """Resume jobs left in the spool and start the spooler thread"""
+
+        for path in sorted(self.spool_dir.glob("*.json")):
+            try:
+                self._jobs.append(PrintJob(**json.loads(path.read_text(encoding="utf-8"))))
+            except Exception as e:
+                self.ctx.logger.warning(f"Ignoring unreadable print job {path.name}: {str(e)}")
+
+        if self._jobs:
+            self.ctx.logger.info(f"{len(self._jobs)} print job(s) resumed from the spool", target="user")
+
+        self._thread = threading.Thread(target=self._run, name="print-spooler", daemon=True)
+        self._thread.start()
+
+
+    def submit(self, files: List[Path], title: str, copies: int = 1) -> str:  # Job ID
+        """Persist a job and wake the spooler"""
+
+        with self._condition:
+            self._sequence += 1
+            job = PrintJob(job_id=f"{time.time_ns()}-{self._sequence:04d}", files=[str(path) for path in files],
+                           title=title, copies=copies, created=time.time())
+            self._persist(job)
+            self._jobs.append(job)
+            self._condition.notify()
+
+        return job.job_id
+
+
+    def stop(self) -> None:
+        """Stop the spooler thread; unprinted jobs stay in the spool for the next start"""
+
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._jobs:
+            self.ctx.logger.info(f"{len(self._jobs)} print job(s) kept in the spool for the next start")
+
+
+    def _run(self) -> None:
+        """Spooler loop: wait for jobs, let a batch fill, print, back off on failure"""
+
+        delay = self.retry_interval
+
+        while True:
+            with self._condition:
+                while not self._jobs and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+
+                # Receipts arriving shortly after this one go out in the same request:
+                remaining = self._jobs[0].created + self.batch_window - time.time()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+                batch = self._next_batch()
+
+            try:
+                printed = self._print_batch(batch)
+            except Exception as e:  # Never let a spool write or backend error end the thread
+                self.ctx.logger.error(f"Print spooler error: {str(e)}")
+                printed = False
+
+            if printed:
+                delay = self.retry_interval
+                continue
+
+            # Printer offline or submission failed - retry later (stop() still wakes us):
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopping, timeout=delay)
+            delay = min(delay * 2, MAX_RETRY_INTERVAL)
+
+
+    def _next_batch(self) -> List[PrintJob]:
+        """Oldest jobs with the same copy count, up to batch_size files (at least one job)"""
+
+        batch, file_count = [], 0
+        for job in self._jobs:
+            if job.copies != self._jobs[0].copies or (batch and file_count + len(job.files) > self.batch_size):
+                break
+            batch.append(job)
+            file_count += len(job.files)
+        return batch
+
+
+    def _print_batch(self, batch: List[PrintJob]) -> bool:  # True when the batch left the spool
+        """Check the printer and submit one batch as a single request"""
+
+        title = batch[0].title if len(batch) == 1 else f"{len(batch)} sets: " + ", ".join(job.title for job in batch)
+
+        # lpstat and lp may hang or fail to start - either way the attempt fails and is retried:
+        try:
+            if not self.backend.is_online():
+                if not self._offline_reported:
+                    self.ctx.logger.warning(f"Printer offline - {self.pending} print job(s) held, retrying",
+                                            target="both")
+                    self._offline_reported = True
+                return False
+
+            files = self._printable_files(batch)
+            request_id = self.backend.submit(files, title, batch[0].copies) if files else None
+
+        except Exception as e:
+            self.ctx.logger.warning(f"Print submission failed for {title}: {str(e)}")
+            self._record_failure(batch, e)
+            return False
+
+        self._offline_reported = False
+        self._finish(batch)
+        if request_id is not None:
+            self.ctx.logger.info(f"Sent to printer: {title} ({len(files)} file(s), request {request_id})", target="user")
+        return True
+
+
+    def _printable_files(self, batch: List[PrintJob]) -> List[Path]:
+        """Files of the batch that still exist (receipts evicted from the cache since queuing cannot be printed)"""
+
+        files = []
+        for job in batch:
+            for file_name in job.files:
+                if Path(file_name).exists():
+                    files.append(Path(file_name))
+                else:
+                    self.ctx.logger.warning(f"{job.title}: {Path(file_name).name} no longer exists - not printed",
+                                            target="both")
+        return files
+
+
+    def _record_failure(self, batch: List[PrintJob], error: Exception) -> None:
+        """Count the failed attempt; jobs out of attempts move to failed/"""
+
+        given_up = []
+        with self._condition:
+            for job in batch:
+                job.attempts += 1
+                if job.attempts < self.max_attempts:
+                    self._persist(job)
+                    continue
+
+                given_up.append(job)
+                self._jobs.remove(job)
+                self.failed_dir.mkdir(exist_ok=True)
+                os.replace(self._job_path(job), self.failed_dir / self._job_path(job).name)
+
+        if given_up:
+            self.ctx.logger.error(f"Printing abandoned after {self.max_attempts} attempts: "
+                                  f"{', '.join(job.title for job in given_up)} ({str(error)})", target="both")
+
+
+    def _finish(self, batch: List[PrintJob]) -> None:
+        """Remove printed jobs from the queue and the spool"""
+
+        with self._condition:
+            for job in batch:
+                self._jobs.remove(job)
+                self._job_path(job).unlink(missing_ok=True)
+
+
+    def _persist(self, job: PrintJob) -> None:
+        """Atomically (re)write a job file"""
+
+        path = self._job_path(job)
+        partial_path = path.with_suffix(".partial")
+        partial_path.write_text(json.dumps(asdict(job), indent=2), encoding="utf-8")
+        os.replace(partial_path, path)
+
+
+    def _job_path(self, job: PrintJob) -> Path:
+        """Spool file for a job"""
+
+        return self.spool_dir / f"{job.job_id}.json"
+
+#%% Printer Plugin:
+
+class PrinterPlugin:
+    """Output strategy for receipt printing; print_receipts() only queues, the spooler thread prints"""
+
+    def __init__(self):
+        """Initialize printer plugin (configured in setup)"""
+
+        self.ctx = None
+        self.config = None
+        self.copies = 1
+        self.spooler = None
+
+
+    def setup(self, ctx: Any, config: Any) -> None:
+        """Create the backend and start the spooler (resuming jobs left from a previous run)"""
+
+        self.ctx = ctx
+        self.config = config
+
+        try:
+            self.ctx.logger.info("Setting up printer plugin...")
+
+            printing_config = config.printing
+            self.copies = printing_config.copies
+
+            if printing_config.backend == "fake":
+                backend = FakeCupsBackend(ctx, printing_config.fake_output_dir)
+            else:
+                backend = CupsBackend(ctx, printing_config.printer)
+                if not backend.is_available():
+                    self.ctx.logger.warning("CUPS tools (lp, lpstat) not found - print jobs will stay in the spool")
+
+            self.spooler = PrintSpooler(ctx, printing_config.spool_dir, backend,
+                                        batch_window=printing_config.batch_window,
+                                        batch_size=printing_config.batch_size,
+                                        retry_interval=printing_config.retry_interval,
+                                        max_attempts=printing_config.max_attempts)
+            self.spooler.start()
+
+            self.ctx.logger.info(f"Printer plugin ready ({printing_config.backend} backend, "
+                                 f"printer: {printing_config.printer or 'system default'})")
+
+        except Exception as e:
+            error_msg = f"Failed to setup printer plugin: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.ConfigurationError(error_msg)
+
+
+    def print_receipts(self, set_data: Any,       # Complete SetData instance
+                       files: List[Path]          # Receipts generated for the set
+                      ) -> Optional[str]:         # Spool job ID (None when there is nothing printable)
+        """Queue a set's PDF receipts for printing (returns immediately)"""
+
+        set_id = set_data.input_data.set_id
+        printable = [Path(path) for path in files if Path(path).suffix.lower() == ".pdf"]
+
+        if not printable:
+            self.ctx.logger.warning(f"Set {set_id}: no PDF receipt to print", target="user")
+            return None
+
+        job_id = self.spooler.submit(printable, f"Set {set_id}", self.copies)
+        self.ctx.logger.info(f"Set {set_id}: queued for printing ({self.spooler.pending} job(s) in spool)",
+                             target="user")
+        return job_id
+
+
+    def cleanup(self) -> None:
+        """Stop the spooler (pending jobs are printed on the next start)"""
+
+        if self.spooler is not None:
+            self.spooler.stop()
+            self.spooler = None
+
+#%%
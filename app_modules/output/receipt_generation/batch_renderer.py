@@ -0,0 +1,402 @@
+"""Batch receipt renderer - renders whole BatchData sessions (or registry queries) across worker processes"""
+
+#%% Dependencies:
+
+import os
+import time
+import hashlib
+import importlib
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app_modules.output.receipt_generation.receipt_cache import content_hash
+from app_modules.output.receipt_generation.receipt_generation_bridge import (PDF_MODULES, EXCEL_CLASSES,
+                                                                             render_pdf_receipt)
+
+#%% Constants:
+
+PDF_PAGES_PER_TASK = 20           # Receipts per worker task when building a combined PDF
+EXCEL_SHEETS_PER_WORKBOOK = 600   # Each receipt sheet adds ~90 cell styles; XLSX allows 64000 per workbook
+PROGRESS_LOG_STEP = 0.1           # Log progress every 10%
+
+#%% Results:
+
+@dataclass(frozen=True)
+class BatchProgress:
+    """Snapshot passed to progress callbacks"""
+
+    completed: int   # Receipts finished (rendered, cached or failed)
+    total: int       # Receipts in the batch
+    elapsed: float   # Seconds since the batch started
+
+    @property
+    def rate(self) -> float:
+        """Receipts per second so far"""
+
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch run"""
+
+    output_format: str                                          # "PDF" or "Excel"
+    files: List[Path] = field(default_factory=list)             # Receipts in batch order, or combined documents
+    rendered: int = 0                                           # Receipts rendered by this run
+    cached: int = 0                                             # Receipts reused from the receipt cache
+    failures: List[Tuple[str, str]] = field(default_factory=list)  # (set_id, error)
+    elapsed: float = 0.0                                        # Wall time (seconds)
+
+    @property
+    def receipts_per_second(self) -> float:
+        """Throughput over rendered and reused receipts"""
+
+        return (self.rendered + self.cached) / self.elapsed if self.elapsed > 0 else 0.0
+
+#%% Worker Functions:
+
+def render_pdf_pages(page_tasks: List[Tuple[Dict, str]],  # (receipt_data, protocol_key) per page
+                     target_path: str                      # Part file to write
+                    ) -> Tuple[str, List[Tuple[int, str]]]:  # (path, [(page index, error)])
+    """Render several receipts as consecutive pages of one PDF - runs inside a worker process"""
+
+    from app_modules.output.receipt_generation.pdf_generation.pdf_engine import build_document
+
+    tables, errors = [], []
+    for index, (receipt_data, protocol_key) in enumerate(page_tasks):
+        try:
+            module = importlib.import_module(PDF_MODULES[protocol_key])
+            tables.append(module.build_receipt_table(receipt_data, module.process_test_data(receipt_data)))
+        except Exception as e:
+            errors.append((index, str(e)))
+
+    if not tables:
+        return "", errors
+
+    build_document(target_path, tables)
+    return target_path, errors
+
+#%% Helper Functions:
+
+def sets_from_registry(ctx: Any,                 # Context object
+                       registry: Any,            # RegistryManager
+                       data_models: Sequence,    # (InputData, ScaleData, PressData, SpecimenData, SetData)
+                       **query: Any              # RegistryManager.query() filters
+                      ) -> List[Any]:            # SetData instances, oldest first
+    """Rebuild SetData from registry entries so they can be re-rendered"""
+
+    # query() returns newest first:
+    sets = [set_from_registry_row(registry, row, data_models) for row in reversed(registry.query(**query))]
+
+    ctx.logger.info(f"Loaded {len(sets)} sets from the registry for batch rendering")
+    return sets
+
+
+def set_from_registry_row(registry: Any,          # RegistryManager
+                          row: Dict[str, Any],    # One RegistryManager.query() row
+                          data_models: Sequence   # (InputData, ScaleData, PressData, SpecimenData, SetData)
+                         ) -> Any:                # SetData
+    """Rebuild one registry entry with its specimens"""
+
+    InputData, ScaleData, PressData, SpecimenData, SetData = data_models
+    set_data = SetData(input_data=InputData(**row["input_data"]))
+
+    for specimen in registry.get_specimens(row["id"]):
+        scale_data = ScaleData(mass=specimen["mass"], mass_unit=specimen["mass_unit"]) \
+                     if specimen["mass"] is not None else None
+        press_data = PressData(load=specimen["load"], load_unit=specimen["load_unit"],
+                               strength=specimen["strength"], strength_unit=specimen["strength_unit"]) \
+                     if specimen["load"] is not None else None
+        set_data.specimens.append(SpecimenData(scale_data=scale_data, press_data=press_data))
+
+    return set_data
+
+
+def _sheet_name(position: int, set_id: str) -> str:
+    """Unique Excel sheet name (max 31 characters, no []:*?/\\)"""
+
+    cleaned = "".join("-" if character in '[]:*?/\\' else character for character in set_id)
+    return f"{position:03d} {cleaned}"[:31]
+
+#%% Batch Renderer:
+
+class BatchReceiptRenderer:
+    """Renders many sets at once, grouped by protocol, with progress and throughput reporting"""
+
+    def __init__(self, ctx: Any,                      # Context object
+                 bridge: Any,                         # ReceiptGenerationBridge (conversion, cache, JVM)
+                 workers: Optional[int] = None):      # Worker processes/threads (default: CPU count)
+        """Initialize renderer on top of a set-up receipt bridge"""
+
+        self.ctx = ctx
+        self.bridge = bridge
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_dir = bridge.config.data_storage.receipts_dir / "batch_receipts"
+
+
+    def render(self, batch: Any,                                             # BatchData or list of SetData
+               output_format: str = "PDF",                                   # "PDF" or "Excel"
+               combine: bool = False,                                        # One document for the whole batch
+               progress: Optional[Callable[[BatchProgress], None]] = None    # Called after each completed unit
+              ) -> BatchResult:
+        """Render every set of a batch"""
+
+        sets = list(getattr(batch, "sets", batch))
+        if output_format not in ("PDF", "Excel"):
+            raise self.ctx.errors.OutputError(f"Unsupported output format: {output_format}")
+
+        # Group by protocol (stable inside each group) so workers reuse the same layout:
+        protocol_keys = [self.bridge.protocol_mapping.get(set_data.input_data.protocol, 'cube_compression')
+                         for set_data in sets]
+        order = sorted(range(len(sets)), key=lambda index: protocol_keys[index])
+        grouped = [(sets[index], protocol_keys[index]) for index in order]
+        self._order = order
+
+        result = BatchResult(output_format=output_format)
+        self._started = time.perf_counter()
+        self._progress = progress
+        self._next_log = PROGRESS_LOG_STEP
+
+        self.ctx.logger.info(f"Batch rendering {len(sets)} {output_format} receipts "
+                             f"({'combined' if combine else 'individual'}, {self.workers} workers)")
+
+        try:
+            if not sets:
+                return result
+            if output_format == "PDF" and combine:
+                self._render_combined_pdf(grouped, result)
+            elif output_format == "PDF":
+                self._render_individual(grouped, result, self._submit_pdf, self._pdf_pool())
+            elif combine:
+                self._render_combined_workbook(grouped, result)
+            else:
+                self._render_individual(grouped, result, self._submit_excel, self._excel_pool())
+
+            return result
+
+        except Exception as e:
+            error_msg = f"Batch {output_format} rendering failed: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.OutputError(error_msg)
+
+        finally:
+            result.elapsed = time.perf_counter() - self._started
+            self.ctx.logger.info(f"Batch finished: {result.rendered} rendered, {result.cached} cached, "
+                                 f"{len(result.failures)} failed in {result.elapsed:.1f} s "
+                                 f"({result.receipts_per_second:.1f} receipts/s)", target="both")
+
+
+    def _render_individual(self, grouped: List[Tuple[Any, str]], result: BatchResult,
+                           submit: Callable, pool: Any) -> None:
+        """One receipt file per set (cache hits are skipped)"""
+
+        total = len(grouped)
+        files: Dict[int, Path] = {}
+        futures = {}
+
+        with pool:
+            for position, (set_data, protocol_key) in enumerate(grouped):
+                target_path = self.bridge.cache.path_for(set_data, result.output_format)
+                cached_path = self.bridge.cache.lookup(target_path)
+                if cached_path is not None:
+                    files[position] = cached_path
+                    result.cached += 1
+                    continue
+
+                receipt_data = self.bridge._convert_to_receipt_format(set_data)
+                futures[submit(pool, receipt_data, set_data, protocol_key, target_path)] = (position, set_data)
+
+            self._report(len(files), total)
+
+            for future in as_completed(futures):
+                position, set_data = futures[future]
+                try:
+                    files[position] = Path(future.result())
+                    result.rendered += 1
+                except Exception as e:
+                    result.failures.append((set_data.input_data.set_id, str(e)))
+                self._report(len(files) + len(result.failures), total)
+
+        # Back to the caller's batch order:
+        result.files = [files[position] for position in sorted(files, key=lambda position: self._order[position])]
+        self.bridge.cache.evict()
+
+
+    def _submit_pdf(self, pool: Any, receipt_data: Dict, set_data: Any, protocol_key: str, target_path: Path) -> Any:
+        return pool.submit(render_pdf_receipt, receipt_data, protocol_key, target_path)
+
+
+    def _submit_excel(self, pool: Any, receipt_data: Dict, set_data: Any, protocol_key: str, target_path: Path) -> Any:
+        return pool.submit(self.bridge._generate_excel_receipt, receipt_data, set_data.input_data.protocol, target_path)
+
+
+    def _render_combined_pdf(self, grouped: List[Tuple[Any, str]], result: BatchResult) -> None:
+        """One multi-page PDF: page chunks render in parallel, then the parts are concatenated in order"""
+
+        from pypdf import PdfWriter
+
+        target_path = self._combined_path(grouped, ".pdf")
+        if self.bridge.cache.lookup(target_path) is not None:
+            result.files, result.cached = [target_path], len(grouped)
+            return
+
+        total = len(grouped)
+        chunks = [grouped[start:start + PDF_PAGES_PER_TASK] for start in range(0, total, PDF_PAGES_PER_TASK)]
+        part_paths = [target_path.with_name(f".{target_path.stem}.part{index:04d}.pdf") for index in range(len(chunks))]
+        parts: Dict[int, str] = {}
+        completed = 0
+
+        try:
+            with self._pdf_pool() as pool:
+                futures = {}
+                for index, chunk in enumerate(chunks):
+                    page_tasks = [(self.bridge._convert_to_receipt_format(set_data), protocol_key)
+                                  for set_data, protocol_key in chunk]
+                    futures[pool.submit(render_pdf_pages, page_tasks, str(part_paths[index]))] = index
+
+                for future in as_completed(futures):
+                    index = futures[future]
+                    part_path, errors = future.result()
+                    if part_path:
+                        parts[index] = part_path
+                    for page_index, error in errors:
+                        result.failures.append((chunks[index][page_index][0].input_data.set_id, error))
+                    result.rendered += len(chunks[index]) - len(errors)
+                    completed += len(chunks[index])
+                    self._report(completed, total)
+
+            # Concatenate in batch order and move into place:
+            writer = PdfWriter()
+            for index in sorted(parts):
+                writer.append(parts[index])
+            partial_path = target_path.with_name(f".{target_path.name}.partial")
+            with open(partial_path, "wb") as f:
+                writer.write(f)
+            os.replace(partial_path, target_path)
+            result.files = [target_path]
+
+        finally:
+            for part_path in part_paths:
+                part_path.unlink(missing_ok=True)
+
+
+    def _render_combined_workbook(self, grouped: List[Tuple[Any, str]], result: BatchResult) -> None:
+        """One multi-sheet workbook (split into parts above the XLSX style limit), built on JVM threads"""
+
+        total = len(grouped)
+        chunks = [grouped[start:start + EXCEL_SHEETS_PER_WORKBOOK]
+                  for start in range(0, total, EXCEL_SHEETS_PER_WORKBOOK)]
+        base_path = self._combined_path(grouped, ".xlsx")
+        targets = [base_path if len(chunks) == 1 else base_path.with_name(f"{base_path.stem}_part{index + 1}.xlsx")
+                   for index in range(len(chunks))]
+
+        if all(self.bridge.cache.lookup(target) is not None for target in targets):
+            result.files, result.cached = targets, total
+            return
+
+        if not self.bridge.jvm_started:
+            self.bridge._start_jvm()
+
+        # Generators compiled before the in-memory API cannot add sheets to a shared workbook:
+        outdated = sorted({EXCEL_CLASSES[protocol_key] for _, protocol_key in grouped
+                           if not self.bridge.excel_supports(EXCEL_CLASSES[protocol_key], "addSheet")})
+        if outdated:
+            raise self.ctx.errors.OutputError(f"Combined Excel workbooks need addSheet, missing from {outdated} - "
+                                              f"recompile the .java sources in excel_generation/ or render "
+                                              f"individual workbooks (combine=False)")
+
+        # Each workbook is confined to one thread; separate workbooks build in parallel:
+        with self._excel_pool() as pool:
+            futures = {pool.submit(self._build_workbook, chunk, index * EXCEL_SHEETS_PER_WORKBOOK, target): index
+                       for index, (chunk, target) in enumerate(zip(chunks, targets))}
+            completed = 0
+            for future in as_completed(futures):
+                index = futures[future]
+                failures = future.result()
+                result.failures.extend(failures)
+                result.rendered += len(chunks[index]) - len(failures)
+                completed += len(chunks[index])
+                self._report(completed, total)
+
+        result.files = targets
+
+
+    def _build_workbook(self, chunk: List[Tuple[Any, str]], first_position: int, target_path: Path) -> List[Tuple[str, str]]:
+        """Fill one workbook with a sheet per set and write it atomically (runs on a JVM-attached thread)"""
+
+        import jpype
+
+        XSSFWorkbook = self.bridge.excel_class("org.apache.poi.xssf.usermodel.XSSFWorkbook")
+        FileOutputStream = jpype.JClass("java.io.FileOutputStream")
+        failures = []
+
+        workbook = XSSFWorkbook()
+        try:
+            for position, (set_data, protocol_key) in enumerate(chunk, first_position + 1):
+                try:
+                    receipt_data = self.bridge._convert_to_receipt_format(set_data)
+                    masses, loads = self.bridge._excel_measurements(receipt_data, protocol_key)
+                    self.bridge.excel_class(EXCEL_CLASSES[protocol_key]).addSheet(
+                        workbook,
+                        _sheet_name(position, receipt_data["set_id"]),
+                        receipt_data["set_id"],
+                        str(receipt_data["sampling_date"]),
+                        str(receipt_data["testing_date"]),
+                        jpype.JArray(jpype.JDouble)(masses),
+                        jpype.JArray(jpype.JDouble)(loads))
+                except Exception as e:
+                    failures.append((set_data.input_data.set_id, str(e)))
+
+            partial_path = target_path.with_name(f".{target_path.name}.partial")
+            output = FileOutputStream(str(partial_path))
+            try:
+                workbook.write(output)
+            finally:
+                output.close()
+            os.replace(partial_path, target_path)
+
+        finally:
+            workbook.close()
+
+        return failures
+
+
+    def _combined_path(self, grouped: List[Tuple[Any, str]], extension: str) -> Path:
+        """Combined documents are content-addressed too: same sets -> same file"""
+
+        digest = hashlib.sha256("".join(content_hash(set_data) for set_data, _ in grouped).encode()).hexdigest()[:12]
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        return self.batch_dir / f"batch_{datetime.now():%Y%m%d}_{len(grouped)}sets_{digest}{extension}"
+
+
+    def _pdf_pool(self) -> ProcessPoolExecutor:
+        """Batch-sized ReportLab pool (spawned - the parent may host a running JVM)"""
+
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+    def _excel_pool(self) -> ThreadPoolExecutor:
+        """JPype releases the GIL inside Java calls, so POI work on separate workbooks runs in parallel"""
+
+        if not self.bridge.jvm_started:
+            self.bridge._start_jvm()
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jvm-batch")
+
+
+    def _report(self, completed: int, total: int) -> None:
+        """Invoke the progress callback and log at every PROGRESS_LOG_STEP"""
+
+        snapshot = BatchProgress(completed=completed, total=total, elapsed=time.perf_counter() - self._started)
+        if self._progress is not None:
+            self._progress(snapshot)
+
+        if total and completed / total >= self._next_log:
+            self.ctx.logger.info(f"Batch progress: {completed}/{total} ({snapshot.rate:.1f} receipts/s)", target="both")
+            while completed / total >= self._next_log:
+                self._next_log += PROGRESS_LOG_STEP
+
+#%%
@@ -7,11 +7,107 @@ import java.nio.file.*;
 import java.util.*;
 
 public class BeamCompression {
+    private static final int SPECIMENS = 6;
+
+    /**
+     * Workbook as .xlsx bytes. Every call builds its own workbook, so concurrent calls are safe.
+     * Missing measurements are passed as NaN and left blank.
+     */
+    public static byte[] generateBytes(String setId, String samplingDate, String testingDate,
+                                       double[] massKg, double[] loadN) throws IOException {
+        XSSFWorkbook workbook = buildWorkbook(setId, samplingDate, testingDate, massKg, loadN);
+        try (workbook) {
+            ByteArrayOutputStream out = new ByteArrayOutputStream();
+            workbook.write(out);
+            return out.toByteArray();
+        }
+    }
+
+    /**
+     * Write the workbook to a caller-chosen path (written to a sibling temp file, then moved into place).
+     */
+    public static String generateFile(String setId, String samplingDate, String testingDate,
+                                      double[] massKg, double[] loadN, String outputPath) throws IOException {
+        Path outputFile = Paths.get(outputPath).toAbsolutePath();
+        Files.createDirectories(outputFile.getParent());
+
+        XSSFWorkbook workbook = buildWorkbook(setId, samplingDate, testingDate, massKg, loadN);
+        try (workbook) {
+            Path tempFile = Files.createTempFile(outputFile.getParent(), ".receipt-", ".xlsx.tmp");
+            try {
+                OutputStream out = Files.newOutputStream(tempFile);
+                try (out) {
+                    workbook.write(out);
+                }
+                Files.move(tempFile, outputFile, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+            } finally {
+                Files.deleteIfExists(tempFile);  // Only left behind when writing or moving failed
+            }
+        }
+        return outputFile.toString();
+    }
+
+    /**
+     * Command-line entry point kept for manual use: reads press_data.csv from the working directory.
+     */
     public static void main(String[] args) throws Exception {
-        File csvFile = new File("press_data.csv");
+        BufferedReader reader = new BufferedReader(new FileReader("press_data.csv"));
+        try (reader) {
+            String indicativSerie = reader.readLine().split(",")[1];
+            String dataConfectionarii = reader.readLine().split(",")[1];
+            String dataIncercarii = reader.readLine().split(",")[1];
+            double[] greutateData = parseCsvRow(reader.readLine());
+            double[] kNData = parseCsvRow(reader.readLine());
+
+            Path outputFile = Paths.get(System.getProperty("user.dir"))
+                .resolve("data").resolve("receipts").resolve("excel_receipts").resolve("beam_compression_receipt.xlsx");
+            String written = generateFile(indicativSerie, dataConfectionarii, dataIncercarii,
+                                          greutateData, kNData, outputFile.toString());
+            System.out.println("Excel receipt created at: " + written);
+        }
+    }
 
+    // CSV row "label,v1,v2,..." -> values, empty or invalid cells become NaN
+    private static double[] parseCsvRow(String line) {
+        String[] tokens = line.split(",");
+        double[] values = new double[SPECIMENS];
+        for (int i = 0; i < SPECIMENS; i++) {
+            values[i] = Double.NaN;
+            if (i + 1 < tokens.length && !tokens[i + 1].trim().isEmpty()) {
+                try {
+                    values[i] = Double.parseDouble(tokens[i + 1].trim());
+                } catch (NumberFormatException e) {
+                    values[i] = Double.NaN;
+                }
+            }
+        }
+        return values;
+    }
+
+    // Copy into a SPECIMENS-long array, padding with NaN (null or short input allowed)
+    private static double[] padded(double[] values) {
+        double[] result = new double[SPECIMENS];
+        Arrays.fill(result, Double.NaN);
+        if (values != null) {
+            System.arraycopy(values, 0, result, 0, Math.min(values.length, SPECIMENS));
+        }
+        return result;
+    }
+
+    private static XSSFWorkbook buildWorkbook(String indicativSerie, String dataConfectionarii, String dataIncercarii,
+                                              double[] massKg, double[] loadN) {
         XSSFWorkbook workbook = new XSSFWorkbook();
-        XSSFSheet sheet = workbook.createSheet("Concrete Test");
+        addSheet(workbook, "Concrete Test", indicativSerie, dataConfectionarii, dataIncercarii, massKg, loadN);
+        return workbook;
+    }
+
+    /**
+     * Append this receipt as a new sheet of an existing workbook (batch workbooks).
+     * A workbook must only be used from one thread at a time.
+     */
+    public static void addSheet(XSSFWorkbook workbook, String sheetName, String indicativSerie, String dataConfectionarii,
+                                String dataIncercarii, double[] massKg, double[] loadN) {
+        XSSFSheet sheet = workbook.createSheet(sheetName);
         DataFormat format = workbook.createDataFormat();
 
         // Fonts and styles
@@ -60,47 +156,7 @@ public class BeamCompression {
         threeDecimalStyle.setWrapText(true);
         threeDecimalStyle.setDataFormat(format.getFormat("0.000"));
 
-        // Read data from CSV file
-        BufferedReader reader = new BufferedReader(new FileReader(csvFile));
-        String indicativSerie = reader.readLine().split(",")[1];
-        String dataConfectionarii = reader.readLine().split(",")[1];
-        String dataIncercarii = reader.readLine().split(",")[1];
-
-        List<double[]> dataRows = new ArrayList<>();
-
-        // Greutate row - handle empty cells (skip for beam compression)
-        String[] greutateTokens = reader.readLine().split(",");
-        double[] greutateData = new double[6];
-        for (int i = 0; i < 6; i++) {
-            if (i + 1 < greutateTokens.length && !greutateTokens[i + 1].trim().isEmpty()) {
-                try {
-                    greutateData[i] = Double.parseDouble(greutateTokens[i + 1].trim());
-                } catch (NumberFormatException e) {
-                    greutateData[i] = Double.NaN;
-                }
-            } else {
-                greutateData[i] = Double.NaN;
-            }
-        }
-        dataRows.add(greutateData);
-
-        // kN row - handle empty cells
-        String[] kNTokens = reader.readLine().split(",");
-        double[] kNData = new double[6];
-        for (int i = 0; i < 6; i++) {
-            if (i + 1 < kNTokens.length && !kNTokens[i + 1].trim().isEmpty()) {
-                try {
-                    kNData[i] = Double.parseDouble(kNTokens[i + 1].trim());
-                } catch (NumberFormatException e) {
-                    kNData[i] = Double.NaN;
-                }
-            } else {
-                kNData[i] = Double.NaN;
-            }
-        }
-        dataRows.add(kNData);
-
-        reader.close();
+        double[][] dataRows = {padded(massKg), padded(loadN)};
 
         // Header content - now with 6 data columns plus average
         String[][] headerTable = {
@@ -210,8 +266,8 @@ public class BeamCompression {
         sheet.addMergedRegion(new CellRangeAddress(row10, row10, 0, 1));
         for (int i = 0; i < 6; i++) {
             XSSFCell cell = forceRow.createCell(i + 2);
-            if (!Double.isNaN(dataRows.get(1)[i])) {
-                cell.setCellValue(dataRows.get(1)[i]);
+            if (!Double.isNaN(dataRows[1][i])) {
+                cell.setCellValue(dataRows[1][i]);
                 cell.setCellStyle(centered);
             } else {
                 cell.setCellStyle(centered);
@@ -230,7 +286,7 @@ public class BeamCompression {
         for (int i = 0; i < 6; i++) {
             char col = (char) ('C' + i);
             XSSFCell cell = strengthRow.createCell(i + 2);
-            if (!Double.isNaN(dataRows.get(1)[i])) {
+            if (!Double.isNaN(dataRows[1][i])) {
                 cell.setCellFormula(String.format("%c10/%c9", col, col));
                 cell.setCellStyle(twoDecimalStyle);
             } else {
@@ -276,22 +332,5 @@ public class BeamCompression {
             sheet.setColumnWidth(i, 10 * 256);
         }
         sheet.setColumnWidth(8, 12 * 256); // Media column
-
-        // Create cross-platform output path
-        Path currentDir = Paths.get(System.getProperty("user.dir"));
-        Path outputDir = currentDir.resolve("data").resolve("receipts").resolve("excel_receipts");
-        
-        // Create directories if they don't exist
-        Files.createDirectories(outputDir);
-        
-        Path outputFile = outputDir.resolve("beam_compression_receipt.xlsx");
-
-        // Output file
-        try (FileOutputStream out = new FileOutputStream(outputFile.toFile())) {
-            workbook.write(out);
-        }
-        workbook.close();
-
-        System.out.println("Excel receipt created at: " + outputFile.toString());
     }
 }
\ No newline at end of file
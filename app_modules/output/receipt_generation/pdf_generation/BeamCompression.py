@@ -1,21 +1,16 @@
 import json
-import os
 from pathlib import Path
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+
+from app_modules.models.statistics_engine import receipt_mean
+from app_modules.output.receipt_generation.pdf_generation.pdf_engine import ReceiptTemplate, get_template, write_pdf
+
+TEST_COUNT = 6  # Specimens per receipt
 
 # Get the project root dynamically
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent.parent
 
-# Register DejaVuSans font with proper path resolution
-font_dir = Path(__file__).parent
-pdfmetrics.registerFont(TTFont('DejaVuSans', str(font_dir / "DejaVuSans.ttf")))
-pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', str(font_dir / "DejaVuSans-Bold.ttf")))
-
 def process_test_data(raw_data):
     """Process raw test data for beam compression testing"""
     tests = raw_data["tests"]
@@ -52,68 +47,30 @@ def process_test_data(raw_data):
         "strengths": strengths,
         "areas": [22500] * 6,  # All beams have same area
         "averages": {
-            "force": round(sum(f for f in forces if f > 0) / len([f for f in forces if f > 0]), 2) if any(f > 0 for f in forces) else 0.0,
-            "strength": round(sum(s for s in strengths if s > 0) / len([s for s in strengths if s > 0]), 2) if any(s > 0 for s in strengths) else 0.0,
+            "force": round(receipt_mean([f for f in forces if f > 0]), 2),  # Missing specimens are not averaged
+            "strength": round(receipt_mean([s for s in strengths if s > 0]), 2),
             "area": 22500
         }
     }
 
-def build_row(label_parts, values, label_width=2):
-    """Helper function to build table rows"""
-    return label_parts + values
-
-def create_pdf_with_reportlab(raw_data, processed_data):
-    """Create compact PDF report for beam compression testing"""
-    set_id = raw_data["set_id"]
-    sampling_date = raw_data["sampling_date"]
-    testing_date = raw_data["testing_date"]
-    test_count = 6  # Beam compression uses 6 specimens
+def build_template(test_count):
+    """Static receipt layout for a given specimen count (compiled once, see pdf_engine)"""
     total_cols = 2 + test_count + 1  # 2 label columns + test values + average
 
-    forces = processed_data["forces"]
-    strengths = processed_data["strengths"]
-    areas = processed_data["areas"]
-    averages = processed_data["averages"]
-
-    filename = "beam_compression.pdf"
-    
-    # Use dynamic path resolution:
-    target_path = PROJECT_ROOT / "data" / "receipts" / "pdf_receipts" / filename
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-
-    doc = SimpleDocTemplate(str(target_path), pagesize=A4, topMargin=10*mm, bottomMargin=10*mm,
-                            leftMargin=10*mm, rightMargin=10*mm)
-
-    table_data = []
-
-    # Header rows (merged across total columns)
-    table_data.append(["PILOT 4, MODEL 50 - C4642 Nr. Serial"] + [""] * (total_cols - 1))
-    table_data.append(["Rezultatele încercării:"] + [""] * (total_cols - 1))
-    table_data.append([f"Indicativ serie {set_id}", ""] + [f"{i+1}" for i in range(test_count)] + ["Media"])
-
-    # Data rows - compact format
-    table_data.append(build_row(["Data confecționării", ""], [sampling_date] * test_count + [sampling_date]))
-    table_data.append(build_row(["Data încercării", ""], [testing_date] * test_count + [testing_date]))
-    
-    # Cube dimensions - for compression, all dimensions are 150mm (cubic)
-    table_data.append(build_row(["Dimensiunile cubului [mm]", "x [mm]"], ["150"] * test_count + ["150"]))
-    table_data.append(build_row(["", "y [mm]"], ["150"] * test_count + ["150"]))
-    table_data.append(build_row(["", "z [mm]"], ["150"] * test_count + ["150"]))
-    
-    # Compression area (150 x 150 = 22,500 mm²)
-    table_data.append(build_row(["Suprafața de compresiune [mm²]", ""], [str(a) for a in areas] + [str(averages["area"])]))
-    
-    # Force and strength data
-    table_data.append(build_row(["Sarcina de rupere la compresiune [N]", ""], [str(f) if f > 0 else "" for f in forces] + [str(averages["force"]) if averages["force"] > 0 else ""]))
-    table_data.append(build_row(["Rezistența de rupere la compresiune [N/mm²]", ""], [str(s) if s > 0 else "" for s in strengths] + [str(averages["strength"]) if averages["strength"] > 0 else ""]))
-
-    # Column widths: 60mm, 14mm for labels, then 18mm for each data column, 18mm for average
-    col_widths = [60*mm, 14*mm] + [18*mm] * test_count + [18*mm]
-    row_heights = [4.0*mm] * len(table_data)  # Slightly smaller to match Java 12pt
-
-    table = Table(table_data, colWidths=col_widths, rowHeights=row_heights)
-
-    table.setStyle(TableStyle([
+    rows = [["PILOT 4, MODEL 50 - C4642 Nr. Serial"] + [""] * (total_cols - 1),
+            ["Rezultatele încercării:"] + [""] * (total_cols - 1),
+            ["", ""] + [f"{i+1}" for i in range(test_count)] + ["Media"],  # Indicativ serie filled per receipt
+            ["Data confecționării", ""] + [""] * (test_count + 1),
+            ["Data încercării", ""] + [""] * (test_count + 1),
+            # Cube dimensions - for compression, all dimensions are 150mm (cubic)
+            ["Dimensiunile cubului [mm]", "x [mm]"] + ["150"] * (test_count + 1),
+            ["", "y [mm]"] + ["150"] * (test_count + 1),
+            ["", "z [mm]"] + ["150"] * (test_count + 1),
+            ["Suprafața de compresiune [mm²]", ""] + ["22500"] * (test_count + 1),
+            ["Sarcina de rupere la compresiune [N]", ""] + [""] * (test_count + 1),
+            ["Rezistența de rupere la compresiune [N/mm²]", ""] + [""] * (test_count + 1)]
+
+    style = [
         ('FONTSIZE', (0, 0), (-1, -1), 9),
         ('FONTNAME', (0, 0), (-1, -1), 'DejaVuSans'),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -153,9 +110,36 @@ def create_pdf_with_reportlab(raw_data, processed_data):
         ('LINEBELOW', (0, -1), (-1, -1), 1.2, colors.black),  # Bottom edge
         ('LINEBELOW', (0, 1), (-1, 1), 1.2, colors.black),    # Below second header
         ('LINEBEFORE', (2, 0), (2, -1), 1.2, colors.black),   # Before data columns
-    ]))
+    ]
+
+    col_widths = [60*mm, 14*mm] + [18*mm] * test_count + [18*mm]
+    row_heights = [4.0*mm] * len(rows)  # Slightly smaller to match Java 12pt
+    return ReceiptTemplate(rows, col_widths, row_heights, style, value_column=2)
+
+def build_receipt_table(raw_data, processed_data):
+    """Receipt table flowable (one page) - shared by single receipts and combined batch documents"""
+    sampling_date = raw_data["sampling_date"]
+    testing_date = raw_data["testing_date"]
+    test_count = TEST_COUNT
+
+    forces = processed_data["forces"]
+    strengths = processed_data["strengths"]
+    averages = processed_data["averages"]
+    template = get_template("beam_compression", test_count, build_template)
+
+    return template.fill({3: [sampling_date] * (test_count + 1),
+                          4: [testing_date] * (test_count + 1),
+                          9: [str(f) if f > 0 else "" for f in forces] + [str(averages["force"]) if averages["force"] > 0 else ""],
+                          10: [str(s) if s > 0 else "" for s in strengths] + [str(averages["strength"]) if averages["strength"] > 0 else ""]},
+                         cells={(2, 0): f"Indicativ serie {raw_data['set_id']}"})
+
+def create_pdf_with_reportlab(raw_data, processed_data, target_path=None):
+    """Create compact PDF report for beam compression testing"""
+    # Default to the legacy fixed name when no (content-addressed) path is given:
+    if target_path is None:
+        target_path = PROJECT_ROOT / "data" / "receipts" / "pdf_receipts" / "beam_compression.pdf"
 
-    doc.build([table])
+    target_path = write_pdf(target_path, [build_receipt_table(raw_data, processed_data)])
     print(f"Beam compression PDF generated at: {target_path}")
     return str(target_path)
 
@@ -0,0 +1,135 @@
+"""Shared PDF rendering engine - fonts registered once, receipt table templates compiled once per layout"""
+
+#%% Dependencies:
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import PageBreak, SimpleDocTemplate, Table, TableStyle
+
+#%% Constants:
+
+FONT_DIR = Path(__file__).parent
+FONTS = {'DejaVuSans': "DejaVuSans.ttf",
+         'DejaVuSans-Bold': "DejaVuSans-Bold.ttf"}
+
+PAGE_MARGIN = 10*mm
+
+#%% Fonts:
+
+_font_lock = threading.Lock()
+_fonts_registered = False
+
+
+def register_fonts() -> None:
+    """Parse and register the DejaVu TTFs once per process"""
+
+    global _fonts_registered
+    if _fonts_registered:
+        return
+
+    with _font_lock:
+        if not _fonts_registered:
+            registered = set(pdfmetrics.getRegisteredFontNames())
+            for font_name, filename in FONTS.items():
+                if font_name not in registered:
+                    pdfmetrics.registerFont(TTFont(font_name, str(FONT_DIR / filename)))
+            _fonts_registered = True
+
+#%% Templates:
+
+class ReceiptTemplate:
+    """Precompiled receipt table: static labels, spans and styles - only value cells change per receipt"""
+
+    def __init__(self, rows: Sequence[Sequence[str]],       # Skeleton rows with static text ("" for value cells)
+                 col_widths: Sequence[float],
+                 row_heights: Sequence[float],
+                 style_commands: Sequence[Tuple],            # TableStyle commands (compiled once)
+                 value_column: int):                         # First column holding per-specimen values
+        """Freeze skeleton and compile the style"""
+
+        self.rows = tuple(tuple(row) for row in rows)
+        self.col_widths = tuple(col_widths)
+        self.row_heights = tuple(row_heights)
+        self.style = TableStyle(list(style_commands))  # Parsed once, applied to every fill
+        self.value_column = value_column
+
+
+    def fill(self, values: Dict[int, Sequence[str]],                 # Row index -> per-specimen values + average
+             cells: Optional[Dict[Tuple[int, int], str]] = None       # Individual (row, column) texts
+            ) -> Table:
+        """Receipt table with the variable cells filled in"""
+
+        data = [list(row) for row in self.rows]
+        for row_index, row_values in values.items():
+            data[row_index][self.value_column:] = row_values
+        for (row_index, column_index), text in (cells or {}).items():
+            data[row_index][column_index] = text
+
+        return Table(data, colWidths=list(self.col_widths), rowHeights=list(self.row_heights), style=self.style)
+
+
+_template_lock = threading.Lock()
+_templates: Dict[Tuple[str, int], ReceiptTemplate] = {}
+
+
+def get_template(layout: str,                                     # Protocol layout name
+                 specimen_count: int,                             # Value columns (without the average)
+                 builder: Callable[[int], ReceiptTemplate]        # Builds the template on first use
+                ) -> ReceiptTemplate:
+    """Cached template per (layout, specimen count)"""
+
+    key = (layout, specimen_count)
+    template = _templates.get(key)
+    if template is None:
+        with _template_lock:
+            template = _templates.get(key)
+            if template is None:
+                register_fonts()
+                template = _templates[key] = builder(specimen_count)
+    return template
+
+#%% Documents:
+
+def build_document(target: Any,               # PDF path or writable binary file object
+                   tables: List[Any]          # One flowable per page
+                  ) -> None:
+    """Write one table per A4 page straight to target"""
+
+    register_fonts()
+    flowables = []
+    for table in tables:
+        if flowables:
+            flowables.append(PageBreak())
+        flowables.append(table)
+
+    doc = SimpleDocTemplate(target if hasattr(target, "write") else str(target), pagesize=A4,
+                            topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN,
+                            leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN)
+    doc.build(flowables)
+
+
+def write_pdf(target_path: Any,               # Final receipt path
+              tables: List[Any]               # One flowable per page
+             ) -> Path:
+    """Render next to the target and move into place, so a half-written file is never picked up as a cached receipt"""
+
+    target_path = Path(target_path)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = target_path.with_name(f".{target_path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+
+    try:
+        build_document(partial_path, tables)
+        os.replace(partial_path, target_path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+
+    return target_path
+
+#%%
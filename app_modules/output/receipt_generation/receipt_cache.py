@@ -0,0 +1,176 @@
+"""Receipt cache - content-addressed receipt paths with size- and age-bounded LRU eviction"""
+
+#%% Dependencies:
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, List, Optional, Set, Tuple
+
+from app_modules.output.printing.printer_plugin import spooled_files
+
+#%% Constants:
+
+FORMAT_DIRECTORIES = {"PDF": ("pdf_receipts", ".pdf"),
+                      "Excel": ("excel_receipts", ".xlsx")}
+BATCH_DIRECTORY = "batch_receipts"      # Combined batch documents (BatchRenderer), same budget as receipts
+
+HASH_LENGTH = 12                        # Hex digits of the content hash kept in file names
+DEFAULT_MAX_SIZE_MB = 512               # Receipts directory budget
+DEFAULT_MAX_AGE_DAYS = 365              # Receipts older than this are evicted (can be re-rendered from the registry)
+
+UNSAFE_FILENAME_CHARACTERS = re.compile(r"[^A-Za-z0-9._-]+")
+
+#%% Helper Functions:
+
+def content_hash(set_data: Any) -> str:
+    """Stable hash of everything that ends up on a receipt (delivery options excluded)"""
+
+    content = {"input_data": set_data.input_data.model_dump(mode="json", exclude={"output_format", "should_print"}),
+               "specimens": [specimen.model_dump(mode="json") for specimen in set_data.specimens]}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:HASH_LENGTH]
+
+
+def receipt_filename(set_data: Any,       # SetData
+                     extension: str       # ".pdf" / ".xlsx"
+                    ) -> str:             # <set_id>_<protocol>_<YYYYMMDD>_<hash><extension>
+    """Unique, human-readable file name for a set's receipt"""
+
+    input_data = set_data.input_data
+    set_id = UNSAFE_FILENAME_CHARACTERS.sub("-", input_data.set_id).strip("-.") or "set"
+    testing_date = datetime.strptime(input_data.testing_date, "%d.%m.%Y").strftime("%Y%m%d")
+    return f"{set_id}_{input_data.protocol}_{testing_date}_{content_hash(set_data)}{extension}"
+
+#%% Receipt Cache:
+
+class ReceiptCache:
+    """Maps a SetData to its receipt paths and reuses receipts already rendered for identical content"""
+
+    def __init__(self, ctx: Any,                                   # Context object
+                 receipts_dir: Path,                               # data_storage.receipts_dir
+                 max_size_mb: float = DEFAULT_MAX_SIZE_MB,         # Total size budget
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS,       # Maximum time since last use
+                 spool_dir: Optional[Path] = None):                # Receipts waiting to be printed are kept
+        """Initialize cache over the existing receipts directory layout"""
+
+        self.ctx = ctx
+        self.receipts_dir = Path(receipts_dir)
+        self.spool_dir = spool_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+    @classmethod
+    def from_config(cls, ctx: Any, config: Any) -> "ReceiptCache":
+        """Build cache from data_storage.receipts_dir and the optional data_storage.receipt_cache block"""
+
+        cache_config = config.data_storage.get('receipt_cache', None) or {}
+        printing_config = config.get('printing', None) or {}
+        return cls(ctx, config.data_storage.receipts_dir,
+                   max_size_mb=cache_config.get('max_size_mb', DEFAULT_MAX_SIZE_MB),
+                   max_age_days=cache_config.get('max_age_days', DEFAULT_MAX_AGE_DAYS),
+                   spool_dir=printing_config.get('spool_dir', None))
+
+
+    def path_for(self, set_data: Any,        # SetData
+                 output_format: str          # "PDF" or "Excel"
+                ) -> Path:                   # Where this set's receipt lives
+        """Content-addressed receipt path"""
+
+        if output_format not in FORMAT_DIRECTORIES:
+            raise self.ctx.errors.OutputError(f"Unsupported output format: {output_format}")
+
+        directory, extension = FORMAT_DIRECTORIES[output_format]
+        return self.receipts_dir / directory / receipt_filename(set_data, extension)
+
+
+    def lookup(self, path: Path) -> Optional[Path]:
+        """Return the receipt if it was already rendered (receipts are written atomically, so existing == complete)"""
+
+        with self._lock:
+            try:
+                if path.stat().st_size > 0:
+                    os.utime(path)  # Last use, so eviction drops the least recently used receipts first
+                    self.hits += 1
+                    self.ctx.logger.info(f"Receipt cache hit: {path.name}")
+                    return path
+            except FileNotFoundError:
+                pass
+
+            self.misses += 1
+            return None
+
+
+    def evict(self) -> Tuple[int, int]:  # (files removed, bytes freed)
+        """Drop receipts unused past the age limit, then the least recently used until the budget is met"""
+
+        with self._lock:
+            now = time.time()
+            entries: List[Tuple[float, int, Path]] = []
+
+            for directory, extension in FORMAT_DIRECTORIES.values():
+                for path in [*(self.receipts_dir / directory).glob(f"*{extension}"),
+                             *(self.receipts_dir / BATCH_DIRECTORY).glob(f"*{extension}")]:
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))  # mtime = last use (touched on hits)
+
+            entries.sort()  # Least recently used first
+            total_bytes = sum(size for _, size, _ in entries)
+            removed, freed = 0, 0
+            spooled = None
+
+            # Registered receipts may go too - ReceiptGenerationBridge.registered_receipts() re-renders them:
+            for mtime, size, path in entries:
+                if now - mtime <= self.max_age_seconds and total_bytes <= self.max_bytes:
+                    break
+
+                if spooled is None:  # Read only when something is due
+                    spooled = self._spooled_paths()
+                    if spooled is None:
+                        return 0, 0
+                if path.resolve() in spooled:
+                    continue
+
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.ctx.logger.warning(f"Could not evict receipt {path.name}: {str(e)}")
+                    continue
+                total_bytes -= size
+                removed += 1
+                freed += size
+
+            if removed:
+                self.ctx.logger.info(f"Evicted {removed} cached receipts ({freed / 1024:.0f} KiB)")
+
+            return removed, freed
+
+
+    def _spooled_paths(self) -> Optional[Set[Path]]:  # None if the spool could not be read
+        """Resolved paths of receipts that pending or failed print jobs still need"""
+
+        if self.spool_dir is None:
+            return set()
+
+        try:
+            return spooled_files(self.spool_dir)
+        except Exception as e:
+            # Evicting without knowing what is spooled could delete a receipt before it is printed:
+            self.ctx.logger.warning(f"Receipt eviction skipped, the print spool could not be read: {str(e)}")
+            return None
+
+#%%
@@ -2,10 +2,60 @@
 
 #%% Dependencies:
 
-import csv
-import jpype
+import math
+import time
+import importlib
+import threading
+import multiprocessing
 from pathlib import Path
-from typing import Any, Dict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app_modules.models.unit_conversion import column, format_values
+from app_modules.output.receipt_generation.receipt_cache import FORMAT_DIRECTORIES, ReceiptCache
+
+#%% Constants:
+
+PDF_MODULES = {'cube_compression': 'app_modules.output.receipt_generation.pdf_generation.CubeCompression',
+               'beam_compression': 'app_modules.output.receipt_generation.pdf_generation.BeamCompression',
+               'beam_flexural': 'app_modules.output.receipt_generation.pdf_generation.BeamFlexural'}
+
+EXCEL_CLASSES = {'cube_compression': 'CubeCompression',
+                 'beam_compression': 'BeamCompression',
+                 'beam_flexural': 'BeamFlexural'}
+
+EXCEL_SPECIMEN_COUNTS = {'cube_compression': 3,  # Columns per generated sheet
+                         'beam_compression': 6,  # 2 halves per beam
+                         'beam_flexural': 3}
+
+DEFAULT_PDF_WORKERS = 1  # ReportLab processes kept warm for concurrent generation
+
+EXCEL_DIR = Path(__file__).parent / "excel_generation"  # Compiled generator classes, POI JARs in lib/
+
+DEFAULT_WARMUP_BUDGET_MS = 3000  # Wall time the background Excel warm-up may spend before it stops
+WARMUP_SET_ID = "WARMUP"         # Set id of the throwaway warm-up workbooks (never written to disk)
+
+# Present only in poi-ooxml-lite/-full - XSSF cannot create a workbook without the OOXML schema classes:
+OOXML_SCHEMA_CLASS = "org.openxmlformats.schemas.spreadsheetml.x2006.main.CTWorkbook"
+
+#%% Helper Functions:
+
+def excel_classpath() -> List[str]:
+    """Excel generator classes directory plus every POI JAR"""
+
+    return [str(EXCEL_DIR.absolute())] + [str(jar.absolute()) for jar in sorted((EXCEL_DIR / "lib").glob("*.jar"))]
+
+#%% Worker Functions:
+
+def render_pdf_receipt(receipt_data: Dict,                # Output of _convert_to_receipt_format
+                       protocol_key: str,                  # Key of PDF_MODULES
+                       target_path: Optional[Path] = None  # Receipt path (legacy fixed name when None)
+                      ) -> str:                            # Path of the written PDF
+    """Render one PDF receipt - module-level so it can run inside a worker process"""
+
+    module = importlib.import_module(PDF_MODULES[protocol_key])
+    processed_data = module.process_test_data(receipt_data)
+    return str(module.create_pdf_with_reportlab(receipt_data, processed_data, target_path))
 
 #%% Receipt Generation Bridge:
 
@@ -16,6 +66,19 @@ class ReceiptGenerationBridge:
         self.ctx = None
         self.config = None
         self.jvm_started = False
+        self.cache = None
+        self._excel_loader = None  # Class loader for the POI classpath when attached after JVM startup
+
+        # Concurrent generation workers (created on first use):
+        self.pdf_workers = DEFAULT_PDF_WORKERS
+        self._pdf_pool = None
+        self._jvm_executor = None
+
+        # Background Excel warm-up (runs on the POI thread while the user fills in the form):
+        self.warmup_budget_ms = DEFAULT_WARMUP_BUDGET_MS
+        self.warmup_timings: Dict[str, float] = {}  # Milliseconds per generator class
+        self._warmup_future = None
+        self._warmup_cancelled = threading.Event()
 
         # Protocol mapping for file selection:
         self.protocol_mapping = {'cube_compression_testing': 'cube_compression',
@@ -36,6 +99,19 @@ class ReceiptGenerationBridge:
             # Ensure output directories exist:
             self._ensure_output_directories()
 
+            # Content-addressed receipt cache, trimmed to its budget on startup:
+            self.cache = ReceiptCache.from_config(ctx, config)
+            self.cache.evict()
+
+            # Worker pool sizing for concurrent generation:
+            output_config = config.get('output', {})
+            self.pdf_workers = output_config.get('pdf_workers', DEFAULT_PDF_WORKERS)
+
+            # Load and JIT the Excel generators before the first receipt is due:
+            self.warmup_budget_ms = output_config.get('excel_warmup_budget_ms', DEFAULT_WARMUP_BUDGET_MS)
+            if output_config.get('excel_warmup', True):
+                self.start_excel_warmup()
+
             self.ctx.logger.info("Receipt generation bridge setup completed")
 
         except Exception as e:
@@ -53,15 +129,22 @@ class ReceiptGenerationBridge:
             protocol = set_data.input_data.protocol
             self.ctx.logger.info(f"Generating {output_format} receipt for {protocol}")
 
+            # Same content already rendered - reuse it:
+            target_path = self.cache.path_for(set_data, output_format)
+            cached_path = self.cache.lookup(target_path)
+            if cached_path is not None:
+                return cached_path
+
             # Convert data model to receipt format:
             receipt_data = self._convert_to_receipt_format(set_data)
 
             if output_format == "PDF":
-                return self._generate_pdf_receipt(receipt_data, protocol)
-            elif output_format == "Excel":
-                return self._generate_excel_receipt(receipt_data, protocol)
+                result_path = self._generate_pdf_receipt(receipt_data, protocol, target_path)
             else:
-                raise self.ctx.errors.OutputError(f"Unsupported output format: {output_format}")
+                result_path = self._generate_excel_receipt(receipt_data, protocol, target_path)
+
+            self.cache.evict()
+            return result_path
 
         except Exception as e:
             error_msg = f"Failed to generate {output_format} receipt: {str(e)}"
@@ -69,6 +152,219 @@ class ReceiptGenerationBridge:
             raise self.ctx.errors.OutputError(error_msg)
 
 
+    def generate_receipts_concurrently(self, set_data: Any,        # Complete SetData instance
+                                       output_formats: List[str]   # Formats in the order requested
+                                      ) -> List[Tuple[str, Optional[Path], Optional[Exception]]]:  # (format, path, error)
+        """Generate all formats at once: PDF in a worker process, Excel on the dedicated JVM thread"""
+
+        protocol = set_data.input_data.protocol
+        receipt_data = self._convert_to_receipt_format(set_data)
+        protocol_key = self.protocol_mapping.get(protocol, 'cube_compression')
+
+        # Dispatch everything before waiting on anything (cache hits resolve immediately):
+        futures: List[Tuple[str, Optional[Future], Optional[Exception]]] = []
+        for output_format in output_formats:
+            try:
+                target_path = self.cache.path_for(set_data, output_format)
+                cached_path = self.cache.lookup(target_path)
+
+                if cached_path is not None:
+                    future = Future()
+                    future.set_result(cached_path)
+                elif output_format == "PDF":
+                    future = self._get_pdf_pool().submit(render_pdf_receipt, receipt_data, protocol_key, target_path)
+                else:
+                    future = self._get_jvm_executor().submit(self._generate_excel_receipt, receipt_data,
+                                                             protocol, target_path)
+                futures.append((output_format, future, None))
+
+            except Exception as e:
+                futures.append((output_format, None, e))
+
+        # Gather in the original order, keeping per-format errors:
+        results = []
+        for output_format, future, error in futures:
+            if future is None:
+                results.append((output_format, None, error))
+                continue
+
+            try:
+                result_path = Path(future.result())
+                if not result_path.exists():
+                    raise self.ctx.errors.OutputError(f"{output_format} receipt was not created at: {result_path}")
+                results.append((output_format, result_path, None))
+
+            except Exception as e:
+                self.ctx.logger.error(f"Concurrent {output_format} generation failed: {str(e)}")
+                results.append((output_format, None, e))
+
+        self.cache.evict()
+        return results
+
+
+    def render_batch(self, batch: Any,                     # BatchData or list of SetData
+                     output_format: str = "PDF",           # "PDF" or "Excel"
+                     combine: bool = False,                # One combined document for the whole batch
+                     progress: Any = None                  # Optional callback receiving BatchProgress
+                    ) -> Any:                              # BatchResult
+        """Render a whole batch in parallel (see batch_renderer)"""
+
+        from app_modules.output.receipt_generation.batch_renderer import BatchReceiptRenderer
+
+        workers = self.config.get('output', {}).get('batch_workers', None)
+        return BatchReceiptRenderer(self.ctx, self, workers).render(batch, output_format, combine, progress)
+
+
+    def registered_receipts(self, registry: Any,         # RegistryManager
+                            row: Dict[str, Any],         # One RegistryManager.query() row
+                            data_models: Sequence        # (InputData, ScaleData, PressData, SpecimenData, SetData)
+                           ) -> List[Path]:              # The entry's receipt files, all present on disk
+        """Receipts recorded for a registry entry, re-rendered at their recorded paths where the cache evicted them"""
+
+        try:
+            paths = [Path(path) for path in row["receipts"]]
+            missing = [path for path in paths if self.cache.lookup(path) is None]
+            if not missing:
+                return paths
+
+            from app_modules.output.receipt_generation.batch_renderer import set_from_registry_row
+
+            # The registry keeps values, not display decimals - render to the recorded path, not path_for():
+            set_data = set_from_registry_row(registry, row, data_models)
+            receipt_data = self._convert_to_receipt_format(set_data)
+            formats = {extension: output_format for output_format, (_, extension) in FORMAT_DIRECTORIES.items()}
+
+            for path in missing:
+                self.ctx.logger.info(f"Re-rendering evicted receipt {path.name}")
+                if formats.get(path.suffix) == "PDF":
+                    self._generate_pdf_receipt(receipt_data, set_data.input_data.protocol, path)
+                elif formats.get(path.suffix) == "Excel":
+                    self._generate_excel_receipt(receipt_data, set_data.input_data.protocol, path)
+                else:
+                    raise self.ctx.errors.OutputError(f"Unknown receipt type: {path.name}")
+
+            return paths
+
+        except Exception as e:
+            error_msg = f"Failed to restore receipts of registry entry {row.get('set_id')}: {str(e)}"
+            self.ctx.logger.error(error_msg)
+            raise self.ctx.errors.OutputError(error_msg)
+
+
+    def excel_class(self, class_name: str  # Generator class or POI class name
+                   ) -> Any:               # JPype class
+        """Resolve a class on the Excel classpath, attaching it on first use"""
+
+        import jpype
+
+        if not self.jvm_started:
+            self._start_jvm()
+
+        if self._excel_loader is None:
+            return jpype.JClass(class_name)
+
+        # POI/XMLBeans resolve their schemas through the context class loader of the calling thread:
+        jpype.JClass("java.lang.Thread").currentThread().setContextClassLoader(self._excel_loader)
+        return jpype.JClass(class_name, loader=self._excel_loader)
+
+
+    def excel_supports(self, class_name: str,  # Generator class name
+                       method: str             # Static method, e.g. "generateFile" or "addSheet"
+                      ) -> bool:               # False for generators compiled before the in-memory API
+        """Check whether the compiled generator class provides a method"""
+
+        return hasattr(self.excel_class(class_name), method)
+
+
+    def start_excel_warmup(self) -> Future:  # Resolves to warmup_timings
+        """Queue a throwaway workbook per protocol on the POI thread (returns at once)"""
+
+        if self._warmup_future is None:
+            self._warmup_cancelled.clear()
+            self._warmup_future = self._get_jvm_executor().submit(self._warm_up_excel)
+            self.ctx.logger.info(f"Excel warm-up started in the background (budget {self.warmup_budget_ms} ms)")
+        return self._warmup_future
+
+
+    def _warm_up_excel(self) -> Dict[str, float]:
+        """Exercise every generator in memory so POI class loading and JIT happen before the first real receipt"""
+
+        import jpype
+
+        started = time.perf_counter()
+        try:
+            for protocol_key, class_name in EXCEL_CLASSES.items():
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if self._warmup_cancelled.is_set():
+                    break
+                if elapsed_ms > self.warmup_budget_ms:
+                    skipped = [name for name in EXCEL_CLASSES.values() if name not in self.warmup_timings]
+                    self.ctx.logger.warning(f"Excel warm-up exceeded its {self.warmup_budget_ms} ms budget "
+                                            f"({elapsed_ms:.0f} ms) - skipping {skipped}")
+                    break
+
+                # Budget is checked between workbooks - a real Excel receipt queued behind the warm-up
+                # waits for at most the workbook in progress:
+                step_started = time.perf_counter()
+                if self.excel_supports(class_name, "generateBytes"):
+                    specimen_count = EXCEL_SPECIMEN_COUNTS[protocol_key]
+                    self.excel_class(class_name).generateBytes(WARMUP_SET_ID, "01.01.2000", "29.01.2000",
+                                                               jpype.JArray(jpype.JDouble)([2.4] * specimen_count),
+                                                               jpype.JArray(jpype.JDouble)([500000.0] * specimen_count))
+                    self.warmup_timings[class_name] = (time.perf_counter() - step_started) * 1000
+                elif "POI" not in self.warmup_timings:
+                    # Legacy main() writes real files - warm POI itself up instead (class already loaded above):
+                    self._warm_up_poi()
+                    self.warmup_timings["POI"] = (time.perf_counter() - step_started) * 1000
+
+        except Exception as e:
+            self.ctx.logger.warning(f"Excel warm-up failed, the first receipt will load POI on demand: {str(e)}")
+
+        total_ms = (time.perf_counter() - started) * 1000
+        steps = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.warmup_timings.items())
+        self.ctx.logger.info(f"Excel warm-up finished in {total_ms:.0f} ms of {self.warmup_budget_ms} ms budget"
+                             f"{f' ({steps})' if steps else ''}")
+        return self.warmup_timings
+
+
+    def _warm_up_poi(self) -> None:
+        """Build and serialize a small styled workbook in memory (loads the XSSF classes the generators use)"""
+
+        workbook = self.excel_class("org.apache.poi.xssf.usermodel.XSSFWorkbook")()
+        try:
+            style = workbook.createCellStyle()
+            style.setDataFormat(workbook.createDataFormat().getFormat("0.00"))
+            font = workbook.createFont()
+            font.setBold(True)
+            style.setFont(font)
+
+            cell = workbook.createSheet(WARMUP_SET_ID).createRow(0).createCell(0)
+            cell.setCellValue(2.4)
+            cell.setCellStyle(style)
+
+            workbook.write(self.excel_class("java.io.ByteArrayOutputStream")())
+        finally:
+            workbook.close()
+
+
+    def _get_pdf_pool(self) -> ProcessPoolExecutor:
+        """ReportLab worker processes (spawned, not forked - the parent hosts a running JVM)"""
+
+        if self._pdf_pool is None:
+            self._pdf_pool = ProcessPoolExecutor(max_workers=self.pdf_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            self.ctx.logger.info(f"Started PDF worker pool ({self.pdf_workers} processes)")
+        return self._pdf_pool
+
+
+    def _get_jvm_executor(self) -> ThreadPoolExecutor:
+        """Single thread that owns all POI calls"""
+
+        if self._jvm_executor is None:
+            self._jvm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jvm-poi")
+        return self._jvm_executor
+
+
     def _convert_to_receipt_format(self, set_data: Any) -> Dict:
         """Convert SetData to receipt format"""
 
@@ -76,17 +372,15 @@ class ReceiptGenerationBridge:
             input_data = set_data.input_data
             specimens = set_data.specimens
 
-            # Build tests array in receipt format:
-            tests = []
-            for specimen in specimens:
-                test_data = {
-                    "scale_data": str(int(specimen.scale_data.mass * 1000)) if specimen.scale_data else "0",
-                    "compression_data": {
-                        "kN": f"{specimen.press_data.load / 1000:.1f}" if specimen.press_data else "0.0",
-                        "MPa": f"{specimen.press_data.strength:.2f}" if specimen.press_data else "0.00"
-                    }
-                }
-                tests.append(test_data)
+            # Build tests array in receipt format - whole columns converted to g/kN/MPa and formatted at once:
+            scale_models = [specimen.scale_data for specimen in specimens]
+            press_models = [specimen.press_data for specimen in specimens]
+            masses = format_values(column(scale_models, "mass", "g"), 0, missing="0")
+            loads = format_values(column(press_models, "load", "kN"), 1, missing="0.0")
+            strengths = format_values(column(press_models, "strength", "MPa"), 2, missing="0.00")
+
+            tests = [{"scale_data": mass, "compression_data": {"kN": load, "MPa": strength}}
+                     for mass, load, strength in zip(masses, loads, strengths)]
 
             protocol_names = {'cube_compression_testing': 'Rezistență la Compresiune Cuburi',
                               'cube_frost_testing': 'Gelivitate Cuburi',
@@ -115,27 +409,18 @@ class ReceiptGenerationBridge:
             raise self.ctx.errors.OutputError(error_msg)
 
 
-    def _generate_pdf_receipt(self, data: Dict, protocol: str) -> Path:
+    def _generate_pdf_receipt(self, data: Dict, protocol: str, target_path: Optional[Path] = None) -> Path:
         """Generate PDF receipt"""
 
         try:
             # Map protocol to receipt PDF modules:
             protocol_key = self.protocol_mapping.get(protocol, 'cube_compression')
 
-            if protocol_key == 'cube_compression':
-                from app_modules.output.receipt_generation.pdf_generation.CubeCompression import process_test_data, create_pdf_with_reportlab
-            elif protocol_key == 'beam_compression':
-                from app_modules.output.receipt_generation.pdf_generation.BeamCompression import process_test_data, create_pdf_with_reportlab
-            elif protocol_key == 'beam_flexural':
-                from app_modules.output.receipt_generation.pdf_generation.BeamFlexural import process_test_data, create_pdf_with_reportlab
-            else:
+            if protocol_key not in PDF_MODULES:
                 raise self.ctx.errors.OutputError(f"Unknown protocol for PDF generation: {protocol}")
 
-            # Process data:
-            processed_data = process_test_data(data)
-
-            # Generate PDF:
-            pdf_path = create_pdf_with_reportlab(data, processed_data)
+            # Process data and generate PDF:
+            pdf_path = render_pdf_receipt(data, protocol_key, target_path)
 
             # Convert to Path object and verify:
             result_path = Path(pdf_path)
@@ -155,80 +440,34 @@ class ReceiptGenerationBridge:
             raise self.ctx.errors.OutputError(error_msg)
 
 
-    def _generate_excel_receipt(self, data: Dict, protocol: str) -> Path:
-        """Generate Excel receipt"""
+    def _generate_excel_receipt(self, data: Dict, protocol: str, target_path: Optional[Path] = None) -> Path:
+        """Generate Excel receipt through the in-memory Java API (no CSV handoff, safe from any JVM-attached thread)"""
 
         try:
-            # Start JVM if needed:
-            if not self.jvm_started:
-                self._start_jvm()
-
-            # Create CSV file for Java consumption:
-            csv_path = self._create_csv_for_java(data)
+            import jpype
 
-            # Map protocol to Java class names:
             protocol_key = self.protocol_mapping.get(protocol, 'cube_compression')
-            class_mapping = {'cube_compression': 'CubeCompression',
-                             'beam_compression': 'BeamCompression', 
-                             'beam_flexural': 'BeamFlexural'}
-
-            java_class_name = class_mapping.get(protocol_key, 'CubeCompression')
-
-            # Load and execute Java class:
-            try:
-                self.ctx.logger.info(f"Attempting to load Java class: {java_class_name}")
-                java_class = jpype.JClass(java_class_name)
-                self.ctx.logger.info(f"Successfully loaded class: {java_class}")
-
-                # Log CSV contents for debugging:
-                if csv_path.exists():
-                    with open(csv_path, 'r', encoding='utf-8') as f:
-                        csv_contents = f.read()
-                        self.ctx.logger.info(f"CSV contents:\n{csv_contents}")
-
-                # Execute main method:
-                self.ctx.logger.info("Executing Java main method...")
-                java_class.main([])
-                self.ctx.logger.info("Java execution completed")
-
-            except Exception as e:
-                self.ctx.logger.error(f"Failed to execute Java class {java_class_name}: {str(e)}")
-
-                # Log more details about the error:
-                import traceback
-                self.ctx.logger.error(f"Full exception: {traceback.format_exc()}")
-
-                # Try alternative class loading approach:
-                try:
-                    self.ctx.logger.info("Trying alternative class loading...")
-                    Class = jpype.JClass("java.lang.Class")
-                    java_class = Class.forName(java_class_name)
-                    self.ctx.logger.info(f"Found class via Class.forName: {java_class}")
-
-                    # Get main method and invoke it
-                    method = java_class.getMethod("main", jpype.JClass("[Ljava.lang.String;"))
-                    method.invoke(None, jpype.JArray(jpype.JString)(0))
-
-                except Exception as e2:
-                    self.ctx.logger.error(f"Alternative class loading also failed: {str(e2)}")
-                    raise self.ctx.errors.OutputError(f"Java class {java_class_name} execution failed: {str(e)}")
-
-            # Determine expected output file:
-            expected_files = {'cube_compression': 'cube_compression_receipt.xlsx',
-                              'beam_compression': 'beam_compression_receipt.xlsx',
-                              'beam_flexural': 'beam_flexural_receipt.xlsx'}
-
-            expected_file = expected_files.get(protocol_key, 'cube_compression_receipt.xlsx')
-            excel_dir = self.config.data_storage.receipts_dir / "excel_receipts"
-            result_path = excel_dir / expected_file
-
-            if not result_path.exists():
-                raise self.ctx.errors.OutputError(f"Excel file was not created at expected path: {result_path}")
-
-            # Cleanup temporary CSV:
-            csv_path.unlink(missing_ok=True)
-
-            self.ctx.logger.info(f"Excel receipt generated successfully: {result_path.name}")
+            java_class = self.excel_class(EXCEL_CLASSES.get(protocol_key, 'CubeCompression'))
+
+            started = time.perf_counter()
+            masses, loads = self._excel_measurements(data, protocol_key)
+            output_path = target_path or self.config.data_storage.receipts_dir / "excel_receipts" / \
+                          f"{protocol_key}_receipt.xlsx"
+
+            if not hasattr(java_class, "generateFile"):
+                raise self.ctx.errors.OutputError(f"{EXCEL_CLASSES[protocol_key]}.class predates the in-memory API - "
+                                                  f"recompile the .java sources in excel_generation/")
+
+            written_path = java_class.generateFile(data["set_id"],
+                                                   str(data["sampling_date"]),
+                                                   str(data["testing_date"]),
+                                                   jpype.JArray(jpype.JDouble)(masses),
+                                                   jpype.JArray(jpype.JDouble)(loads),
+                                                   str(output_path))
+            result_path = Path(str(written_path))
+
+            self.ctx.logger.info(f"Excel receipt generated successfully: {result_path.name} "
+                                 f"({(time.perf_counter() - started) * 1000:.0f} ms)")
             return result_path
 
         except Exception as e:
@@ -237,120 +476,69 @@ class ReceiptGenerationBridge:
             raise self.ctx.errors.OutputError(error_msg)
 
 
-    def _create_csv_for_java(self, data: Dict) -> Path:
-        """Create CSV file for Java Excel generator"""
-
-        try:
-            csv_path = Path("press_data.csv")  # Java expects this exact name, lol
-
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-
-                # Write header information:
-                writer.writerow(["indicativ_serie", data["set_id"]])
-                writer.writerow(["data_confectionarii", data["sampling_date"]])
-                writer.writerow(["data_incercarii", data["testing_date"]])
-
-                # Process test data:
-                tests = data["tests"]
-                self.ctx.logger.info(f"Processing {len(tests)} test specimens for CSV")
-
-                # Determine expected count based on protocol:
-                protocol_key = self.protocol_mapping.get(data.get("protocol", ""), 'cube_compression')
-
-                if protocol_key == 'cube_compression':
-                    # Cube compression expects exactly 3 specimens
-                    target_count = 3
-                elif protocol_key == 'beam_compression':
-                    # Beam compression expects 6 specimens (2 measurements each)
-                    target_count = 6
-                else:
-                    # Beam flexural expects 3 specimens
-                    target_count = 3
-
-                # Build data arrays with proper handling of partial results:
-                weights = []
-                forces = []
+    def _excel_measurements(self, data: Dict,           # Output of _convert_to_receipt_format
+                            protocol_key: str           # Key of EXCEL_CLASSES
+                           ) -> Tuple[List[float], List[float]]:  # (masses in kg, loads in N), NaN = missing
+        """Typed measurement columns for the Java generators, padded to the sheet's specimen count"""
 
-                # Add actual test data:
-                for test in tests[:target_count]:  # Don't exceed target count
-                    if test["scale_data"] and test["scale_data"] != "0":
-                        weights.append(round(float(test["scale_data"]) / 1000, 3))  # Convert to kg
-                    else:
-                        weights.append("")  # Empty cell for missing scale data
+        target_count = EXCEL_SPECIMEN_COUNTS.get(protocol_key, 3)
+        masses, loads = [], []
 
-                    if test["compression_data"]["kN"] and test["compression_data"]["kN"] != "0.0":
-                        forces.append(round(float(test["compression_data"]["kN"]) * 1000, 0))  # Convert to N
-                    else:
-                        forces.append("")  # Empty cell for missing press data
-
-                # Pad with empty cells if we have fewer specimens than target:
-                while len(weights) < target_count:
-                    weights.append("")  # Empty cell
-                    forces.append("")   # Empty cell
-
-                # Write data rows:
-                writer.writerow(["greutate"] + weights)
-                writer.writerow(["kN"] + forces)
+        for test in data["tests"][:target_count]:  # Don't exceed target count
+            if test["scale_data"] and test["scale_data"] != "0":
+                masses.append(round(float(test["scale_data"]) / 1000, 3))  # g -> kg
+            else:
+                masses.append(math.nan)  # Blank cell for missing scale data
 
-                self.ctx.logger.info(f"Created CSV with {target_count} columns (actual data: {len(tests)})")
-                self.ctx.logger.info(f"Weights: {weights}")
-                self.ctx.logger.info(f"Forces: {forces}")
+            if test["compression_data"]["kN"] and test["compression_data"]["kN"] != "0.0":
+                loads.append(round(float(test["compression_data"]["kN"]) * 1000, 0))  # kN -> N
+            else:
+                loads.append(math.nan)  # Blank cell for missing press data
 
-            self.ctx.logger.info(f"Created CSV file for Java: {csv_path}")
-            return csv_path
+        # Pad with blank cells if fewer specimens than the sheet holds:
+        masses.extend([math.nan] * (target_count - len(masses)))
+        loads.extend([math.nan] * (target_count - len(loads)))
 
-        except Exception as e:
-            error_msg = f"Failed to create CSV file: {str(e)}"
-            self.ctx.logger.error(error_msg)
-            raise self.ctx.errors.OutputError(error_msg)
+        return masses, loads
 
 
     def _start_jvm(self) -> None:
-        """Start JVM for Java Excel generation"""
+        """Make the Excel classes loadable - attach them to the running JVM, or start one with them"""
 
         try:
+            import jpype
+
+            # Check if Java files are compiled:
+            class_files = list(EXCEL_DIR.glob("*.class"))
+            if not class_files:
+                error_msg = f"No compiled .class files found in {EXCEL_DIR}. Please compile Java files manually."
+                self.ctx.logger.error(error_msg)
+                raise self.ctx.errors.ConfigurationError(error_msg)
+
             if jpype.isJVMStarted():
                 self.jvm_started = True
-                self.ctx.logger.info("JVM already started, using existing JVM for Excel generation")
+
+                # Lazy startup leaves the POI classpath out of the unified JVM until the first Excel receipt:
+                ClassLoader = jpype.JClass("java.lang.ClassLoader")
+                if ClassLoader.getSystemClassLoader().getResource(class_files[0].name) is None:
+                    self._attach_excel_classpath()
+                else:
+                    self.ctx.logger.info("JVM already started with the Excel classpath")
 
                 # Verify that Excel classes are available:
                 self._verify_excel_classes()
                 return
 
-            # This should not happen with unified JVM startup, but handle it gracefully:
-            self.ctx.logger.warning("JVM not started - this should not happen with unified startup")
-
-            # Build classpath for Apache POI and Java classes:
-            receipt_dir = Path(__file__).parent / "receipt_generation" / "excel_generation"
-            lib_dir = receipt_dir / "lib"
-
-            # Find all JAR files:
-            jar_files = list(lib_dir.glob("*.jar"))
-
-            # Build classpath: Java class directory + all JARs (use absolute paths):
-            classpath = [str(receipt_dir.absolute())]
-            if jar_files:
-                classpath.extend([str(jar.absolute()) for jar in jar_files])
-            else:
+            # No JVM yet - start one with the Excel classpath:
+            classpath = excel_classpath()
+            if len(classpath) == 1:
                 self.ctx.logger.warning("No JAR files found in lib directory - Excel generation may fail")
 
-            self.ctx.logger.info(f"Excel directory: {receipt_dir.absolute()}")
             self.ctx.logger.info(f"Starting JVM with classpath: {classpath}")
-
-            # Check if Java files are compiled:
-            class_files = list(receipt_dir.glob("*.class"))
-
-            if not class_files:
-                error_msg = f"No compiled .class files found in {receipt_dir}. Please compile Java files manually."
-                self.ctx.logger.error(error_msg)
-                raise self.ctx.errors.ConfigurationError(error_msg)
-
-            self.ctx.logger.info(f"Found .class files: {[f.name for f in class_files]}")
-
             jpype.startJVM(classpath=classpath, convertStrings=False)
             self.jvm_started = True
             self.ctx.logger.info("JVM started successfully for Excel generation")
+            self._verify_excel_classes()
 
         except Exception as e:
             error_msg = f"Failed to start JVM: {str(e)}"
@@ -358,16 +546,41 @@ class ReceiptGenerationBridge:
             raise self.ctx.errors.OutputError(error_msg)
 
 
+    def _attach_excel_classpath(self) -> None:
+        """Load the Excel classes through a child class loader of the running JVM"""
+
+        import jpype
+
+        File = jpype.JClass("java.io.File")
+        URL = jpype.JClass("java.net.URL")
+        URLClassLoader = jpype.JClass("java.net.URLClassLoader")
+        ClassLoader = jpype.JClass("java.lang.ClassLoader")
+
+        classpath = excel_classpath()
+        urls = jpype.JArray(URL)([File(path).toURI().toURL() for path in classpath])
+        self._excel_loader = URLClassLoader(urls, ClassLoader.getSystemClassLoader())
+        self.ctx.logger.info(f"Attached Excel classpath to the running JVM ({len(classpath)} components)")
+
+
     def _verify_excel_classes(self) -> None:
         """Verify that Excel generation classes are available in the current JVM"""
 
         try:
-            # Try to load the main Excel classes to verify they're in the classpath:
-            test_classes = ['CubeCompression', 'BeamCompression', 'BeamFlexural']
+            try:
+                self.excel_class(OOXML_SCHEMA_CLASS)
+            except Exception:
+                self.ctx.logger.error(f"OOXML schema classes missing from {EXCEL_DIR / 'lib'} - add poi-ooxml-full "
+                                      f"(or poi-ooxml-lite) matching poi-ooxml - Excel receipts will fail",
+                                      target="both")
 
-            for class_name in test_classes:
+            # Try to load the main Excel classes to verify they're in the classpath:
+            for class_name in EXCEL_CLASSES.values():
                 try:
-                    jpype.JClass(class_name)
+                    java_class = self.excel_class(class_name)
+                    if not hasattr(java_class, "generateFile"):
+                        self.ctx.logger.warning(f"Excel class {class_name} predates the in-memory API - "
+                                                f"recompile the .java sources in excel_generation/")
+                        continue
                     self.ctx.logger.info(f"Verified Excel class availability: {class_name}")
                 except Exception as e:
                     self.ctx.logger.warning(f"Excel class {class_name} not available: {str(e)}")
@@ -399,8 +612,21 @@ class ReceiptGenerationBridge:
         """Clean shutdown of receipt generation resources"""
 
         try:
-            if self.jvm_started and jpype.isJVMStarted():
-                jpype.shutdownJVM()
+            # Stop workers first - the JVM thread may still be inside POI (warm-up stops after its current workbook):
+            self._warmup_cancelled.set()
+            if self._jvm_executor is not None:
+                self._jvm_executor.shutdown(wait=True)
+                self._jvm_executor = None
+
+            if self._pdf_pool is not None:
+                self._pdf_pool.shutdown(wait=True, cancel_futures=True)
+                self._pdf_pool = None
+
+            if self.jvm_started:
+                import jpype
+
+                if jpype.isJVMStarted():
+                    jpype.shutdownJVM()
                 self.jvm_started = False
                 self.ctx.logger.info("JVM shutdown completed")
 
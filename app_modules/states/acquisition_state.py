@@ -1,10 +1,24 @@
-"""Acquisition state - handles data collection from devices (mock implementation)"""
+"""Acquisition state - handles data collection from devices (serial frames or mock readings)"""
 
 #%% Dependencies:
 
+import re
 import time
 import random
-from typing import Any, Tuple
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from app_modules.acquisition.press_parser import PressFrameParser
+from app_modules.acquisition.scale_stability import ScaleStabilityDetector, STABLE, LIFTED, OCCUPIED
+from app_modules.acquisition.specimen_scheduler import AcquisitionCancelled, SpecimenScheduler
+from app_modules.utils.metrics import timed
+
+#%% Frame Patterns:
+
+SCALE_VALUE_PATTERN = re.compile(r"(\d+\.\d+)\s*(kg|g)?")  # e.g., "7649.0 g" -> ("7649.0", "g")
+
+SIMULATED_SCALE_PERIOD = 0.1  # Seconds between simulated scale samples
+SIMULATED_PRESS_DURATION = 2  # Seconds a simulated press test takes
 
 #%% Acquisition State:
 
@@ -22,6 +36,8 @@ class AcquisitionState:
         self.current_set = None
         self.current_specimen_index = 0
         self.protocol_handler = None
+        self.device_manager = None  # SerialManager; None falls back to simulated readings
+        self.journal = None         # MeasurementJournal; None disables specimen journaling
 
         # Store injected data model classes:
         self.scale_data_class = scale_data_class
@@ -30,6 +46,18 @@ class AcquisitionState:
         self.set_data_class = set_data_class
 
 
+    def set_device_manager(self, device_manager: Any) -> None:
+        """Set serial device manager reference for live readings"""
+
+        self.device_manager = device_manager
+
+
+    def set_journal(self, journal: Any) -> None:
+        """Set measurement journal reference for durable per-specimen records"""
+
+        self.journal = journal
+
+
     def enter(self, ctx: Any,   # Context object
               data: Any = None  # InputData instance from input_state
              ) -> None:
@@ -38,6 +66,18 @@ class AcquisitionState:
         try:
             ctx.logger.info("Entering acquisition state - preparing for testing")
 
+            # Resume a set interrupted by a recovered device error:
+            if isinstance(data, dict) and data.get("resume_set") is not None:
+                self.current_set = data["resume_set"]
+                self.input_data = self.current_set.input_data
+                self.current_specimen_index = len(self.current_set.specimens)
+                self.protocol_handler = self._get_protocol_handler(ctx, self.input_data.protocol)
+                self.protocol_handler.testing_date = self.input_data.testing_date
+
+                ctx.logger.info(f"Resuming {self.input_data.set_id} at specimen {self.current_specimen_index + 1}", 
+                                target="user")
+                return
+
             if not data or not hasattr(data, 'protocol'):
                 raise ctx.errors.StateMachineError("Acquisition state requires valid input data")
 
@@ -50,6 +90,7 @@ class AcquisitionState:
 
             # Initialize protocol-specific handler:
             self.protocol_handler = self._get_protocol_handler(ctx, data.protocol)
+            self.protocol_handler.testing_date = data.testing_date
 
             ctx.logger.info(f"Testing {data.set_id} ready to begin", target="user")
             ctx.logger.info("Please follow the instructions for each specimen", target="user")
@@ -66,27 +107,15 @@ class AcquisitionState:
         try:
             ctx.logger.info("Starting specimen data collection")
 
-            # Process each specimen in the set:
-            while self.current_specimen_index < self.input_data.set_size:
-                specimen_number = self.current_specimen_index + 1
-
-                ctx.logger.info(f"Processing specimen {specimen_number}/{self.input_data.set_size}", 
-                                target="user")
-
-                # Collect data for current specimen using protocol handler:
-                specimen_data = self.protocol_handler.collect_specimen_data(ctx, 
-                                                                            specimen_number, 
-                                                                            self.current_specimen_index)
-
-                # Add specimen to set:
-                self.current_set.add_specimen(ctx, specimen_data)
-
-                # Move to next specimen:
-                self.current_specimen_index += 1
-
-                ctx.logger.info(f"Specimen {specimen_number} data collected successfully")
+            # Scale and press protocols overlap specimens; the others go one specimen at a time:
+            if self.protocol_handler.parallel_stages and ctx.config.devices.concurrent_acquisition:
+                self._collect_concurrently(ctx)
+            else:
+                self._collect_sequentially(ctx)
 
             # All specimens processed:
+            if self.journal is not None:
+                self.journal.sync()
             ctx.logger.info("All specimen data collected successfully")
             ctx.logger.info(f"Testing of set {self.input_data.set_id} completed", target="user")
 
@@ -142,6 +171,57 @@ class AcquisitionState:
         return target_state in allowed_transitions
 
 
+    def _collect_sequentially(self, ctx: Any) -> None:
+        """Collect each remaining specimen completely before starting the next"""
+
+        while self.current_specimen_index < self.input_data.set_size:
+            specimen_number = self.current_specimen_index + 1
+
+            ctx.logger.info(f"Processing specimen {specimen_number}/{self.input_data.set_size}", 
+                            target="user")
+
+            # Collect data for current specimen using protocol handler:
+            with timed(ctx, f"{self.input_data.protocol} specimen"):
+                specimen_data = self.protocol_handler.collect_specimen_data(ctx,
+                                                                            specimen_number,
+                                                                            self.current_specimen_index)
+
+            self._record_specimen(ctx, specimen_data)
+
+
+    def _collect_concurrently(self, ctx: Any) -> None:
+        """Weigh and press on separate workers - any order of scale and press placements works"""
+
+        ctx.logger.info(f"Specimens {self.current_specimen_index + 1}-{self.input_data.set_size}: "
+                        f"weigh each one, then press it (the next can be weighed while one is in the press)",
+                        target="user")
+
+        scheduler = SpecimenScheduler(ctx, self.protocol_handler, self.current_specimen_index,
+                                      self.input_data.set_size)
+
+        # Results arrive in specimen order, so the set and the journal are only touched from this thread:
+        for index, specimen_data in scheduler.run():
+            self._record_specimen(ctx, specimen_data)
+
+
+    def _record_specimen(self, ctx: Any, specimen_data: Any) -> None:
+        """Add the current specimen to the set, journal it and move to the next"""
+
+        specimen_number = self.current_specimen_index + 1
+
+        # Add specimen to set:
+        self.current_set.add_specimen(ctx, specimen_data)
+
+        # Journal it right away so a crash mid-set loses nothing already measured:
+        if self.journal is not None:
+            self.journal.record_specimen(self.input_data.set_id, specimen_number, specimen_data)
+
+        # Move to next specimen:
+        self.current_specimen_index += 1
+
+        ctx.logger.info(f"Specimen {specimen_number} data collected successfully")
+
+
     def _create_set_data(self, ctx: Any,  # Context object
                          input_data: Any  # Validated input data
                         ) -> Any:         # SetData instance
@@ -168,22 +248,26 @@ class AcquisitionState:
             if protocol == "cube_compression_testing":
                 return CubeCompressionHandler(self.scale_data_class, 
                                               self.press_data_class, 
-                                              self.specimen_data_class)
+                                              self.specimen_data_class,
+                                              self.device_manager)
 
             elif protocol == "cube_frost_testing":
                 return CubeFrostHandler(self.scale_data_class, 
                                         self.press_data_class, 
-                                        self.specimen_data_class)
+                                        self.specimen_data_class,
+                                        self.device_manager)
 
             elif protocol == "beam_compression_testing":
                 return BeamCompressionHandler(self.scale_data_class, 
                                               self.press_data_class, 
-                                              self.specimen_data_class)
+                                              self.specimen_data_class,
+                                              self.device_manager)
 
             elif protocol == "beam_flexural_testing":
                 return BeamFlexuralHandler(self.scale_data_class, 
                                            self.press_data_class, 
-                                           self.specimen_data_class)
+                                           self.specimen_data_class,
+                                           self.device_manager)
 
             else:
                 raise ctx.errors.ProtocolError(f"Unknown protocol: {protocol}")
@@ -194,18 +278,138 @@ class AcquisitionState:
             raise ctx.errors.ProtocolError(error_msg)
 
 
-#%% Mock Protocol Handlers:
+#%% Protocol Handlers:
 
 class MockProtocolHandler:
-    """Base class for mock protocol handlers"""
+    """Base class for protocol handlers: reads device frames, or simulates them without a device manager"""
+
+    parallel_stages = False  # True when scale and press stages can run on separate workers (SpecimenScheduler)
 
     def __init__(self, scale_data_class: type,  # ScaleData
                  press_data_class: type,        # PressData
-                 specimen_data_class: type):    # SpecimenData
+                 specimen_data_class: type,     # SpecimenData
+                 device_manager: Any = None):   # SerialManager or None for simulation
 
         self.ScaleData = scale_data_class
         self.PressData = press_data_class
         self.SpecimenData = specimen_data_class
+        self.device_manager = device_manager
+        self.cancelled = threading.Event()  # Set by the scheduler to abandon pending device waits
+        self.last_scale_mass = None         # Last committed mass (kg) - that specimen must leave before the next
+        self.testing_date = None            # Set's testing date (DD.MM.YYYY), compared with the press report date
+
+
+    def read_scale(self, ctx: Any, specimen_number: int) -> Any:
+        """Get scale measurement from the device buffer (or simulation)"""
+
+        with timed(ctx, "scale wait"):
+            if self.device_manager is None:
+                return self.simulate_scale_reading(ctx, specimen_number)
+
+            ctx.logger.info(f"Place specimen {specimen_number} on scale", target="user")
+
+            # Feed the live stream to the stability detector and commit at the first stable window:
+            prompt_time = time.monotonic()
+            detector = self._create_stability_detector(ctx)
+            detector.expect_removal(self.last_scale_mass)
+            removal_requested = False
+
+            while True:
+                mass = self._await_frame(ctx, "scale", self._parse_scale_mass, prompt_time)
+                status = detector.update(mass)
+
+                if status == STABLE:
+                    break
+                if status == OCCUPIED and not removal_requested:
+                    removal_requested = True
+                    ctx.logger.info(f"Remove the previous specimen from the scale before placing "
+                                    f"specimen {specimen_number}", target="user")
+                if status == LIFTED:
+                    ctx.logger.warning(f"Specimen {specimen_number} lifted before the reading was stable - "
+                                       f"place it back on the scale", target="user")
+
+            self.last_scale_mass = detector.committed
+            scale_data = self.ScaleData(mass=detector.committed, mass_decimals=3, mass_unit="kg")
+            ctx.logger.info(f"Scale reading: {scale_data.get_formatted_mass()} "
+                            f"({detector.samples_seen} samples)", target="user")
+
+            return scale_data
+
+
+    def read_press(self, ctx: Any, 
+                   specimen_number: int, 
+                   measurement_type: str = "single") -> Any:
+        """Get press measurement from the device buffer (or simulation)"""
+
+        with timed(ctx, "press wait"):
+            if self.device_manager is None:
+                return self.simulate_press_reading(ctx, specimen_number, measurement_type)
+
+            ctx.logger.info(f"Place specimen {specimen_number} in press ({measurement_type})", target="user")
+
+            # Reports may span several lines - the parser collects fields until one is complete:
+            parser = PressFrameParser(self.PressData)
+            press_data = self._await_frame(ctx, "press", parser.feed_line, raw=True)
+            ctx.logger.info(f"Press reading: {press_data.load:.0f} N ({press_data.strength:.2f} N/mm²)", target="user")
+
+            # The press prints its own date with each report - a mismatch means a wrong date or press clock:
+            press_date = parser.last_test_date
+            if press_date is not None and self.testing_date is not None and \
+               press_date.strftime("%d.%m.%Y") != self.testing_date:
+                ctx.logger.warning(f"Press report dated {press_date:%d.%m.%Y}, set testing date is {self.testing_date} - "
+                                   f"check the testing date and the press clock", target="both")
+
+            return press_data
+
+
+    def _create_stability_detector(self, ctx: Any) -> ScaleStabilityDetector:
+        """Create a detector from devices.scale.stability (defaults when absent)"""
+
+        return ScaleStabilityDetector.from_config(ctx.config.devices.scale.get('stability'))
+
+
+    def _await_frame(self, ctx: Any,                           # Context object
+                     device_name: str,                         # Device name from config
+                     parse: Callable,                          # Frame text -> parsed value or None
+                     prompt_time: Optional[float] = None,      # Ignore frames before this monotonic time
+                     raw: bool = False                         # Pass payload bytes instead of decoded text
+                    ) -> Any:                                  # Parsed value
+        """Wait for the first parsable frame received after the prompt, failing if the device drops"""
+
+        prompt_time = time.monotonic() if prompt_time is None else prompt_time
+        poll_timeout = ctx.config.devices[device_name].timeout
+
+        while True:
+            if self.cancelled.is_set():
+                raise AcquisitionCancelled(f"{device_name} wait cancelled")
+
+            # Frames from before the prompt belong to a previous specimen:
+            frame = self.device_manager.read_frame(device_name, timeout=poll_timeout, newer_than=prompt_time)
+
+            if frame is not None:
+                result = parse(frame.payload if raw else frame.text())
+                if result is not None:
+                    return result
+                ctx.logger.info(f"No {device_name} reading in frame: {frame.text()!r}")
+                continue
+
+            if not self.device_manager.is_connected(device_name):
+                raise ctx.errors.DeviceError(f"{device_name.capitalize()} not connected on "
+                                             f"{ctx.config.devices[device_name].port}")
+
+
+    def _parse_scale_mass(self, text: str) -> Optional[float]:  # Mass in kg or None
+        """Parse a scale line (grams unless the device reports a unit)"""
+
+        match = SCALE_VALUE_PATTERN.search(text)
+        if not match:
+            return None
+
+        mass = float(match.group(1))
+        if (match.group(2) or "g") == "g":
+            mass /= 1000.0
+
+        return mass
 
 
     def simulate_scale_reading(self, ctx: Any, specimen_number: int) -> Any:
@@ -215,10 +419,19 @@ class MockProtocolHandler:
         mass = random.uniform(2.5, 7.8)
         
         ctx.logger.info(f"Place specimen {specimen_number} on scale", target="user")
-        time.sleep(1)  # Simulate reading time
-        ctx.logger.info(f"Scale reading: {mass:.1f} kg", target="user")
+
+        # Simulate a settling stream (overshoot decaying under noise) through the stability detector:
+        detector = self._create_stability_detector(ctx)
+        overshoot = mass * 0.05
+
+        while detector.update(mass + overshoot + random.gauss(0.0, 0.0005)) != STABLE:
+            if self.cancelled.wait(SIMULATED_SCALE_PERIOD):
+                raise AcquisitionCancelled("scale wait cancelled")
+            overshoot *= 0.5
+
+        ctx.logger.info(f"Scale reading: {detector.committed:.1f} kg", target="user")
         
-        return self.ScaleData(mass=mass, mass_decimals=1, mass_unit="kg")
+        return self.ScaleData(mass=detector.committed, mass_decimals=1, mass_unit="kg")
 
 
     def simulate_press_reading(self, ctx: Any, 
@@ -232,44 +445,64 @@ class MockProtocolHandler:
         load = strength * 22500  # Load in N
         
         ctx.logger.info(f"Place specimen {specimen_number} in press ({measurement_type})", target="user")
-        time.sleep(2)  # Simulate test time
+        if self.cancelled.wait(SIMULATED_PRESS_DURATION):  # Simulate test time
+            raise AcquisitionCancelled("press wait cancelled")
         ctx.logger.info(f"Press reading: {load:.0f} N ({strength:.2f} N/mm²)", target="user")
         
         return self.PressData(load=load, strength=strength, load_decimals=0, strength_decimals=2)
 
 
-class CubeCompressionHandler(MockProtocolHandler):
+class ScalePressHandler(MockProtocolHandler):
+    """Base for protocols with one scale and one press measurement per specimen (stages can overlap)"""
+
+    parallel_stages = True
+    measurement_type = "single"  # Press prompt label
+
+    def weigh_specimen(self, ctx: Any, specimen_number: int) -> Any:  # ScaleData
+        """Scale stage"""
+
+        return self.read_scale(ctx, specimen_number)
+
+
+    def press_specimen(self, ctx: Any,        # Context object
+                       specimen_number: int,
+                       scale_data: Any        # ScaleData from weigh_specimen for the same specimen
+                      ) -> Any:               # SpecimenData
+        """Press stage"""
+
+        press_data = self.read_press(ctx, specimen_number, self.measurement_type)
+
+        return self.SpecimenData(scale_data=scale_data, press_data=press_data)
+
+
+class CubeCompressionHandler(ScalePressHandler):
     """Handler for cube compression testing"""
 
+    measurement_type = "compression"
+
     def collect_specimen_data(self, ctx: Any, specimen_number: int, index: int) -> Any:
         """Collect scale and press data for cube compression"""
         
         ctx.logger.info(f"Cube compression test - specimen {specimen_number}")
         
-        # Collect scale data:
-        scale_data = self.simulate_scale_reading(ctx, specimen_number)
-        
-        # Collect press data:
-        press_data = self.simulate_press_reading(ctx, specimen_number, "compression")
-        
-        return self.SpecimenData(scale_data=scale_data, press_data=press_data)
+        # Collect scale data, then press data:
+        scale_data = self.weigh_specimen(ctx, specimen_number)
+        return self.press_specimen(ctx, specimen_number, scale_data)
 
 
-class CubeFrostHandler(MockProtocolHandler):
+class CubeFrostHandler(ScalePressHandler):
     """Handler for cube frost testing"""
 
+    measurement_type = "frost resistance"
+
     def collect_specimen_data(self, ctx: Any, specimen_number: int, index: int) -> Any:
         """Collect scale and press data for cube frost testing"""
         
         ctx.logger.info(f"Cube frost test - specimen {specimen_number} (order matters!)", target="user")
         
-        # Collect scale data:
-        scale_data = self.simulate_scale_reading(ctx, specimen_number)
-        
-        # Collect press data:
-        press_data = self.simulate_press_reading(ctx, specimen_number, "frost resistance")
-        
-        return self.SpecimenData(scale_data=scale_data, press_data=press_data)
+        # Collect scale data, then press data:
+        scale_data = self.weigh_specimen(ctx, specimen_number)
+        return self.press_specimen(ctx, specimen_number, scale_data)
 
 
 class BeamCompressionHandler(MockProtocolHandler):
@@ -283,10 +516,10 @@ class BeamCompressionHandler(MockProtocolHandler):
         # No scale measurement for beam compression
         
         # First press measurement:
-        press_data_1 = self.simulate_press_reading(ctx, specimen_number, "first measurement")
+        press_data_1 = self.read_press(ctx, specimen_number, "first measurement")
         
         # Second press measurement:
-        press_data_2 = self.simulate_press_reading(ctx, specimen_number, "second measurement")
+        press_data_2 = self.read_press(ctx, specimen_number, "second measurement")
         
         # For 1.0.0, store the higher value:
         if press_data_1.strength > press_data_2.strength:
@@ -308,7 +541,7 @@ class BeamFlexuralHandler(MockProtocolHandler):
         # No scale measurement for beam flexural
         
         # Single press measurement:
-        press_data = self.simulate_press_reading(ctx, specimen_number, "flexural")
+        press_data = self.read_press(ctx, specimen_number, "flexural")
         
         return self.SpecimenData(scale_data=None, press_data=press_data)
 
@@ -6,6 +6,9 @@ import time
 from datetime import datetime
 from typing import Any, Tuple, List
 
+from app_modules.models.statistics_engine import statistics_for
+from app_modules.utils.metrics import timed
+
 #%% Dissemination State:
 
 class DisseminationState:
@@ -19,6 +22,8 @@ class DisseminationState:
         self.output_generated = False
         self.input_interface = input_interface
         self.output_interface = output_interface
+        self.registry = None   # RegistryManager; None skips registration
+        self.job_queue = None  # JobQueue; None disseminates inside the state (blocking the next set)
 
 
     def set_input_interface(self, input_interface: Any) -> None:
@@ -33,6 +38,18 @@ class DisseminationState:
         self.output_interface = output_interface
 
 
+    def set_registry(self, registry: Any) -> None:
+        """Set registry reference after construction"""
+
+        self.registry = registry
+
+
+    def set_job_queue(self, job_queue: Any) -> None:
+        """Set background job queue for pipelined dissemination"""
+
+        self.job_queue = job_queue
+
+
     def enter(self, ctx: Any,   # Context object
               data: Any = None  # Complete SetData instance from acquisition_state
              ) -> None:
@@ -63,40 +80,36 @@ class DisseminationState:
 
     def execute(self, ctx: Any        # Context object
                ) -> Tuple[str, Any]:  # (next_state_name, completion_data)
-        """Execute dissemination logic - generate reports and handle output"""
+        """Execute dissemination logic - generate reports and handle output (or queue them when pipelined)"""
 
         try:
-            ctx.logger.info("Starting result processing and output generation")
-
-            # Step 1: Calculate sample age and add to results:
-            self._calculate_sample_age(ctx)
-
-            # Step 2: Process test results and calculate statistics:
-            results_summary = self._process_test_results(ctx)
+            # Pipelined: receipts, registry and printing run in the background while the next set starts:
+            if self.job_queue is not None:
+                set_data = self.set_data
+                self.job_queue.submit(f"Set {set_data.input_data.set_id}",
+                                      lambda: self._disseminate(ctx, set_data),
+                                      payload=set_data)
+                self.output_generated = True
 
-            # Step 3: Generate receipts using output interface:
-            generated_files = self._generate_receipts(ctx)
+                if self.input_interface:
+                    self.input_interface.unlock_interface()
 
-            # Step 4: Update registry (mock for 1.0.0):
-            self._update_registry(ctx, results_summary)
+                return ("idle_state", {"testing_completed": True, "queued": True})
 
-            # Step 5: Handle printing if requested (skip for 1.0.0):
-            if self.set_data.input_data.should_print:
-                ctx.logger.info("Printing skipped in version 1.0.0", target="user")
+            results_summary, generated_files = self._disseminate(ctx, self.set_data)
 
             self.output_generated = True
-            ctx.logger.info("Report generation completed successfully", target="user")
             ctx.logger.info(f"Set {self.set_data.input_data.set_id} processing complete", target="user")
 
-            # Step 6: Unlock interface for next cycle (triggers CLI continue/exit prompt):
+            # Unlock interface for next cycle (triggers CLI continue/exit prompt):
             if self.input_interface:
                 self.input_interface.unlock_interface()
 
             # Return to idle state for next testing cycle:
             return ("idle_state", {"testing_completed": True, "results": results_summary, "files": generated_files})
 
-        except ctx.errors.OutputError as e:
-            # Handle output generation errors:
+        except (ctx.errors.OutputError, ctx.errors.DataStorageError) as e:
+            # Handle output generation and registry errors (e.g., a locked SQLite file):
             ctx.logger.error(f"Output generation failed: {str(e)}", target="both")
             return ("error_state", {"error": e,
                                     "source_state": "dissemination_state",
@@ -113,6 +126,41 @@ class DisseminationState:
                                     "recoverable": False})
 
 
+    def _disseminate(self, ctx: Any,          # Context object
+                     set_data: Any            # Complete SetData instance
+                    ) -> Tuple[dict, List[Any]]:  # (results summary, generated receipt files)
+        """Process one set end to end (runs on the job queue worker when pipelined)"""
+
+        ctx.logger.info(f"Starting result processing and output generation for {set_data.input_data.set_id}")
+
+        # Step 1: Calculate sample age and add to results:
+        self._calculate_sample_age(ctx, set_data)
+
+        # Step 2: Process test results and calculate statistics:
+        results_summary = self._process_test_results(ctx, set_data)
+
+        # Step 3: Generate receipts using output interface:
+        generated_files = self._generate_receipts(ctx, set_data)
+
+        # Step 4: Add the set to the testing registry:
+        self._update_registry(ctx, set_data, results_summary, generated_files)
+
+        # Step 5: Queue printing if requested (the print spooler prints in the background):
+        if set_data.input_data.should_print:
+            self._print_receipts(ctx, set_data, generated_files)
+
+        ctx.logger.info("Report generation completed successfully", target="user")
+
+        # Throughput (sets per hour) from the intervals between completed sets:
+        if ctx.metrics is not None:
+            ctx.metrics.record_event("sets completed")
+            rate = ctx.metrics.rate_per_hour("sets completed")
+            if rate is not None:
+                ctx.logger.info(f"Throughput: {rate:.1f} sets/hour", target="user")
+
+        return results_summary, generated_files
+
+
     def exit(self, ctx: Any) -> None:
         """Exit dissemination state"""
 
@@ -137,33 +185,34 @@ class DisseminationState:
         return target_state in allowed_transitions
 
 
-    def _calculate_sample_age(self, ctx: Any) -> None:
+    def _calculate_sample_age(self, ctx: Any, set_data: Any) -> None:
         """Calculate and log sample age in days"""
 
         try:
-            sample_age = self.set_data.input_data.get_sample_age(ctx)
+            sample_age = set_data.input_data.get_sample_age(ctx)
             ctx.logger.info(f"Sample age calculated: {sample_age} days")
 
         except Exception as e:
             ctx.logger.warning(f"Failed to calculate sample age: {str(e)}")
 
 
-    def _process_test_results(self, ctx: Any  # Context object
-                             ) -> dict:       # Summary of test results
+    def _process_test_results(self, ctx: Any,  # Context object
+                              set_data: Any    # Complete SetData instance
+                             ) -> dict:        # Summary of test results
         """Process test results and calculate statistics"""
 
         try:
             ctx.logger.info("Processing test results...")
 
-            protocol = self.set_data.input_data.protocol
-            specimens = self.set_data.specimens
+            protocol = set_data.input_data.protocol
+            specimens = set_data.specimens
 
             results = {"protocol": protocol,
-                       "set_id": self.set_data.input_data.set_id,
-                       "client": self.set_data.input_data.client,
-                       "concrete_class": self.set_data.input_data.concrete_class,
+                       "set_id": set_data.input_data.set_id,
+                       "client": set_data.input_data.client,
+                       "concrete_class": set_data.input_data.concrete_class,
                        "specimen_count": len(specimens),
-                       "testing_date": self.set_data.input_data.testing_date,
+                       "testing_date": set_data.input_data.testing_date,
                        "specimens": []}
 
             # Process each specimen:
@@ -182,7 +231,7 @@ class DisseminationState:
                 results["specimens"].append(specimen_result)
 
             # Calculate statistics if applicable:
-            self._calculate_statistics(ctx, results, specimens)
+            self._calculate_statistics(ctx, results, set_data)
 
             ctx.logger.info(f"Processed {len(specimens)} specimens for {protocol}")
             return results
@@ -195,32 +244,36 @@ class DisseminationState:
 
     def _calculate_statistics(self, ctx: Any,  # Context object
                               results: dict,   # Results dictionary to update
-                              specimens: list  # List of specimen data
+                              set_data: Any    # Complete SetData instance
                              ) -> None:
         """Calculate statistical summaries of test results"""
 
         try:
-            # Extract strength values for statistical analysis:
-            strengths = []
-            for specimen in specimens:
-                if specimen.press_data and specimen.press_data.strength:
-                    strengths.append(specimen.press_data.strength)
+            statistics = statistics_for(set_data)  # Running statistics kept by SetData - no rescan
 
-            if strengths:
-                # Calculate basic statistics:
-                results["statistics"] = {"min_strength": f"{min(strengths):.2f} N/mm²",
-                                         "max_strength": f"{max(strengths):.2f} N/mm²",
-                                         "avg_strength": f"{sum(strengths)/len(strengths):.2f} N/mm²",
-                                         "strength_count": len(strengths)}
+            strength = statistics.strength
+            if strength.count:
+                results["statistics"] = {"min_strength": f"{strength.min:.2f} N/mm²",
+                                         "max_strength": f"{strength.max:.2f} N/mm²",
+                                         "avg_strength": f"{strength.mean:.2f} N/mm²",
+                                         "std_strength": f"{strength.std:.2f} N/mm²" if strength.std is not None else None,
+                                         "cv_strength": f"{strength.cv:.1f} %" if strength.cv is not None else None,
+                                         "strength_count": strength.count}
 
-                ctx.logger.info(f"Calculated statistics for {len(strengths)} strength measurements")
+                conformity = statistics.conformity
+                if conformity is not None:
+                    results["statistics"]["conformity"] = conformity.describe()
+                    ctx.logger.info(f"{set_data.input_data.concrete_class}: {conformity.describe()}", target="user")
+
+                ctx.logger.info(f"Calculated statistics for {strength.count} strength measurements")
 
         except Exception as e:
             ctx.logger.warning(f"Failed to calculate statistics: {str(e)}")
 
 
-    def _generate_receipts(self, ctx: Any  #  Context object
-                          ) -> List[Any]:  # List of generated receipt files
+    def _generate_receipts(self, ctx: Any,    # Context object
+                           set_data: Any      # Complete SetData instance
+                          ) -> List[Any]:     # List of generated receipt files
         """Generate receipts using output interface"""
 
         try:
@@ -229,7 +282,8 @@ class DisseminationState:
                 return []
 
             ctx.logger.info("Generating receipts using output interface...")
-            generated_files = self.output_interface.generate_receipts(self.set_data)
+            with timed(ctx, "receipt generation"):
+                generated_files = self.output_interface.generate_receipts(set_data)
 
             ctx.logger.info(f"Successfully generated {len(generated_files)} receipt files", target="user")
             for file_path in generated_files:
@@ -242,4 +296,41 @@ class DisseminationState:
             ctx.logger.error(error_msg)
             raise ctx.errors.OutputError(error_msg)
 
+
+    def _update_registry(self, ctx: Any,              # Context object
+                         set_data: Any,               # Complete SetData instance
+                         results_summary: dict,       # Summary from _process_test_results
+                         generated_files: List[Any]   # Receipt files for this set
+                        ) -> None:
+        """Register the completed set (one transaction per set)"""
+
+        try:
+            if not self.registry:
+                ctx.logger.warning("No registry available - skipping registration")
+                return
+
+            with timed(ctx, "registry write"):
+                row_id = self.registry.add_set(set_data, generated_files)
+            results_summary["registry_id"] = row_id
+
+            ctx.logger.info(f"Set {results_summary['set_id']} added to registry", target="user")
+
+        except Exception as e:
+            error_msg = f"Failed to update registry: {str(e)}"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.DataStorageError(error_msg)
+
+
+    def _print_receipts(self, ctx: Any,              # Context object
+                        set_data: Any,               # Complete SetData instance
+                        generated_files: List[Any]   # Receipt files for this set
+                       ) -> None:
+        """Hand the receipts to the printer spool (never waits for the printer)"""
+
+        if not self.output_interface:
+            ctx.logger.warning("No output interface available - skipping printing")
+            return
+
+        self.output_interface.print_receipts(set_data, generated_files)
+
 #%%
\ No newline at end of file
@@ -2,7 +2,6 @@
 
 #%% Dependencies:
 
-import time
 from typing import Any, Tuple
 
 #%% Error State:
@@ -16,6 +15,13 @@ class ErrorState:
         self.state_name = "error_state"
         self.error_info = None
         self.recovery_attempted = False
+        self.device_manager = None  # SerialManager; None when devices are simulated
+
+
+    def set_device_manager(self, device_manager: Any) -> None:
+        """Set serial device manager reference for device recovery"""
+
+        self.device_manager = device_manager
 
 
     def enter(self, ctx: Any,   # Context object
@@ -177,26 +183,37 @@ class ErrorState:
         try:
             ctx.logger.info("Attempting device recovery...", target="user")
 
-            # Simulate device reconnection attempt:
-            time.sleep(2)  # Give devices time to reconnect
-
             if "scale" in error_msg.lower():
-                ctx.logger.info("Verificați conexiunea cântarului și încercați din nou", target="user")
-                # For 1.0.0, assume scale recovers automatically:
-                ctx.logger.info("Cântarul a fost reconectat", target="user")
-                return {"success": True,
-                        "next_state": source_state,  # Return to source state
-                        "data": {"device_recovered": True}}
-
+                device_name = "scale"
+                check_message = "Verificați conexiunea cântarului și încercați din nou"
+                recovered_message = "Cântarul a fost reconectat"
             elif "press" in error_msg.lower():
-                ctx.logger.info("Verificați conexiunea presei și încercați din nou", target="user")
-                # For 1.0.0, assume press recovers automatically:
-                ctx.logger.info("Presa a fost reconectată", target="user")
+                device_name = "press"
+                check_message = "Verificați conexiunea presei și încercați din nou"
+                recovered_message = "Presa a fost reconectată"
+            else:
+                return {"success": False, "reason": "Unknown device error"}
+
+            ctx.logger.info(check_message, target="user")
+
+            # Block until the detector/reader reopens the port (returns immediately if already back):
+            if self.device_manager is not None:
+                recovery_timeout = ctx.config.devices.get('recovery_timeout')
+                if not self.device_manager.wait_for_device(device_name, timeout=recovery_timeout):
+                    return {"success": False, "reason": f"{device_name} not reconnected within {recovery_timeout}s"}
+
+            ctx.logger.info(recovered_message, target="user")
+
+            # Continue the interrupted set where it stopped:
+            partial_data = self.error_info.get("partial_data")
+            if source_state == "acquisition_state" and partial_data is not None:
                 return {"success": True,
-                        "next_state": source_state,  # Return to source state
-                        "data": {"device_recovered": True}}
+                        "next_state": "acquisition_state",
+                        "data": {"resume_set": partial_data, "device_recovered": True}}
 
-            return {"success": False, "reason": "Unknown device error"}
+            return {"success": True,
+                    "next_state": "idle_state",
+                    "data": {"device_recovered": True}}
 
         except Exception as e:
             return {"success": False, "reason": f"Device recovery failed: {str(e)}"}
@@ -10,13 +10,15 @@ from typing import Any, Tuple
 class IdleState:
     """This is the default state when application starts or after testing completes"""
 
+    WAKEUP_TIMEOUT = 1.0  # Upper bound (seconds) on a single blocking wait for a user trigger
+
     def __init__(self, input_interface: Any = None):
         """Initialize idle state with optional input interface reference"""
 
         self.state_name = "idle_state"
         self.waiting_for_input = False
         self.input_interface = input_interface
-        self._queued_data = None  # Store GUI data that was submitted
+        self.job_queue = None  # JobQueue whose failed background sets are reported from here
 
 
     def set_input_interface(self, input_interface: Any) -> None:
@@ -25,6 +27,12 @@ class IdleState:
         self.input_interface = input_interface
 
 
+    def set_job_queue(self, job_queue: Any) -> None:
+        """Set background job queue so failed sets reach the error state"""
+
+        self.job_queue = job_queue
+
+
     def enter(self, ctx: Any, data: Any = None) -> None:
         """Enter idle state - system is ready for user interaction"""
 
@@ -35,7 +43,11 @@ class IdleState:
             if data:
                 # If coming from dissemination state, testing completed successfully:
                 if isinstance(data, dict) and data.get("testing_completed"):
-                    ctx.logger.info("Testing cycle completed successfully", target="user")
+                    if data.get("queued"):
+                        ctx.logger.info("Testing completed - receipts are being generated in the background", 
+                                        target="user")
+                    else:
+                        ctx.logger.info("Testing cycle completed successfully", target="user")
                     ctx.logger.info("Ready for next testing cycle", target="user")
                 # If coming from error state, show recovery message:
                 elif isinstance(data, dict) and data.get("recovered_from_error"):
@@ -56,31 +68,35 @@ class IdleState:
 
     def execute(self, ctx: Any        # Context object
                ) -> Tuple[str, Any]:  # (next_state_name, data_for_next_state)
-        """Execute idle state logic - wait for user to trigger input collection"""
+        """Execute idle state logic - block until the user triggers input collection or exits"""
 
         try:
-            # Check if input interface has work to do rather than blocking indefinitely:
+            # Sleep on the input strategy's wakeup events instead of polling:
             while self.waiting_for_input:
+                # A set that failed in the background is handled before the next one starts:
+                failure = self.job_queue.take_failure() if self.job_queue is not None else None
+                if failure is not None:
+                    self.waiting_for_input = False
+                    return ("error_state", {"error": failure.error,
+                                            "source_state": "dissemination_state",
+                                            "set_data": failure.payload,
+                                            "recoverable": isinstance(failure.error, (ctx.errors.OutputError,
+                                                                                      ctx.errors.DataStorageError))})
+
                 try:
-                    # Check for user input trigger (this depends on input method):
-                    trigger_result = self._check_for_user_trigger(ctx)
+                    trigger_result, trigger_data = self._wait_for_user_trigger(ctx)
 
                     if trigger_result == "start_testing":
                         ctx.logger.info("User initiated testing workflow")
                         self.waiting_for_input = False
-                        # Pass any queued data to input state:
-                        data_to_pass = getattr(self, '_queued_data', None)
-                        self._queued_data = None  # Clear queued data
-                        return ("input_state", data_to_pass)
+                        # Pass any submitted data to input state:
+                        return ("input_state", trigger_data)
                     elif trigger_result == "exit_application":
                         # User wants to exit (GUI closed or CLI exit choice):
                         ctx.logger.info("User requested application exit")
                         self.waiting_for_input = False
                         return ("stop", None)
-                    # If trigger_result == "wait", continue waiting
-
-                    # Brief sleep to prevent busy waiting:
-                    time.sleep(0.1)
+                    # If trigger_result == "wait", the wakeup timed out - wait again
 
                 except KeyboardInterrupt:
                     # Handle Ctrl+C gracefully:
@@ -122,59 +138,21 @@ class IdleState:
         return target_state in allowed_transitions
 
 
-    def _check_for_user_trigger(self, ctx: Any) -> str:  # "start_testing", "exit_application", or "wait"
-        """Check if user has triggered the start of testing workflow or wants to exit"""
+    def _wait_for_user_trigger(self, ctx: Any        # Context object
+                              ) -> Tuple[str, Any]:  # ("start_testing" | "exit_application" | "wait", data)
+        """Block on the input strategy until the user submits data, closes the GUI or ends the CLI session"""
 
         try:
-            # Get input method from config:
-            input_method = ctx.config.input.method
-
-            if input_method == "gui":
-                # Check if GUI is still running and if data was submitted:
-                if self.input_interface and hasattr(self.input_interface, 'strategy'):
-                    strategy = self.input_interface.strategy
-                    if hasattr(strategy, 'app_instance') and strategy.app_instance:
-                        try:
-                            is_running = strategy.app_instance.isRunning()
-                            if not is_running:
-                                ctx.logger.info("GUI was closed by user")
-                                return "exit_application"  # User closed GUI - exit application
-                        except Exception:
-                            # If we can't check GUI status, assume it's still running:
-                            pass
-
-                    # Check if user has submitted data (check the queue):
-                    if hasattr(strategy, 'data_queue') and not strategy.data_queue.empty():
-                        # Get the submitted data from queue:
-                        try:
-                            submitted_data = strategy.data_queue.get_nowait()
-                            # Store the data to pass to input state:
-                            self._queued_data = submitted_data
-                            return "start_testing"  # User submitted data, start testing
-                        except:
-                            pass  # Queue empty, continue waiting
-
-                # GUI is running but no data submitted yet, keep waiting:
-                return "wait"
-
-            elif input_method == "cli":
-                # For CLI: Check if CLI session is still active:
-                if self.input_interface and hasattr(self.input_interface, 'strategy'):
-                    strategy = self.input_interface.strategy
-                    if hasattr(strategy, 'is_session_active'):
-                        is_active = strategy.is_session_active()
-                        if not is_active:
-                            ctx.logger.info("User chose to exit application")
-                            return "exit_application"  # User chose to exit
-                # CLI session is active, ready for input:
-                return "start_testing"
-
-            else:
-                ctx.logger.warning(f"Unknown input method: {input_method}")
-                return "exit_application"
+            if not self.input_interface:
+                ctx.logger.warning("No input interface available - exiting application")
+                return ("exit_application", None)
+
+            # Bounded wait keeps Ctrl+C and stop() responsive; no Java calls happen while blocked:
+            return self.input_interface.wait_for_trigger(timeout=self.WAKEUP_TIMEOUT)
 
         except Exception as e:
-            ctx.logger.warning(f"Error checking user trigger: {str(e)}")
-            return "wait"  # Default to wait on error
+            ctx.logger.warning(f"Error waiting for user trigger: {str(e)}")
+            time.sleep(self.WAKEUP_TIMEOUT)  # Back off so a failing strategy can't spin the CPU
+            return ("wait", None)  # Default to wait on error
 
 #%%
\ No newline at end of file
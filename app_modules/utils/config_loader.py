@@ -88,6 +88,61 @@ def _validate_logging(config: Box, ctx: Any) -> None:
         ctx.logger.error(error_msg)
         raise ctx.errors.ConfigurationError(error_msg)
 
+    # Optional pipeline settings:
+    for flag_key, default in (('asynchronous', True), ('json_format', False)):
+        if flag_key in config.logging:
+            if not isinstance(config.logging[flag_key], bool):
+                error_msg = f"logging.{flag_key} must be a boolean value (true/false)"
+                ctx.logger.error(error_msg)
+                raise ctx.errors.ConfigurationError(error_msg)
+        else:
+            config.logging[flag_key] = default
+
+    queue_size = config.logging.setdefault('queue_size', 10000)
+    if isinstance(queue_size, bool) or not isinstance(queue_size, int) or queue_size <= 0:
+        error_msg = "logging.queue_size must be a positive integer"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    frame_interval = config.logging.setdefault('gui_frame_interval', 1 / 60)
+    if isinstance(frame_interval, bool) or not isinstance(frame_interval, (int, float)) or frame_interval <= 0:
+        error_msg = "logging.gui_frame_interval must be a positive number of seconds"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    # Optional rotation settings:
+    rotation = config.logging.get('rotation', None) or {}
+
+    for flag_key, default in (('daily', True), ('compress', True)):
+        if not isinstance(rotation.setdefault(flag_key, default), bool):
+            error_msg = f"logging.rotation.{flag_key} must be a boolean value (true/false)"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
+    max_size_mb = rotation.setdefault('max_size_mb', 10)
+    if isinstance(max_size_mb, bool) or not isinstance(max_size_mb, (int, float)) or max_size_mb < 0:
+        error_msg = "logging.rotation.max_size_mb must be a non-negative number (0 disables size rotation)"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    backup_count = rotation.setdefault('backup_count', 14)
+    if isinstance(backup_count, bool) or not isinstance(backup_count, int) or backup_count < 0:
+        error_msg = "logging.rotation.backup_count must be a non-negative integer (0 keeps every segment)"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    config.logging.rotation = rotation
+
+
+def _validate_optional_paths(data_config: Box, ctx: Any) -> None:
+    """_validate_data_storage() helper: validate optional data storage paths if present"""
+
+    for path_key in ['journal_dir']:
+        if path_key in data_config and not isinstance(data_config[path_key], Path):
+            error_msg = f"data_storage.{path_key} must be a valid path"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
 
 def _validate_data_storage(config: Box, ctx: Any) -> None:
     """Validate data storage configuration section"""
@@ -125,6 +180,16 @@ def _validate_data_storage(config: Box, ctx: Any) -> None:
             ctx.logger.error(error_msg)
             raise ctx.errors.ConfigurationError(error_msg)
 
+    _validate_optional_paths(data_config, ctx)
+
+    # Validate optional receipt cache limits:
+    for limit_key in ('max_size_mb', 'max_age_days'):
+        limit = (data_config.get('receipt_cache', None) or {}).get(limit_key, None)
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, (int, float)) or limit <= 0):
+            error_msg = f"data_storage.receipt_cache.{limit_key} must be a positive number"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
 
 def _validate_device_config(device_config: Dict[str, Any], device_name: str, ctx: Any) -> None:
     """Validate individual device configuration"""
@@ -166,6 +231,47 @@ def _validate_device_config(device_config: Dict[str, Any], device_name: str, ctx
             ctx.logger.error(error_msg)
             raise ctx.errors.ConfigurationError(error_msg)
 
+    # Validate USB identifiers used for hot-plug matching if present (e.g., vid: 0x2341):
+    for id_key in ['vid', 'pid']:
+        if id_key in device_config:
+            if not isinstance(device_config[id_key], int) or not 0 <= device_config[id_key] <= 0xFFFF:
+                error_msg = f"devices.{device_name}.{id_key} must be a 16-bit integer"
+                ctx.logger.error(error_msg)
+                raise ctx.errors.ConfigurationError(error_msg)
+
+    # Validate scale stability thresholds if present:
+    if 'stability' in device_config:
+        stability_config = device_config['stability']
+        if not isinstance(stability_config, dict):
+            error_msg = f"devices.{device_name}.stability must be a mapping"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
+        if 'window_size' in stability_config:
+            if not isinstance(stability_config['window_size'], int) or stability_config['window_size'] <= 0:
+                error_msg = f"devices.{device_name}.stability.window_size must be a positive integer"
+                ctx.logger.error(error_msg)
+                raise ctx.errors.ConfigurationError(error_msg)
+
+        for threshold_key in ['max_std', 'max_drift', 'min_load', 'min_change']:
+            if threshold_key in stability_config:
+                if not isinstance(stability_config[threshold_key], (int, float)) or stability_config[threshold_key] < 0:
+                    error_msg = f"devices.{device_name}.stability.{threshold_key} must be a non-negative number"
+                    ctx.logger.error(error_msg)
+                    raise ctx.errors.ConfigurationError(error_msg)
+
+    if ('vid' in device_config) != ('pid' in device_config):
+        error_msg = f"devices.{device_name}.vid and devices.{device_name}.pid must be specified together"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    # Validate buffer_size for the background reader if present:
+    if 'buffer_size' in device_config:
+        if not isinstance(device_config['buffer_size'], int) or device_config['buffer_size'] <= 0:
+            error_msg = f"devices.{device_name}.buffer_size must be a positive integer"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
 
 def _validate_devices(config: Box, ctx: Any) -> None:
     """Validate devices configuration section"""
@@ -187,6 +293,34 @@ def _validate_devices(config: Box, ctx: Any) -> None:
 
         _validate_device_config(devices_config[device_name], device_name, ctx)
 
+    # Validate simulate flag if present:
+    if 'simulate' in devices_config:
+        if not isinstance(devices_config.simulate, bool):
+            error_msg = "devices.simulate must be a boolean value (true/false)"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+    else:
+        # Default to simulated readings (the serial ports are opened only when simulate is false):
+        devices_config.simulate = True
+
+    # Validate concurrent scale/press acquisition flag if present:
+    if 'concurrent_acquisition' in devices_config:
+        if not isinstance(devices_config.concurrent_acquisition, bool):
+            error_msg = "devices.concurrent_acquisition must be a boolean value (true/false)"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+    else:
+        # Default to overlapping scale and press stages:
+        devices_config.concurrent_acquisition = True
+
+    # Validate hot-plug timings if present:
+    for timing_key in ['scan_interval', 'recovery_timeout']:
+        if timing_key in devices_config:
+            if not isinstance(devices_config[timing_key], (int, float)) or devices_config[timing_key] <= 0:
+                error_msg = f"devices.{timing_key} must be a positive number"
+                ctx.logger.error(error_msg)
+                raise ctx.errors.ConfigurationError(error_msg)
+
 
 def _validate_plugins(config: Box, ctx: Any) -> None:
     """Validate plugins configuration section"""
@@ -209,6 +343,122 @@ def _validate_plugins(config: Box, ctx: Any) -> None:
         raise ctx.errors.ConfigurationError(error_msg)
 
 
+def _validate_output(config: Box, ctx: Any) -> None:
+    """Validate optional output configuration section"""
+
+    if 'output' not in config:
+        config.output = {}
+
+    output_config = config.output
+
+    for flag_key, default in (('concurrent_generation', False), ('lazy_excel_classpath', True),
+                              ('excel_warmup', True), ('pipelined_dissemination', False)):
+        if flag_key in output_config:
+            if not isinstance(output_config[flag_key], bool):
+                error_msg = f"output.{flag_key} must be a boolean value (true/false)"
+                ctx.logger.error(error_msg)
+                raise ctx.errors.ConfigurationError(error_msg)
+        else:
+            output_config[flag_key] = default
+
+    for workers_key in ('pdf_workers', 'batch_workers'):
+        workers = output_config.get(workers_key, None)
+        if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int) or workers <= 0):
+            error_msg = f"output.{workers_key} must be a positive integer"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
+    max_pending = output_config.setdefault('max_pending_sets', 3)
+    if isinstance(max_pending, bool) or not isinstance(max_pending, int) or max_pending <= 0:
+        error_msg = "output.max_pending_sets must be a positive integer"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    budget = output_config.get('excel_warmup_budget_ms', None)
+    if budget is not None and (isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0):
+        error_msg = "output.excel_warmup_budget_ms must be a positive number"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+
+def _validate_printing(config: Box, ctx: Any) -> None:
+    """Validate optional printing configuration section"""
+
+    printing = config.get('printing', None) or {}
+
+    if not isinstance(printing.setdefault('enabled', False), bool):
+        error_msg = "printing.enabled must be a boolean value (true/false)"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    if printing.setdefault('backend', "cups") not in ("cups", "fake"):
+        error_msg = "printing.backend must be one of: cups, fake"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    printer = printing.setdefault('printer', None)
+    if printer is not None and (not isinstance(printer, str) or not printer):
+        error_msg = "printing.printer must be a CUPS destination name (or null for the system default)"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    # Spool and fake printer directories (defaults under data_storage.data_dir):
+    spool_dir = printing.setdefault('spool_dir', config.data_storage.data_dir / "print_spool")
+    fake_output_dir = printing.setdefault('fake_output_dir', Path(spool_dir) / "fake_printer")
+    for dir_key, value in (('spool_dir', spool_dir), ('fake_output_dir', fake_output_dir)):
+        if not isinstance(value, Path):
+            error_msg = f"printing.{dir_key} must be a valid path"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
+    for count_key, default in (('copies', 1), ('batch_size', 10), ('max_attempts', 20)):
+        count = printing.setdefault(count_key, default)
+        if isinstance(count, bool) or not isinstance(count, int) or count <= 0:
+            error_msg = f"printing.{count_key} must be a positive integer"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
+    for seconds_key, default in (('batch_window', 2.0), ('retry_interval', 5.0)):
+        seconds = printing.setdefault(seconds_key, default)
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds < 0:
+            error_msg = f"printing.{seconds_key} must be a non-negative number of seconds"
+            ctx.logger.error(error_msg)
+            raise ctx.errors.ConfigurationError(error_msg)
+
+    config.printing = printing
+
+
+def _validate_metrics(config: Box, ctx: Any) -> None:
+    """Validate optional metrics configuration section"""
+
+    metrics = config.get('metrics', None) or {}
+
+    if not isinstance(metrics.setdefault('enabled', True), bool):
+        error_msg = "metrics.enabled must be a boolean value (true/false)"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    window = metrics.setdefault('window', 512)
+    if isinstance(window, bool) or not isinstance(window, int) or window <= 0:
+        error_msg = "metrics.window must be a positive integer"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    interval = metrics.setdefault('summary_interval', 600)
+    if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval < 0:
+        error_msg = "metrics.summary_interval must be a non-negative number of seconds (0 disables summaries)"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    port = metrics.setdefault('port', None)
+    if port is not None and (isinstance(port, bool) or not isinstance(port, int) or not 0 <= port <= 0xFFFF):
+        error_msg = "metrics.port must be a TCP port number (or null to disable the endpoint)"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+    config.metrics = metrics
+
+
 def _validate_input_method(config: Box, ctx: Any) -> None:
     """Validate input method configuration"""
 
@@ -266,6 +516,9 @@ def _validate_config(config: Box, ctx: Any) -> None:
     _validate_data_storage(config, ctx)
     _validate_devices(config, ctx)
     _validate_plugins(config, ctx)
+    _validate_output(config, ctx)
+    _validate_printing(config, ctx)
+    _validate_metrics(config, ctx)
 
     # Validate input method configuration:
     _validate_input_method(config, ctx)
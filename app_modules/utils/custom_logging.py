@@ -3,12 +3,35 @@
 #%% Dependencies:
 
 import os
+import re
 import sys
+import gzip
+import json
+import time
+import queue
 import shutil
 import logging
+import threading
 import traceback
 from pathlib import Path
-from typing import Any, Optional, Dict
+from datetime import datetime, timedelta
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
+from typing import Any, Callable, Optional, Dict, List, Tuple
+
+#%% Constants:
+
+DEFAULT_QUEUE_SIZE = 10000               # Records buffered between callers and the writer thread
+DEFAULT_GUI_FRAME_INTERVAL = 1 / 60      # Seconds per GUI log batch (one JavaFX pulse)
+BLOCK_TIMEOUT = 0.5                      # Seconds a WARNING+ record waits for queue space before the fallback
+MAX_GUI_BATCH = 200                      # Entries per GUI call; the rest go out in the next frame
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+DATE_FORMAT = '%d.%m.%Y %H:%M:%S'
+
+UserMessage = Tuple[str, str, str]       # (level, message, ISO timestamp)
+
+DEFAULT_MAX_LOG_MB = 10                  # Active log size that triggers a rollover (0 = no size limit)
+DEFAULT_BACKUP_COUNT = 14                # Rolled segments kept next to the active log
+SEGMENT_SUFFIX = "%Y%m%d-%H%M%S"         # <log name>.<suffix>[-n][.gz]
 
 #%% Custom Exception Handler:
 
@@ -36,6 +59,282 @@ class FileExceptionHandler:
             # If logging fails, fall back to original excepthook:
             self._original_excepthook(exc_type, exc_value, exc_traceback)
 
+#%% Formatters:
+
+class TextFormatter(logging.Formatter):
+    """Classic text records; honours info_with_newline's blank line (records are written on another thread)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        return f"\n{text}" if getattr(record, "newline_before", False) else text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log shipping/analysis"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"time": self.formatTime(record, self.datefmt),
+                 "level": record.levelname,
+                 "file": record.filename,
+                 "line": record.lineno,
+                 "thread": record.threadName,
+                 "message": record.getMessage()}
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+#%% Rotation:
+
+def _compress_rotator(source: str, dest: str) -> None:
+    """Move the active log aside (O(1)), then gzip the moved segment"""
+
+    raw_segment = dest[:-len(".gz")]
+    os.replace(source, raw_segment)
+    with open(raw_segment, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(raw_segment)
+
+
+class RotatingLogHandler(BaseRotatingHandler):
+    """Log file rolled over by size and/or at midnight; rolled segments are optionally gzipped and pruned"""
+
+    def __init__(self, filename: Path,                          # Active log file
+                 mode: str = 'a',                               # 'w' truncates the active file
+                 max_bytes: int = DEFAULT_MAX_LOG_MB * 1024 * 1024,
+                 daily: bool = True,                            # Also roll over at midnight
+                 backup_count: int = DEFAULT_BACKUP_COUNT,      # Segments kept (0 = keep all)
+                 compress: bool = True):                        # Gzip rolled segments
+        """Open the active log file"""
+
+        super().__init__(filename, mode, encoding='utf-8', errors='replace')
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.backup_count = backup_count
+        if compress:
+            self.namer = lambda name: f"{name}.gz"
+            self.rotator = _compress_rotator
+
+        # A file last written on an earlier day rolls over with the first record:
+        last_write = os.path.getmtime(self.baseFilename) if os.path.exists(self.baseFilename) else time.time()
+        self.next_rollover = self._next_midnight(last_write) if daily else None
+
+
+    def _next_midnight(self, timestamp: float) -> float:
+        """Start of the day after timestamp"""
+
+        day = datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (day + timedelta(days=1)).timestamp()
+
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Roll over at midnight or once the active file reached max_bytes (checked before each record)"""
+
+        if self.next_rollover is not None and record.created >= self.next_rollover:
+            return True
+
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            return self.stream.tell() >= self.max_bytes
+
+        return False
+
+
+    def doRollover(self) -> None:
+        """Close the active file, move it to a timestamped segment and prune old segments"""
+
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        # Several size rollovers within one second get increasing counters (never a pruned, reusable name):
+        stamp = datetime.now().strftime(SEGMENT_SUFFIX)
+        counters = [counter for (segment_stamp, counter), _ in self._segment_keys() if segment_stamp == stamp]
+        suffix = f"{stamp}-{max(counters) + 1}" if counters else stamp
+        segment = self.rotation_filename(f"{self.baseFilename}.{suffix}")
+
+        if os.path.exists(self.baseFilename):
+            self.rotate(self.baseFilename, segment)
+        self._prune()
+
+        self.stream = self._open()
+        if self.daily:
+            self.next_rollover = self._next_midnight(time.time())
+
+
+    def segments(self) -> List[str]:
+        """Rolled segments of this log, oldest first"""
+
+        return [path for _, path in self._segment_keys()]
+
+
+    def _segment_keys(self) -> List[Tuple[Tuple[str, int], str]]:
+        """((timestamp, counter), path) of every rolled segment, oldest first"""
+
+        directory, name = os.path.split(self.baseFilename)
+        pattern = re.compile(rf"^{re.escape(name)}\.(\d{{8}}-\d{{6}})(?:-(\d+))?(?:\.gz)?$")
+
+        found = []
+        for entry in os.listdir(directory):
+            match = pattern.match(entry)
+            if match:
+                found.append(((match.group(1), int(match.group(2) or 0)), os.path.join(directory, entry)))
+
+        return sorted(found)
+
+
+    def _prune(self) -> None:
+        """Delete the oldest segments beyond backup_count"""
+
+        if self.backup_count <= 0:
+            return
+
+        segments = self.segments()
+        for segment in segments[:-self.backup_count]:
+            try:
+                os.remove(segment)
+            except OSError:
+                pass
+
+#%% Asynchronous Pipeline:
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to the writer thread without touching disk on the caller's thread
+    Backpressure when the queue is full: INFO and below are dropped (and counted), WARNING and above wait
+    up to BLOCK_TIMEOUT and are then written on the caller's thread - they are never lost
+    """
+
+    def __init__(self, log_queue: queue.Queue, fallback_handlers: List[logging.Handler]):
+        super().__init__(log_queue)
+        self.fallback_handlers = fallback_handlers
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue one (already formatted) record under the backpressure rules"""
+
+        if record.levelno >= logging.WARNING:
+            try:
+                self.queue.put(record, timeout=BLOCK_TIMEOUT)
+            except queue.Full:
+                for handler in self.fallback_handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+
+        if self.dropped:
+            self._report_dropped(record)
+
+
+    def _report_dropped(self, template: logging.LogRecord) -> None:
+        """Record how many INFO records were shed since the queue last had room"""
+
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+
+        notice = logging.makeLogRecord({"name": template.name, "levelno": logging.WARNING, "levelname": "WARNING",
+                                        "msg": f"{dropped} log records dropped - logging queue full",
+                                        "pathname": __file__, "filename": os.path.basename(__file__),
+                                        "lineno": 0, "threadName": template.threadName})
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += dropped
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for queue space instead of failing on a full queue"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class UserMessageBatcher:
+    """Collects user-facing messages and delivers them once per GUI frame, off the caller's thread"""
+
+    _STOP = object()
+
+    def __init__(self, deliver: Callable[[List[UserMessage]], None],   # Receives one frame's messages
+                 frame_interval: float,                                 # Seconds per batch
+                 max_pending: int,                                      # Queue bound
+                 on_error: Callable[[str], None]):                      # Reports delivery failures
+        """Start the delivery thread"""
+
+        self._deliver = deliver
+        self.frame_interval = frame_interval
+        self._on_error = on_error
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="gui-log", daemon=True)
+        self._thread.start()
+
+
+    def submit(self, level: str, message: str) -> None:
+        """Queue a message (never blocks on the GUI; same backpressure rules as the file pipeline)"""
+
+        entry = (level, message, datetime.now().isoformat())
+        try:
+            if level in ("WARNING", "ERROR", "CRITICAL"):
+                self._queue.put(entry, timeout=BLOCK_TIMEOUT)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+
+    def _run(self) -> None:
+        """Wait for a message, let the rest of the frame arrive, deliver everything in one call"""
+
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is self._STOP:
+                break
+
+            time.sleep(self.frame_interval)
+            batch = [entry]
+            while len(batch) < MAX_GUI_BATCH:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is self._STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            with self._dropped_lock:
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                batch.append(("WARNING", f"{dropped} messages not shown - log queue full", datetime.now().isoformat()))
+
+            try:
+                self._deliver(batch)
+            except Exception as e:
+                self._on_error(f"User message batch failed: {str(e)}")
+
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Deliver what is queued, then end the thread"""
+
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
 #%% Main Logging Manager:
 
 class Logger:
@@ -50,8 +349,24 @@ class Logger:
         self._error_handler: Optional[FileExceptionHandler] = None
         self._logger: Optional[logging.Logger] = None
 
+        # Output pipeline (synchronous until configure_pipeline is called):
+        self._handlers: List[logging.Handler] = []   # File/console handlers (run by the listener when asynchronous)
+        self._asynchronous = False
+        self._json_format = False
+        self._queue: Optional[queue.Queue] = None
+        self._queue_handler: Optional[BoundedQueueHandler] = None
+        self._listener: Optional[DrainingQueueListener] = None
+        self._user_batcher: Optional[UserMessageBatcher] = None
+
+        # Log file rotation:
+        self._max_bytes = DEFAULT_MAX_LOG_MB * 1024 * 1024
+        self._rotate_daily = True
+        self._backup_count = DEFAULT_BACKUP_COUNT
+        self._compress = True
+
         # User messaging setup:
-        self.user_message_handler = None
+        self.user_message_handler = None   # Called per message on the caller's thread
+        self.user_batch_handler = None     # Called per GUI frame with a list of UserMessage (asynchronous mode)
 
         # Setup initial logging:
         self._first_setup = True
@@ -70,31 +385,45 @@ class Logger:
             self._logger.setLevel(logging.INFO)
             self._logger.propagate = False  # Prevent logs from propagating to the root logger
 
+        # Let the writer thread finish queued records before their handlers go away:
+        self._stop_listener()
+
         # Close and remove any existing handlers:
-        for handler in self._logger.handlers[:]:
+        for handler in self._logger.handlers[:] + self._handlers:
             if isinstance(handler, logging.FileHandler):
                 handler.close()
             self._logger.removeHandler(handler)
 
         # Create formatter for detailed output:
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-                                      datefmt='%d.%m.%Y %H:%M:%S')
+        formatter = TextFormatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+        file_formatter = JsonFormatter(datefmt=DATE_FORMAT) if self._json_format else formatter
 
         mode = 'w' if self._first_setup else 'a'
         self._first_setup = False
 
-        # Add file handler and clear it's contents if it already exists:
-        file_handler = logging.FileHandler(self._path, encoding='utf-8', errors='replace', mode=mode)
-        file_handler.setFormatter(formatter)
+        # Add file handler and clear it's contents if it already exists (later setups append and rotate):
+        file_handler = RotatingLogHandler(self._path, mode=mode, max_bytes=self._max_bytes, daily=self._rotate_daily,
+                                          backup_count=self._backup_count, compress=self._compress)
+        file_handler.setFormatter(file_formatter)
         file_handler.setLevel(logging.INFO)
-        self._logger.addHandler(file_handler)
+        self._handlers = [file_handler]
 
         # Add console handler if enabled:
         if self._console_enabled:
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(formatter)
             console_handler.setLevel(logging.INFO)
-            self._logger.addHandler(console_handler)
+            self._handlers.append(console_handler)
+
+        # Callers either write directly or only enqueue (the same queue survives reconfiguration):
+        if self._asynchronous:
+            self._queue_handler.fallback_handlers = self._handlers
+            self._listener = DrainingQueueListener(self._queue, *self._handlers, respect_handler_level=True)
+            self._listener.start()
+            self._logger.addHandler(self._queue_handler)
+        else:
+            for handler in self._handlers:
+                self._logger.addHandler(handler)
 
         # Install error handler if not already installed:
         if self._error_handler is None:
@@ -105,38 +434,49 @@ class Logger:
 
 
     def rename_logfile(self, logpath: Path) -> None:
-        """Change the log file by creating a new file, copying content, and removing old file"""
+        """Move logging to a new file - an O(1) rename, or appending the short startup log to an existing log"""
 
         if logpath == self._path:
             return  # No change needed
 
         # Make sure all pending log messages are written and handlers are closed:
-        for handler in self._logger.handlers[:]:
+        self._stop_listener()
+        for handler in self._handlers:
             if isinstance(handler, logging.FileHandler):
                 handler.flush()
                 handler.close()
                 self._logger.removeHandler(handler)  # Accumulate console handlers
 
-        # Copy content from old to new if old file exists:
+        # Move content from old to new if old file exists:
         copy_error = None
         deletion_error = None
         if self._path.exists():
             # Ensure directory exists for new log file:
             logpath.parent.mkdir(parents=True, exist_ok=True)
 
-            try:
-                with open(self._path, 'r', encoding='utf-8', errors='replace') as src:
-                    with open(logpath, 'w', encoding='utf-8', errors='replace') as dst:
+            if logpath.exists() and logpath.stat().st_size > 0:
+                # Existing log keeps its history (rotation bounds it) - append this run's startup records:
+                try:
+                    with open(self._path, 'rb') as src, open(logpath, 'ab') as dst:
                         shutil.copyfileobj(src, dst)
-            except Exception as e:
-                # Store error for later logging (can't log now as handlers are closed):
-                copy_error = str(e)
+                except Exception as e:
+                    # Store error for later logging (can't log now as handlers are closed):
+                    copy_error = str(e)
 
-            # Remove old log file:
-            try:
-                os.remove(self._path)
-            except Exception as e:
-                deletion_error = str(e)
+                # Remove old log file:
+                try:
+                    os.remove(self._path)
+                except Exception as e:
+                    deletion_error = str(e)
+
+            else:
+                try:
+                    os.replace(self._path, logpath)    # O(1) on the same filesystem
+                except OSError:
+                    try:
+                        shutil.move(self._path, logpath)  # Different filesystem - copy and delete
+                    except Exception as e:
+                        copy_error = str(e)
 
         # Update log file path:
         self._path = logpath
@@ -173,6 +513,71 @@ class Logger:
         self.info(f"Console output {'enabled' if console_enabled else 'disabled'}")
 
 
+    def set_rotation(self, max_bytes: int = DEFAULT_MAX_LOG_MB * 1024 * 1024,   # Size rollover (0 = off)
+                     daily: bool = True,                                      # Midnight rollover
+                     backup_count: int = DEFAULT_BACKUP_COUNT,                # Segments kept (0 = all)
+                     compress: bool = True                                    # Gzip rolled segments
+                    ) -> None:
+        """Configure log file rotation and retention"""
+
+        settings = (max_bytes, daily, backup_count, compress)
+        if settings == (self._max_bytes, self._rotate_daily, self._backup_count, self._compress):
+            return  # No change needed
+
+        self._max_bytes, self._rotate_daily, self._backup_count, self._compress = settings
+
+        # Reconfigure logger:
+        self._setup_logger()
+
+
+    def configure_pipeline(self, asynchronous: bool = True,                                # Queue + writer thread
+                           queue_size: int = DEFAULT_QUEUE_SIZE,                       # Records buffered
+                           json_format: bool = False,                                  # JSON lines in the log file
+                           gui_frame_interval: float = DEFAULT_GUI_FRAME_INTERVAL     # Seconds per GUI batch
+                          ) -> None:
+        """Choose between direct and queue-backed logging (callers never block on disk or the GUI when asynchronous)"""
+
+        self._json_format = json_format
+        self._asynchronous = asynchronous
+
+        if asynchronous and (self._queue is None or self._queue.maxsize != queue_size):
+            self._stop_listener()
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._queue_handler = BoundedQueueHandler(self._queue, self._handlers)
+
+        # Reconfigure logger:
+        self._setup_logger()
+
+        if asynchronous and self._user_batcher is None:
+            self._user_batcher = UserMessageBatcher(self._deliver_user_batch, gui_frame_interval, queue_size,
+                                                    on_error=self._logger.warning)
+        elif not asynchronous and self._user_batcher is not None:
+            self._user_batcher.stop()
+            self._user_batcher = None
+
+        self.info(f"Logging pipeline: {'asynchronous' if asynchronous else 'synchronous'}, "
+                  f"{'JSON' if json_format else 'text'} records"
+                  f"{f', queue of {queue_size}' if asynchronous else ''}")
+
+
+    def _stop_listener(self) -> None:
+        """Drain the queue into the current handlers and stop the writer thread"""
+
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+    def _deliver_user_batch(self, batch: List[UserMessage]) -> None:
+        """UserMessageBatcher callback - one call per frame, or per message for per-message handlers"""
+
+        if self.user_batch_handler is not None:
+            self.user_batch_handler(batch)
+        elif self.user_message_handler is not None:
+            for level, message, _ in batch:
+                self.user_message_handler(level, message)
+
+
     def _log_with_target(self, level: str, message: str, target: str) -> None:
         """Route log message based on target"""
 
@@ -180,7 +585,10 @@ class Logger:
             log_method = getattr(self._logger, level)
             log_method(message, stacklevel=3)
 
-        if target in ["user", "both"] and self.user_message_handler is not None:
+        if target in ["user", "both"] and self._user_batcher is not None and self.user_batch_handler is not None:
+            self._user_batcher.submit(level.upper(), message)
+
+        elif target in ["user", "both"] and self.user_message_handler is not None:
             try:
                 self.user_message_handler(level.upper(), message)
             except Exception as e:
@@ -198,15 +606,8 @@ class Logger:
     def info_with_newline(self, message: str) -> None:
         """Log an info message with a newline before it (dev-only)"""
 
-        # Add a blank record first:
-        if self._logger and hasattr(self._logger, 'handlers'):
-            for handler in self._logger.handlers:
-                if isinstance(handler, logging.FileHandler):
-                    handler.stream.write('\n')
-                    handler.flush()
-
-        # Log actual message:
-        self._logger.info(message, stacklevel=2)
+        # Blank line is added by the formatter, so it stays in order with queued records:
+        self._logger.info(message, stacklevel=2, extra={"newline_before": True})
 
 
     def warning(self, message: str, target: str = "dev") -> None:
@@ -242,8 +643,14 @@ class Logger:
     def close_handlers(self) -> None:
         """Close all handlers properly"""
 
+        # Flush both pipelines before closing what they write to:
+        if self._user_batcher is not None:
+            self._user_batcher.stop()
+            self._user_batcher = None
+        self._stop_listener()
+
         if self._logger:
-            for handler in self._logger.handlers:
+            for handler in self._logger.handlers + self._handlers:
                 try:
                     handler.close()
                 except:
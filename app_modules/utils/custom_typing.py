@@ -74,9 +74,10 @@ class BatchDataType:
 class Context:
     """Shared context passed through constructors for dependency injection"""
 
-    typing: Any         # Custom typing module for type definitions
-    errors: Any         # Custom_errors module for exception handling  
-    logger: Any         # Configured logger instance for system logging
-    config: Any = None  # Loaded configuration
+    typing: Any          # Custom typing module for type definitions
+    errors: Any          # Custom_errors module for exception handling  
+    logger: Any          # Configured logger instance for system logging
+    config: Any = None   # Loaded configuration
+    metrics: Any = None  # Metrics registry for state and step timings (None disables timing)
 
 #%%
\ No newline at end of file
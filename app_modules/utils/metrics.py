@@ -0,0 +1,232 @@
+"""Runtime metrics - rolling wall/CPU timings for states, transitions and protocol steps, plus event rates"""
+
+#%% Dependencies:
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+#%% Constants:
+
+DEFAULT_WINDOW = 512             # Samples kept per timer for the rolling percentiles
+DEFAULT_SUMMARY_INTERVAL = 600   # Seconds between periodic summaries in the log
+PERCENTILES = (50, 90, 99)
+ENDPOINT_HOST = "127.0.0.1"      # The endpoint is only reachable from this machine
+
+#%% Timer Statistics:
+
+class TimerStats:
+    """Lifetime totals plus a rolling window of recent (wall, CPU) samples for one timer"""
+
+    def __init__(self, window: int):
+
+        self.count = 0
+        self.total_wall = 0.0
+        self.total_cpu = 0.0
+        self.max_wall = 0.0
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=window)
+
+
+    def add(self, wall: float, cpu: float) -> None:
+        """Record one sample"""
+
+        self.count += 1
+        self.total_wall += wall
+        self.total_cpu += cpu
+        self.max_wall = max(self.max_wall, wall)
+        self.samples.append((wall, cpu))
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals and rolling wall-time percentiles (seconds)"""
+
+        walls = sorted(wall for wall, _ in self.samples)
+        snapshot = {"count": self.count,
+                    "total_wall": self.total_wall,
+                    "total_cpu": self.total_cpu,
+                    "max_wall": self.max_wall}
+
+        # Nearest-rank percentiles over the window:
+        for percentile in PERCENTILES:
+            rank = max(1, math.ceil(percentile / 100 * len(walls)))
+            snapshot[f"p{percentile}"] = walls[rank - 1] if walls else 0.0
+
+        return snapshot
+
+#%% Metrics Registry:
+
+class Metrics:
+    """Named timers shared through ctx.metrics; a disabled registry only runs the timed blocks"""
+
+    def __init__(self, enabled: bool = True,
+                 window: int = DEFAULT_WINDOW,                       # Rolling samples per timer
+                 summary_interval: float = DEFAULT_SUMMARY_INTERVAL  # Seconds between periodic summaries (0 = never)
+                ):
+
+        self.enabled = enabled
+        self.window = window
+        self.summary_interval = summary_interval
+        self._timers: Dict[str, TimerStats] = {}
+        self._events: Dict[str, Tuple[int, Deque[float]]] = {}  # Name -> (lifetime count, recent monotonic times)
+        self._lock = threading.Lock()
+        self._last_summary = time.monotonic()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Time the enclosed block under name (recorded even if it raises)"""
+
+        if not self.enabled:
+            yield
+            return
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+
+    def record(self, name: str, wall: float, cpu: float) -> None:
+        """Add one (wall, CPU) sample in seconds"""
+
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = TimerStats(self.window)
+            timer.add(wall, cpu)
+
+
+    def record_event(self, name: str) -> None:
+        """Count one occurrence (e.g., a completed set) for rate reporting"""
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            count, times = self._events.get(name) or (0, deque(maxlen=self.window))
+            times.append(time.monotonic())
+            self._events[name] = (count + 1, times)
+
+
+    def rate_per_hour(self, name: str) -> Optional[float]:  # None until two events were recorded
+        """Steady-state rate over the recent events (intervals between them, not time since startup)"""
+
+        with self._lock:
+            _, times = self._events.get(name) or (0, ())
+            if len(times) < 2 or times[-1] <= times[0]:
+                return None
+            return (len(times) - 1) / (times[-1] - times[0]) * 3600
+
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-timer totals and percentiles in first-recorded order, then event counts and rates"""
+
+        with self._lock:
+            snapshot = {name: timer.snapshot() for name, timer in self._timers.items()}
+            event_counts = {name: count for name, (count, _) in self._events.items()}
+
+        for name, count in event_counts.items():
+            snapshot[name] = {"count": count, "per_hour": self.rate_per_hour(name)}
+        return snapshot
+
+
+    def summary(self) -> str:
+        """Timer table in milliseconds"""
+
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "Metrics: no timings recorded"
+
+        width = max(len(name) for name in snapshot)
+        header = "".join(f"{f'p{p}':>10}" for p in PERCENTILES)
+        lines = [f"Metrics (wall ms, last {self.window} samples per timer):",
+                 f"  {'timer':<{width}}  {'count':>6}{header}{'max':>10}{'total s':>10}{'cpu s':>9}"]
+        for name, stats in snapshot.items():
+            if "per_hour" in stats:
+                rate = "-" if stats["per_hour"] is None else f"{stats['per_hour']:.1f}/hour"
+                lines.append(f"  {name:<{width}}  {stats['count']:>6}  {rate}")
+                continue
+
+            percentiles = "".join(f"{stats[f'p{p}'] * 1000:10.1f}" for p in PERCENTILES)
+            lines.append(f"  {name:<{width}}  {stats['count']:>6}{percentiles}{stats['max_wall'] * 1000:10.1f}"
+                         f"{stats['total_wall']:10.2f}{stats['total_cpu']:9.2f}")
+        return "\n".join(lines)
+
+
+    def report_if_due(self, logger: Any) -> None:
+        """Log the summary once summary_interval has passed since the last one"""
+
+        if not self.enabled or not self.summary_interval:
+            return
+
+        now = time.monotonic()
+        if now - self._last_summary >= self.summary_interval:
+            self._last_summary = now
+            logger.info(self.summary())
+
+
+    def start_endpoint(self, port: int) -> int:  # Bound port (useful with port 0)
+        """Serve the snapshot as JSON on http://127.0.0.1:<port>/metrics from a daemon thread"""
+
+        metrics = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = json.dumps(metrics.snapshot(), indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Keep request lines out of stderr
+
+        self._server = ThreadingHTTPServer((ENDPOINT_HOST, port), MetricsRequestHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-endpoint", daemon=True).start()
+        return self._server.server_address[1]
+
+
+    def close(self) -> None:
+        """Stop the endpoint if it was started"""
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+    def __enter__(self):
+        """Context manager entry"""
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - stops the endpoint"""
+
+        self.close()
+
+#%% Helpers:
+
+def timed(ctx: Any, name: str) -> Any:  # Context manager
+    """ctx.metrics.timed(name), or a no-op when the context carries no metrics"""
+
+    metrics = getattr(ctx, "metrics", None)
+    return metrics.timed(name) if metrics is not None else nullcontext()
+
+#%%
@@ -0,0 +1,55 @@
+"""Startup profiler - wall and CPU time per initialization phase (python main.py --profile-startup)"""
+
+#%% Dependencies:
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+#%% Startup Profiler:
+
+class StartupProfiler:
+    """Records how long each startup phase takes; a disabled profiler only runs the phases"""
+
+    def __init__(self, enabled: bool = False):
+        """Start the clock (call as early as possible in main)"""
+
+        self.enabled = enabled
+        self.phases: List[Tuple[str, float, float]] = []  # (name, wall seconds, CPU seconds)
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one phase (recorded even if it raises)"""
+
+        if not self.enabled:
+            yield
+            return
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - wall, time.process_time() - cpu))
+
+
+    def report(self) -> str:
+        """Phase table with the share of total startup time"""
+
+        total_wall = time.perf_counter() - self._started_wall
+        total_cpu = time.process_time() - self._started_cpu
+        accounted = sum(wall for _, wall, _ in self.phases)
+        width = max([len(name) for name, _, _ in self.phases] + [len("other")])
+
+        lines = ["Startup profile (wall / CPU):"]
+        for name, wall, cpu in self.phases + [("other", total_wall - accounted, 0.0)]:
+            share = wall / total_wall * 100 if total_wall else 0.0
+            lines.append(f"  {name:<{width}}  {wall * 1000:8.1f} ms  {cpu * 1000:8.1f} ms  {share:5.1f}%")
+        lines.append(f"  {'total':<{width}}  {total_wall * 1000:8.1f} ms  {total_cpu * 1000:8.1f} ms")
+        lines.append(f"  modules loaded: {len(sys.modules)}")
+        return "\n".join(lines)
+
+#%%
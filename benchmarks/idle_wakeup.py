@@ -0,0 +1,161 @@
+"""
+Idle state benchmark - submit-to-acquisition latency and idle CPU usage
+Run with: python -m benchmarks.idle_wakeup [--idle-seconds 5] [--rounds 20]
+"""
+
+#%% Dependencies:
+
+import queue
+import argparse
+import tempfile
+import threading
+import statistics
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional, Tuple
+
+from app_modules.utils import custom_typing, custom_errors
+from app_modules.utils.custom_logging import Logger
+from app_modules.states.idle_state import IdleState
+
+#%% Stand-in Input Strategies:
+
+class EventDrivenStrategy:
+    """Mirrors GUIBridge.wait_for_trigger: blocks on the submission queue, no JVM round-trips"""
+
+    def __init__(self):
+        self.data_queue = queue.Queue()
+
+
+    def submit(self, payload: dict) -> None:
+        """Simulate the Java submit callback"""
+
+        self.data_queue.put({'timestamp': time.perf_counter(), 'data': payload})
+
+
+    def wait_for_trigger(self, timeout: Optional[float] = None) -> Tuple[str, Any]:
+        """Block until data is submitted or the timeout expires"""
+
+        try:
+            return ("start_testing", self.data_queue.get(timeout=timeout))
+        except queue.Empty:
+            return ("wait", None)
+
+
+class PollingStrategy(EventDrivenStrategy):
+    """Reproduces the legacy IdleState loop: isRunning() + queue check, then sleep 100 ms"""
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self):
+        super().__init__()
+        self.java_calls = 0
+
+
+    def wait_for_trigger(self, timeout: Optional[float] = None) -> Tuple[str, Any]:
+        """Poll until data is submitted"""
+
+        while True:
+            self.java_calls += 1  # Stands in for app_instance.isRunning()
+            if not self.data_queue.empty():
+                return ("start_testing", self.data_queue.get_nowait())
+            time.sleep(self.POLL_INTERVAL)
+
+
+class InterfaceStub:
+    """Minimal InputInterface surface used by IdleState"""
+
+    def __init__(self, strategy: Any):
+        self.strategy = strategy
+
+
+    def wait_for_trigger(self, timeout: Optional[float] = None) -> Tuple[str, Any]:
+        return self.strategy.wait_for_trigger(timeout)
+
+#%% Measurements:
+
+def build_context(logpath: Path) -> Any:
+    """Create a file-only context like main.py does"""
+
+    logger = Logger(logpath=logpath, console_enabled=False)
+    ctx = custom_typing.Context(typing=custom_typing, errors=custom_errors, logger=logger)
+    ctx.config = SimpleNamespace(input=SimpleNamespace(method="gui"))
+    return ctx
+
+
+def measure_latency(ctx: Any, strategy_factory: Callable, rounds: int) -> List[float]:
+    """Submit after a random delay and time how long IdleState takes to hand over to input_state"""
+
+    latencies = []
+    for i in range(rounds):
+        strategy = strategy_factory()
+        idle_state = IdleState(InterfaceStub(strategy))
+        idle_state.enter(ctx)
+
+        submitted_at = {}
+        def submit():
+            submitted_at['t'] = time.perf_counter()
+            strategy.submit({'set_id': f"bench-{i}"})
+
+        threading.Timer(0.02 + (i % 10) * 0.013, submit).start()
+        next_state, _ = idle_state.execute(ctx)
+        latencies.append(time.perf_counter() - submitted_at['t'])
+
+        if next_state != "input_state":
+            raise RuntimeError(f"Unexpected transition to {next_state}")
+
+    return latencies
+
+
+def measure_idle_cpu(ctx: Any, strategy_factory: Callable, idle_seconds: float) -> float:
+    """CPU seconds consumed per wall-clock second while nothing happens"""
+
+    strategy = strategy_factory()
+    idle_state = IdleState(InterfaceStub(strategy))
+    idle_state.enter(ctx)
+
+    threading.Timer(idle_seconds, strategy.submit, args=({'set_id': "bench-idle"},)).start()
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    idle_state.execute(ctx)
+    cpu_used, wall_used = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    return cpu_used / wall_used
+
+
+def report(name: str, latencies: List[float], cpu_ratio: float) -> None:
+    """Print one result block"""
+
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{name}:")
+    print(f"  submit -> input_state latency: median {statistics.median(ordered) * 1000:.2f} ms, "
+          f"p95 {p95 * 1000:.2f} ms, max {ordered[-1] * 1000:.2f} ms")
+    print(f"  idle CPU: {cpu_ratio * 100:.3f} % of one core")
+
+#%% Entry point:
+
+def main() -> None:
+    """Compare the event-driven idle state with the legacy 100 ms polling loop"""
+
+    parser = argparse.ArgumentParser(description="IdleState wakeup benchmark")
+    parser.add_argument("--idle-seconds", type=float, default=5.0, help="Idle window for the CPU measurement")
+    parser.add_argument("--rounds", type=int, default=20, help="Number of submissions for the latency measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ctx = build_context(Path(tmp_dir) / "benchmark.log")
+
+        for name, factory in (("event-driven", EventDrivenStrategy), ("legacy polling", PollingStrategy)):
+            latencies = measure_latency(ctx, factory, args.rounds)
+            cpu_ratio = measure_idle_cpu(ctx, factory, args.idle_seconds)
+            report(name, latencies, cpu_ratio)
+
+        ctx.logger.close_handlers()
+
+
+if __name__ == "__main__":
+    main()
+
+#%%
@@ -0,0 +1,132 @@
+"""
+Model construction benchmark - validated Pydantic models vs model_construct vs trusted_loading records
+Run with: python -m benchmarks.model_construction [--sets 2000] [--set-size 3] [--repeats 5]
+"""
+
+#%% Dependencies:
+
+import random
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from app_modules.models.input_data import InputData
+from app_modules.models.scale_data import ScaleData
+from app_modules.models.press_data import PressData
+from app_modules.models.specimen_data import SpecimenData
+from app_modules.models.set_data import SetData
+from app_modules.models import trusted_loading
+
+DATA_MODELS = (InputData, ScaleData, PressData, SpecimenData, SetData)
+
+#%% Records:
+
+def build_records(sets: int, set_size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Synthesize what the journal/registry hands back: model_dump() dicts of complete sets"""
+
+    rng = random.Random(seed)
+    records = []
+    for i in range(sets):
+        input_data = {"protocol": "cube_compression_testing", "client": f"Client {i % 25}",
+                      "concrete_class": "C25/30", "sampling_date": f"{rng.randint(1, 28):02d}.04.2025",
+                      "testing_date": f"{rng.randint(1, 28):02d}.05.2025", "project_title": "project title",
+                      "element": "element", "set_id": f"S{i:05d}", "set_size": set_size, "should_print": False,
+                      "output_format": ["PDF"]}
+        specimens = []
+        for _ in range(set_size):
+            load = rng.uniform(400000.0, 1300000.0)
+            specimens.append({"scale_data": {"mass": rng.uniform(2.2, 2.5), "mass_decimals": 3, "mass_unit": "kg"},
+                              "press_data": {"load": load, "strength": load / 22500.0, "load_decimals": 0,
+                                             "strength_decimals": 2, "load_unit": "N", "strength_unit": "N/mm²"}})
+        records.append({"input_data": input_data, "specimens": specimens})
+    return records
+
+#%% Contenders:
+
+def validated(records: List[Dict[str, Any]]) -> List[Any]:
+    """Current replay path: every model validated again"""
+
+    sets = []
+    for record in records:
+        specimens = [SpecimenData(scale_data=ScaleData(**specimen["scale_data"]),
+                                  press_data=PressData(**specimen["press_data"]))
+                     for specimen in record["specimens"]]
+        sets.append(SetData(input_data=InputData(**record["input_data"]), specimens=specimens))
+    return sets
+
+
+def constructed(records: List[Dict[str, Any]]) -> List[Any]:
+    """Pydantic's model_construct all the way down (no validation, but Python-side field handling)"""
+
+    sets = []
+    for record in records:
+        specimens = [SpecimenData.model_construct(scale_data=ScaleData.model_construct(**specimen["scale_data"]),
+                                                  press_data=PressData.model_construct(**specimen["press_data"]))
+                     for specimen in record["specimens"]]
+        sets.append(SetData.model_construct(input_data=InputData.model_construct(**record["input_data"]),
+                                            specimens=specimens))
+    return sets
+
+
+def trusted(records: List[Dict[str, Any]]) -> List[Any]:
+    """trusted_loading records (validated InputData, __slots__ records for the specimens)"""
+
+    return [trusted_loading.SetRecord(InputData(**record["input_data"]),
+                                      [trusted_loading.specimen_record(specimen) for specimen in record["specimens"]])
+            for record in records]
+
+#%% Measurements:
+
+def time_call(function: Callable, records: List[Dict[str, Any]], repeats: int) -> List[float]:
+    """Wall time of repeated calls"""
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(records)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: List[float], objects: int) -> None:
+    """Print one result block"""
+
+    best, median = min(timings), statistics.median(timings)
+    print(f"{name}:")
+    print(f"  median {median * 1000:.1f} ms, best {best * 1000:.1f} ms "
+          f"-> {objects / median:,.0f} objects/s")
+
+#%% Entry point:
+
+def main() -> None:
+    """Compare the three paths on the same records and check they produce the same data"""
+
+    parser = argparse.ArgumentParser(description="Model construction benchmark")
+    parser.add_argument("--sets", type=int, default=2000, help="Sets to rebuild per run")
+    parser.add_argument("--set-size", type=int, default=3, help="Specimens per set")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per contender")
+    args = parser.parse_args()
+
+    records = build_records(args.sets, args.set_size)
+    objects = args.sets * (2 + 3 * args.set_size)  # InputData + SetData, ScaleData + PressData + SpecimenData each
+
+    # All paths must rebuild the same data before timings mean anything:
+    expected = [s.model_dump() for s in validated(records)]
+    if [s.model_dump() for s in constructed(records)] != expected or \
+       [record.to_model(DATA_MODELS).model_dump() for record in trusted(records)] != expected:
+        raise SystemExit("Construction paths disagree")
+
+    print(f"{args.sets} sets x {args.set_size} specimens ({objects:,} model objects per run)\n")
+    validated_timings = time_call(validated, records, args.repeats)
+    constructed_timings = time_call(constructed, records, args.repeats)
+    trusted_timings = time_call(trusted, records, args.repeats)
+    report("Validated models", validated_timings, objects)
+    report("model_construct", constructed_timings, objects)
+    report("Trusted records (trusted_loading)", trusted_timings, objects)
+    print(f"\nRecords vs validated: {statistics.median(validated_timings) / statistics.median(trusted_timings):.1f}x")
+
+if __name__ == "__main__":
+    main()
+
+#%%
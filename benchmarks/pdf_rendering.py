@@ -0,0 +1,179 @@
+"""
+PDF rendering benchmark - per-receipt cost of the legacy ReportLab modules vs the shared pdf_engine
+Run with: python -m benchmarks.pdf_rendering [--receipts 200] [--repeats 5]
+"""
+
+#%% Dependencies:
+
+import io
+import random
+import importlib.util
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+from app_modules.output.receipt_generation.pdf_generation import CubeCompression
+from app_modules.output.receipt_generation.pdf_generation.pdf_engine import FONT_DIR, FONTS, build_document
+
+#%% Corpus:
+
+def build_receipts(count: int, seed: int = 11) -> List[Dict]:
+    """Synthetic cube compression receipts in the bridge's receipt format"""
+
+    rng = random.Random(seed)
+    receipts = []
+    for i in range(count):
+        tests = []
+        for _ in range(3):
+            load_kn = rng.uniform(500.0, 1000.0)
+            tests.append({"scale_data": str(rng.randint(7900, 8300)),
+                          "compression_data": {"kN": f"{load_kn:.1f}", "MPa": f"{load_kn / 22.5:.2f}"}})
+        receipts.append({"client": "Client", "set_id": f"S{i:04d}", "sampling_date": "01.05.2025",
+                         "testing_date": "29.05.2025", "tests": tests})
+    return receipts
+
+#%% Contenders:
+
+def legacy_cube_table(raw_data: Dict, processed_data: Dict) -> Table:
+    """CubeCompression.create_pdf_with_reportlab before pdf_engine: full table and TableStyle rebuilt per receipt"""
+
+    sampling_date, testing_date = raw_data["sampling_date"], raw_data["testing_date"]
+    test_count = len(raw_data["tests"])
+    total_cols = 4 + test_count + 1
+    averages = processed_data["averages"]
+
+    def build_row(label_parts, values):
+        return label_parts + values
+
+    table_data = [["PILOT 4, Model 50 - C4642 Serial Nr. 12010780"] + [""] * (total_cols - 1),
+                  ["Rezultatele încercării:"] + [""] * (total_cols - 1),
+                  ["Indicativ Proba", "", "", ""] + [f"{i+1}" for i in range(test_count)] + ["Media"],
+                  build_row(["Data confecționării", "", "", ""], [sampling_date] * test_count + [sampling_date]),
+                  build_row(["Data încercării", "", "", ""], [testing_date] * test_count + [testing_date]),
+                  build_row(["Dimensiunile cubului", "", "", "x [mm]"], ["150"] * test_count + ["150"]),
+                  build_row(["", "", "", "y [mm]"], ["150"] * test_count + ["150"]),
+                  build_row(["", "", "", "z [mm]"], ["150"] * test_count + ["150"]),
+                  build_row(["Suprafața de compresiune [mm²]", "", "", ""], ["22500"] * test_count + ["22500"]),
+                  build_row(["Greutatea cubului [Kg]", "", "", ""],
+                            [str(w) for w in processed_data["weights"]] + [str(averages["weight"])]),
+                  build_row(["Densitatea specifică aparentă [Kg/m³]", "", "", ""],
+                            [str(d) for d in processed_data["densities"]] + [str(averages["density"])]),
+                  build_row(["Sarcina de rupere la compresiune [N]", "", "", ""],
+                            [str(f) for f in processed_data["forces"]] + [str(averages["force"])]),
+                  build_row(["Rezistența de rupere la compresiune [N/mm²]", "", "", ""],
+                            [str(p) for p in processed_data["pressures"]] + [str(averages["pressure"])])]
+
+    table = Table(table_data, colWidths=[20*mm] * total_cols, rowHeights=[5.5*mm] * len(table_data))
+    table.setStyle(TableStyle([('FONTSIZE', (0, 0), (-1, -1), 6),
+                               ('FONTNAME', (0, 0), (-1, -1), 'DejaVuSans'),
+                               ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                               ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                               ('GRID', (0, 0), (-1, -1), 0.4, colors.black),
+                               ('SPAN', (0, 0), (total_cols-1, 0)), ('SPAN', (0, 1), (total_cols-1, 1)),
+                               ('SPAN', (0, 2), (3, 2)), ('SPAN', (0, 5), (3, 7)),
+                               ('SPAN', (0, 3), (3, 3)), ('SPAN', (0, 4), (3, 4)), ('SPAN', (0, 8), (3, 8)),
+                               ('SPAN', (0, 9), (3, 9)), ('SPAN', (0, 10), (3, 10)), ('SPAN', (0, 11), (3, 11)),
+                               ('SPAN', (0, 12), (3, 12)),
+                               ('TOPPADDING', (0, 0), (-1, -1), 3), ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+                               ('LEFTPADDING', (0, 0), (-1, -1), 2), ('RIGHTPADDING', (0, 0), (-1, -1), 2)]))
+    return table
+
+
+def legacy_render(receipts: List[Dict]) -> None:
+    """One document per receipt, legacy table construction"""
+
+    for raw_data in receipts:
+        doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4, topMargin=10*mm, bottomMargin=10*mm,
+                                leftMargin=10*mm, rightMargin=10*mm)
+        doc.build([legacy_cube_table(raw_data, CubeCompression.process_test_data(raw_data))])
+
+
+def engine_render(receipts: List[Dict]) -> None:
+    """One document per receipt, cached template filled with the variable cells"""
+
+    for raw_data in receipts:
+        build_document(io.BytesIO(), [CubeCompression.build_receipt_table(raw_data,
+                                                                          CubeCompression.process_test_data(raw_data))])
+
+
+def legacy_tables(receipts: List[Dict]) -> None:
+    """Table construction only (no layout/drawing)"""
+
+    for raw_data in receipts:
+        legacy_cube_table(raw_data, CubeCompression.process_test_data(raw_data))
+
+
+def engine_tables(receipts: List[Dict]) -> None:
+    """Template fill only (no layout/drawing)"""
+
+    for raw_data in receipts:
+        CubeCompression.build_receipt_table(raw_data, CubeCompression.process_test_data(raw_data))
+
+
+def parse_fonts(times: int) -> None:
+    """TTF parsing done at import: legacy modules registered both fonts each (3x), the engine once"""
+
+    for _ in range(times):
+        for filename in FONTS.values():
+            TTFont("Benchmark", str(Path(FONT_DIR) / filename))
+
+#%% Measurements:
+
+def time_call(function: Callable, argument, repeats: int) -> List[float]:
+    """Wall time of repeated calls"""
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: List[float], receipts: int) -> None:
+    """Print one result block"""
+
+    median = statistics.median(timings)
+    print(f"{name}:")
+    if receipts:
+        print(f"  median {median * 1000:.1f} ms -> {median / receipts * 1e6:.0f} µs/receipt, "
+              f"{receipts / median:,.0f} receipts/s")
+    else:
+        print(f"  median {median * 1000:.1f} ms")
+
+#%% Entry point:
+
+def main() -> None:
+    """Compare legacy and engine rendering on the same receipts"""
+
+    parser = argparse.ArgumentParser(description="PDF rendering benchmark")
+    parser.add_argument("--receipts", type=int, default=200, help="Receipts per timed run")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per contender")
+    args = parser.parse_args()
+
+    receipts = build_receipts(args.receipts)
+    engine_render(receipts[:1])  # Warm-up: registers fonts, compiles the template
+
+    accelerated = importlib.util.find_spec("_rl_accel") is not None
+    print(f"Corpus: {args.receipts} cube compression receipts, {args.repeats} runs each "
+          f"(rl_accel {'active' if accelerated else 'not installed'})")
+    report("startup font parsing, legacy (3 modules x 2 TTFs)", time_call(parse_fonts, 3, args.repeats), 0)
+    report("startup font parsing, engine (2 TTFs once)", time_call(parse_fonts, 1, args.repeats), 0)
+    report("table build, legacy", time_call(legacy_tables, receipts, args.repeats), args.receipts)
+    report("table build, engine template", time_call(engine_tables, receipts, args.repeats), args.receipts)
+    report("full render, legacy", time_call(legacy_render, receipts, args.repeats), args.receipts)
+    report("full render, engine", time_call(engine_render, receipts, args.repeats), args.receipts)
+
+
+if __name__ == "__main__":
+    main()
+
+#%%
@@ -0,0 +1,144 @@
+"""
+Press parsing benchmark - incremental PressFrameParser vs the legacy regex-over-JSON filter
+Run with: python -m benchmarks.press_parsing [--lines 5000] [--chunk-size 64] [--corpus recording.txt]
+"""
+
+#%% Dependencies:
+
+import re
+import json
+import random
+import argparse
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from app_modules.models.press_data import PressData
+from app_modules.acquisition.press_parser import PressFrameParser
+
+#%% Corpus:
+
+def build_corpus(lines: int, seed: int = 7) -> bytes:
+    """Synthesize a press session in the printer format the legacy filter expects (CRLF-terminated reports)"""
+
+    rng = random.Random(seed)
+    records = []
+    for i in range(lines):
+        load_kn = rng.uniform(400.0, 1300.0)
+        records.append(f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/25       "
+                       f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}   "
+                       f"Fm [ kN    ]: {load_kn:.2f}   Rm [ MPa   ]: {load_kn / 22.5:.2f}")
+    return ("\r\n".join(records) + "\r\n").encode("utf-8")
+
+
+def load_corpus(path: Optional[Path], lines: int) -> bytes:
+    """Use a recorded capture when given, otherwise a synthetic one"""
+
+    if path is not None:
+        return path.read_bytes()
+    return build_corpus(lines)
+
+
+def split_chunks(corpus: bytes, chunk_size: int) -> List[bytes]:
+    """Cut the stream the way serial reads do - ignoring line boundaries"""
+
+    return [corpus[i:i + chunk_size] for i in range(0, len(corpus), chunk_size)]
+
+#%% Contenders:
+
+def legacy_filter(corpus: bytes) -> List[dict]:
+    """filter_compression_tester_data(): readline() strings in a JSON file, three re.search calls per entry"""
+
+    entries = [line.decode("utf-8", errors="ignore").strip() for line in corpus.split(b"\n")]
+    document = json.dumps({"data": [entry for entry in entries if entry]})  # What read_compression_tester wrote
+
+    filtered_data = []
+    for entry in json.loads(document)["data"]:
+        kN_match = re.search(r"Fm \[ kN    \]:\s*([\d\.]+)", entry)
+        MPa_match = re.search(r"Rm \[ MPa   \]:\s*([\d\.]+)", entry)
+        date_match = re.search(r"(\d{2}/\d{2}/\d{2})\s+\d{2}:\d{2}:\d{2}", entry)
+
+        if kN_match and MPa_match and date_match:
+            date_obj = datetime.strptime(date_match.group(1), "%d/%m/%y")
+            filtered_data.append({"kN": kN_match.group(1),
+                                  "MPa": MPa_match.group(1),
+                                  "try_date": date_obj.strftime("%d.%m.%Y")})
+
+    json.dumps({"data": filtered_data})  # Rewritten in place by the legacy filter
+    return filtered_data
+
+
+def legacy_to_models(corpus: bytes) -> List[PressData]:
+    """Legacy filter followed by the conversion the application needs (strings -> PressData)"""
+
+    return [PressData(load=float(item["kN"]) * 1000.0, strength=float(item["MPa"]),
+                      load_decimals=0, strength_decimals=2)
+            for item in legacy_filter(corpus)]
+
+
+def incremental_parse(chunks: List[bytes]) -> List[PressData]:
+    """Streaming parser fed with raw serial-sized chunks"""
+
+    parser = PressFrameParser(PressData)
+    results = []
+    for chunk in chunks:
+        results.extend(parser.feed(chunk))
+    return results
+
+#%% Measurements:
+
+def time_call(function: Callable, argument, repeats: int) -> List[float]:
+    """Wall time of repeated calls"""
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: List[float], lines: int) -> None:
+    """Print one result block"""
+
+    best, median = min(timings), statistics.median(timings)
+    print(f"{name}:")
+    print(f"  median {median * 1000:.1f} ms, best {best * 1000:.1f} ms "
+          f"-> {lines / median:,.0f} lines/s")
+
+#%% Entry point:
+
+def main() -> None:
+    """Compare both approaches on the same corpus and check they agree"""
+
+    parser = argparse.ArgumentParser(description="Press parsing benchmark")
+    parser.add_argument("--lines", type=int, default=5000, help="Synthetic corpus size (ignored with --corpus)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Bytes per simulated serial read")
+    parser.add_argument("--repeats", type=int, default=7, help="Timed runs per contender")
+    parser.add_argument("--corpus", type=Path, default=None, help="Recorded raw press output to replay")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.lines)
+    chunks = split_chunks(corpus, args.chunk_size)
+    lines = corpus.count(b"\n")
+
+    # Both must extract the same readings before timings mean anything:
+    legacy_results = legacy_to_models(corpus)
+    incremental_results = incremental_parse(chunks)
+    if [(p.load, p.strength) for p in legacy_results] != [(p.load, p.strength) for p in incremental_results]:
+        raise RuntimeError("Parsers disagree on the corpus")
+
+    print(f"Corpus: {lines} lines, {len(corpus)} bytes, {len(chunks)} chunks of {args.chunk_size} B, "
+          f"{len(incremental_results)} reports")
+
+    report("legacy filter (strings only)", time_call(legacy_filter, corpus, args.repeats), lines)
+    report("legacy filter + PressData", time_call(legacy_to_models, corpus, args.repeats), lines)
+    report("incremental parser -> PressData", time_call(incremental_parse, chunks, args.repeats), lines)
+
+
+if __name__ == "__main__":
+    main()
+
+#%%
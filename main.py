@@ -9,9 +9,9 @@ import sys
 import yaml
 import atexit
 import argparse
-import jpype
 from box import Box
 from pathlib import Path
+from contextlib import nullcontext
 from typing import Tuple, Any
 
 #%% Setup functions:
@@ -20,6 +20,9 @@ def initialize_jvm(ctx: Any) -> None:
     """Initialize JVM once with all required classpaths"""
 
     try:
+        # Import here so JPype loads as part of the JVM phase:
+        import jpype
+
         if jpype.isJVMStarted():
             ctx.logger.info("JVM already started")
             return
@@ -69,11 +72,13 @@ def initialize_jvm(ctx: Any) -> None:
             else:
                 ctx.logger.warning(f"CLI JAR not found: {cli_jar}")
 
-        # Excel generation classpath:
+        # Excel generation classpath (attached by the receipt bridge on first use in lazy mode):
         excel_dir = project_root / "app_modules" / "output" / "receipt_generation" / "excel_generation"
         excel_lib_dir = excel_dir / "lib"
 
-        if excel_dir.exists():
+        if ctx.config.output.lazy_excel_classpath:
+            ctx.logger.info("Excel classpath deferred until the first Excel receipt")
+        elif excel_dir.exists():
             classpath.append(str(excel_dir))
             ctx.logger.info(f"Added Excel classes directory: {excel_dir}")
 
@@ -181,17 +186,19 @@ def load_interface_modules(logger: Any) -> Tuple[Any, Any]:
         sys.exit(1)
 
 
-def parse_arguments(default_config_path: Path) -> Path:
+def parse_arguments(default_config_path: Path) -> Tuple[Path, bool]:
     """Parse command line arguments"""
 
     parser = argparse.ArgumentParser(description="Malg-ACTA - Automated Construction Materials Testing")
     parser.add_argument("--config", type=str, 
                         help=f"Path to configuration file (default: {default_config_path})")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print how long imports, config, JVM and GUI launch took before starting")
     args = parser.parse_args()
 
     # Get config path from command line arguments or use default:
     config_path = Path(args.config) if args.config else default_config_path
-    return config_path
+    return config_path, args.profile_startup
 
 
 def initialize_plugin_manager(ctx: Any, PluginManager: type) -> Any:
@@ -256,9 +263,111 @@ def initialize_output_interface(ctx: Any, plugin_manager: Any, OutputInterface:
         raise ctx.errors.ConfigurationError(error_msg)
 
 
+def initialize_measurement_journal(ctx: Any) -> Any:
+    """Open the append-only measurement journal (None when data_storage.journal_dir is not set)"""
+
+    try:
+        journal_dir = ctx.config.data_storage.get('journal_dir')
+        if journal_dir is None:
+            ctx.logger.info("Measurement journal disabled (data_storage.journal_dir not set)")
+            return None
+
+        from app_modules.data_storage.measurement_journal import MeasurementJournal
+
+        return MeasurementJournal(ctx, journal_dir).open()
+
+    except Exception as e:
+        error_msg = f"Failed to initialize measurement journal: {str(e)}"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.DataStorageError(error_msg)
+
+
+def initialize_registry(ctx: Any) -> Any:
+    """Open the testing registry database"""
+
+    try:
+        from app_modules.data_storage.registry_manager import RegistryManager
+
+        return RegistryManager(ctx, ctx.config.data_storage.registry_path).open()
+
+    except Exception as e:
+        error_msg = f"Failed to initialize registry: {str(e)}"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.DataStorageError(error_msg)
+
+
+def initialize_metrics(ctx: Any) -> Any:
+    """Create the timing registry and start the local metrics endpoint if a port is configured"""
+
+    try:
+        from app_modules.utils.metrics import Metrics
+
+        metrics_config = ctx.config.metrics
+        metrics = Metrics(enabled=metrics_config.enabled, window=metrics_config.window,
+                          summary_interval=metrics_config.summary_interval)
+
+        if metrics_config.enabled and metrics_config.port is not None:
+            port = metrics.start_endpoint(metrics_config.port)
+            ctx.logger.info(f"Metrics endpoint listening on http://127.0.0.1:{port}/metrics")
+
+        return metrics
+
+    except Exception as e:
+        error_msg = f"Failed to initialize metrics: {str(e)}"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+
+def initialize_device_manager(ctx: Any, journal: Any = None) -> Any:
+    """Open persistent serial connections for all devices (None when devices are simulated)"""
+
+    try:
+        if ctx.config.devices.simulate:
+            ctx.logger.info("Device simulation enabled - serial ports will not be opened")
+            return None
+
+        ctx.logger.info("Initializing serial device manager...")
+
+        # Import here so simulated setups do not require pyserial:
+        from app_modules.device_connection.serial_manager import SerialManager
+
+        device_manager = SerialManager(ctx, journal=journal)
+        device_manager.start()
+
+        ctx.logger.info("Serial device manager initialized successfully")
+        return device_manager
+
+    except Exception as e:
+        error_msg = f"Failed to initialize device manager: {str(e)}"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.DeviceError(error_msg)
+
+
+def initialize_job_queue(ctx: Any) -> Any:
+    """Background dissemination queue (None when output.pipelined_dissemination is off)"""
+
+    try:
+        if not ctx.config.output.pipelined_dissemination:
+            return None
+
+        from app_modules.core.job_queue import JobQueue
+
+        ctx.logger.info("Pipelined dissemination enabled - receipts are generated in the background")
+        return JobQueue(ctx, max_pending=ctx.config.output.max_pending_sets)
+
+    except Exception as e:
+        error_msg = f"Failed to initialize job queue: {str(e)}"
+        ctx.logger.error(error_msg)
+        raise ctx.errors.ConfigurationError(error_msg)
+
+
 def create_state_instances(ctx: Any, 
                            input_interface: Any,
                            output_interface: Any,
+                           device_manager: Any,
+                           journal: Any,
+                           registry: Any,
+                           job_queue: Any,
                            IdleState: type, 
                            InputState: type, 
                            AcquisitionState: type,
@@ -283,8 +392,14 @@ def create_state_instances(ctx: Any,
 
         # Set interface references in states that need session management:
         idle_state.set_input_interface(input_interface)
+        idle_state.set_job_queue(job_queue)
+        acquisition_state.set_device_manager(device_manager)
+        acquisition_state.set_journal(journal)
+        error_state.set_device_manager(device_manager)
         dissemination_state.set_input_interface(input_interface)
         dissemination_state.set_output_interface(output_interface)
+        dissemination_state.set_registry(registry)
+        dissemination_state.set_job_queue(job_queue)
 
         ctx.logger.info("All state instances created successfully")
         return (idle_state, input_state, acquisition_state, dissemination_state, error_state)
@@ -334,6 +449,12 @@ def main() -> None:
     config_error_logpath = project_root / "logs" / "config_error.log"
     default_config_path = project_root / "configs" / "app_config.yaml"
 
+    # Parse command line arguments and start the startup clock:
+    config_path, profile_startup = parse_arguments(default_config_path)
+
+    from app_modules.utils.startup_profiler import StartupProfiler
+    profiler = StartupProfiler(enabled=profile_startup)
+
     # Initialize logger first so we can log any errors:
     try:
         from app_modules.utils.custom_logging import Logger
@@ -352,17 +473,18 @@ def main() -> None:
         print(f"CRITICAL ERROR: Failed to initialize logger: {str(e)}")
         sys.exit(1)
 
-    # Load dependencies after logger is ready:
-    custom_typing, custom_errors, load_config, PluginManager, StateMachine = load_dependencies(logger)
+    with profiler.phase("imports"):
+        # Load dependencies after logger is ready:
+        custom_typing, custom_errors, load_config, PluginManager, StateMachine = load_dependencies(logger)
 
-    # Load state modules:
-    IdleState, InputState, AcquisitionState, DisseminationState, ErrorState = load_state_modules(logger)
+        # Load state modules:
+        IdleState, InputState, AcquisitionState, DisseminationState, ErrorState = load_state_modules(logger)
 
-    # Load data models:
-    InputData, ScaleData, PressData, SpecimenData, SetData = load_data_models(logger)
+        # Load data models:
+        InputData, ScaleData, PressData, SpecimenData, SetData = load_data_models(logger)
 
-    # Load interface modules:
-    InputInterface, OutputInterface = load_interface_modules(logger)
+        # Load interface modules:
+        InputInterface, OutputInterface = load_interface_modules(logger)
 
     # Create context:
     try:
@@ -372,52 +494,82 @@ def main() -> None:
         logger.critical(f"Failed to create context: {str(e)}")
         sys.exit(1)
 
-    # Parse command line arguments:
-    config_path = parse_arguments(default_config_path)
-
     try:
-        # Rename log file to capture config loading errors:
-        ctx.logger.rename_logfile(config_error_logpath)
-
-        # Load and validate configuration:
-        ctx.config = load_config(config_path, ctx)
-        ctx.logger.info(f"Configuration file {config_path} loaded and validated")
-
-        # Update logger with final configuration:
-        ctx.logger.rename_logfile(ctx.config.logging.path)
-        ctx.logger.set_console_enabled(ctx.config.logging.console_enabled)
-        ctx.logger.info("Logger configured with final settings")
-        ctx.logger.info_with_newline("Initialization complete")
+        with profiler.phase("config"):
+            # Rename log file to capture config loading errors:
+            ctx.logger.rename_logfile(config_error_logpath)
+
+            # Load and validate configuration:
+            ctx.config = load_config(config_path, ctx)
+            ctx.logger.info(f"Configuration file {config_path} loaded and validated")
+
+            # Update logger with final configuration:
+            rotation = ctx.config.logging.rotation
+            ctx.logger.set_rotation(max_bytes=int(rotation.max_size_mb * 1024 * 1024), daily=rotation.daily,
+                                    backup_count=rotation.backup_count, compress=rotation.compress)
+            ctx.logger.rename_logfile(ctx.config.logging.path)
+            ctx.logger.set_console_enabled(ctx.config.logging.console_enabled)
+            ctx.logger.configure_pipeline(asynchronous=ctx.config.logging.asynchronous,
+                                          queue_size=ctx.config.logging.queue_size,
+                                          json_format=ctx.config.logging.json_format,
+                                          gui_frame_interval=ctx.config.logging.gui_frame_interval)
+            ctx.logger.info("Logger configured with final settings")
+
+            # Runtime timings (states, transitions, protocol steps):
+            ctx.metrics = initialize_metrics(ctx)
+            ctx.logger.info_with_newline("Initialization complete")
 
         # Initialize unified JVM for all Java components:
-        initialize_jvm(ctx)
+        with profiler.phase("jvm"):
+            initialize_jvm(ctx)
 
         # Initialize core components:
         ctx.logger.info("Malg-ACTA system initialization starting...")
 
         # Initialize plugin manager:
-        plugin_manager = initialize_plugin_manager(ctx, PluginManager)
+        with profiler.phase("plugin manager"):
+            plugin_manager = initialize_plugin_manager(ctx, PluginManager)
 
-        # Initialize input interface:
-        input_interface = initialize_input_interface(ctx, plugin_manager, InputData, InputInterface)
+        # Initialize input interface (launches the GUI in gui mode):
+        with profiler.phase(f"{ctx.config.input.method} launch"):
+            input_interface = initialize_input_interface(ctx, plugin_manager, InputData, InputInterface)
 
         # Initialize output interface:
-        output_interface = initialize_output_interface(ctx, plugin_manager, OutputInterface)
+        with profiler.phase("output interface"):
+            output_interface = initialize_output_interface(ctx, plugin_manager, OutputInterface)
+
+        with profiler.phase("devices and storage"):
+            # Initialize measurement journal and serial device manager:
+            journal = initialize_measurement_journal(ctx)
+            device_manager = initialize_device_manager(ctx, journal)
 
-        # Create all state instances:
-        idle_state, input_state, acquisition_state, dissemination_state, error_state = create_state_instances(
-            ctx, input_interface, output_interface, IdleState, InputState, AcquisitionState, DisseminationState, ErrorState,
-            InputData, ScaleData, PressData, SpecimenData, SetData)
+            # Initialize testing registry:
+            registry = initialize_registry(ctx)
 
-        # Initialize state machine:
-        state_machine = initialize_state_machine(
-            ctx, idle_state, input_state, acquisition_state, dissemination_state, error_state, StateMachine)
+            # Initialize background dissemination queue:
+            job_queue = initialize_job_queue(ctx)
+
+        with profiler.phase("state machine"):
+            # Create all state instances:
+            idle_state, input_state, acquisition_state, dissemination_state, error_state = create_state_instances(
+                ctx, input_interface, output_interface, device_manager, journal, registry, job_queue, IdleState, InputState, AcquisitionState, DisseminationState, ErrorState,
+                InputData, ScaleData, PressData, SpecimenData, SetData)
+
+            # Initialize state machine:
+            state_machine = initialize_state_machine(
+                ctx, idle_state, input_state, acquisition_state, dissemination_state, error_state, StateMachine)
 
         ctx.logger.info("Malg-ACTA system initialized successfully")
+
+        if profiler.enabled:
+            startup_report = profiler.report()
+            ctx.logger.info(startup_report)
+            print(startup_report)
         ctx.logger.info_with_newline("Starting application...")
 
         # Start the main application:
-        run_application(ctx, state_machine, input_interface, output_interface)
+        run_application(ctx, state_machine, input_interface, output_interface, device_manager, journal, registry,
+                        job_queue)
 
     except custom_errors.ApplicationError as e:
         ctx.logger.exception(f"Malg-ACTA error during startup: {str(e)}")
@@ -428,7 +580,9 @@ def main() -> None:
         sys.exit(1)
 
 
-def run_application(ctx: Any, state_machine: Any, input_interface: Any, output_interface: Any) -> None:
+def run_application(ctx: Any, state_machine: Any, input_interface: Any, output_interface: Any,
+                    device_manager: Any = None, journal: Any = None, registry: Any = None,
+                    job_queue: Any = None) -> None:
     """Run the main application with proper resource management"""
 
     try:
@@ -437,8 +591,10 @@ def run_application(ctx: Any, state_machine: Any, input_interface: Any, output_i
         ctx.logger.info("Sistem automatizat pentru testarea materialelor de construcție", target="user")
         ctx.logger.info("Application ready", target="user")
 
-        # Use context managers for proper cleanup:
-        with state_machine, input_interface, output_interface:
+        # Use context managers for proper cleanup (the job queue drains before outputs and registry close):
+        with ctx.metrics or nullcontext(), registry or nullcontext(), journal or nullcontext(), \
+             device_manager or nullcontext(), state_machine, input_interface, output_interface, \
+             job_queue or nullcontext():
             # Start the state machine:
             state_machine.start()
 
@@ -0,0 +1,92 @@
+"""Shared fixtures - a real Context (logger, errors, config) without devices, JVM or GUI"""
+
+#%% Dependencies:
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from box import Box
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app_modules.device_connection.serial_manager import SerialFrame
+from app_modules.utils import custom_errors, custom_typing
+from app_modules.utils.custom_logging import Logger
+from app_modules.utils.custom_typing import Context
+
+#%% Fakes:
+
+class ScriptedDeviceManager:
+    """Stands in for SerialManager: hands out scripted frames per device, then reports the device as gone"""
+
+    def __init__(self, frames: dict):  # Device name -> list of frame texts in arrival order
+
+        self.frames = {device: list(texts) for device, texts in frames.items()}
+
+
+    def read_frame(self, device: str, timeout: float = None, newer_than: float = None):
+        """Next scripted frame (stamped now, so it is always newer than the prompt)"""
+
+        if not self.frames.get(device):
+            return None
+        now = time.monotonic()
+        return SerialFrame(device, self.frames[device].pop(0).encode(), now, time.time())
+
+
+    def is_connected(self, device: str) -> bool:
+        """Connected while frames remain"""
+
+        return bool(self.frames.get(device))
+
+#%% Builders:
+
+def build_set(set_id: str = "S1",                           # Set identifier
+              loads_kn: tuple = (450.0, 500.0, 475.0),       # One press load per specimen (kN)
+              protocol: str = "cube_compression_testing",
+              testing_date: str = "15.05.2025",
+              client: str = "Client",
+              concrete_class: str = "C25/30"):
+    """Complete SetData with 150 mm cube specimens (strength = load / 22500 mm²)"""
+
+    from app_modules.models.input_data import InputData
+    from app_modules.models.press_data import PressData
+    from app_modules.models.scale_data import ScaleData
+    from app_modules.models.set_data import SetData
+    from app_modules.models.specimen_data import SpecimenData
+
+    input_data = InputData(protocol=protocol, client=client, concrete_class=concrete_class,
+                           sampling_date="17.04.2025", testing_date=testing_date, set_id=set_id,
+                           set_size=len(loads_kn), should_print=False, output_format=["PDF"])
+    set_data = SetData(input_data=input_data)
+    for load in loads_kn:
+        set_data.specimens.append(SpecimenData(scale_data=ScaleData(mass=7.5, mass_decimals=3),
+                                               press_data=PressData(load=load * 1000.0,
+                                                                    strength=load * 1000.0 / 22500.0)))
+    return set_data
+
+#%% Fixtures:
+
+@pytest.fixture
+def user_messages():
+    """(level, message) pairs sent to the user target"""
+
+    return []
+
+
+@pytest.fixture
+def ctx(tmp_path, user_messages):
+    """Context with a real logger writing under tmp_path"""
+
+    logger = Logger(tmp_path / "logs" / "test.log")
+    logger.user_message_handler = lambda level, message: user_messages.append((level, message))
+
+    config = Box({"devices": {"scale": {"port": "/dev/null", "timeout": 0.01,
+                                        "stability": {"window_size": 5, "max_std": 0.002, "max_drift": 0.005,
+                                                      "min_load": 0.1, "min_change": 0.05}},
+                              "press": {"port": "/dev/null", "timeout": 0.01}}})
+
+    return Context(typing=custom_typing, errors=custom_errors, logger=logger, config=config)
+
+#%%
@@ -0,0 +1,107 @@
+"""Device detector - devices without USB ids are found by probing ports for their output"""
+
+#%% Dependencies:
+
+from types import SimpleNamespace
+
+import pytest
+
+from app_modules.device_connection.device_detector import DeviceDetector, PROBE_FRAMES
+from app_modules.device_connection.serial_manager import FRAME_SIGNATURES
+
+#%% Fakes:
+
+class FakeReader:
+    """The SerialPortReader attributes the detector reads"""
+
+    def __init__(self, device_name: str, port: str):
+        self.device_name = device_name
+        self.port = port
+        self.connected = True
+        self.bytes_seen = self.frames_seen = self.frames_recognized = 0
+
+
+class FakeManager:
+    """SerialManager stand-in recording reconnect requests"""
+
+    def __init__(self, readers: dict):
+        self.readers = readers
+        self.requests = []
+
+    def request_reconnect(self, device_name: str, port: str = None):
+        self.requests.append((device_name, port))
+        reader = self.readers[device_name]
+        if port != reader.port:
+            reader.port = port
+            reader.bytes_seen = reader.frames_seen = reader.frames_recognized = 0
+
+def recognize(reader: FakeReader, frames: int) -> None:
+    """Reader received frames matching its device signature"""
+
+    reader.frames_seen = reader.frames_recognized = frames
+
+#%% Fixtures:
+
+@pytest.fixture
+def ports(tmp_path):
+    """Two existing port paths (ACM0, ACM1) as list_ports would report them"""
+
+    paths = [tmp_path / "ttyACM0", tmp_path / "ttyACM1"]
+    for path in paths:
+        path.touch()
+    return [SimpleNamespace(device=str(path), vid=None, pid=None, serial_number=None) for path in paths]
+
+
+@pytest.fixture
+def detector(ctx, ports, monkeypatch):
+    manager = FakeManager({"scale": FakeReader("scale", ports[1].device),
+                           "press": FakeReader("press", ports[0].device)})
+    monkeypatch.setattr("app_modules.device_connection.device_detector.list_ports.comports", lambda: ports)
+    return DeviceDetector(ctx, manager)
+
+#%% Signatures:
+
+@pytest.mark.parametrize("device, payload", [("scale", b"7649.0 g"), ("scale", b"7.649 kg"), ("scale", b"  7649.0"),
+                                             ("press", b"Fm [ kN    ]: 45.32")])
+def test_device_output_matches_its_own_signature_only(device, payload):
+    assert [name for name, signature in FRAME_SIGNATURES.items() if signature.search(payload)] == [device]
+
+#%% Probing:
+
+def test_recognized_devices_stay_on_their_ports(detector, ports):
+    recognize(detector.serial_manager.readers["scale"], 10)
+
+    detector.scan()
+
+    assert detector.serial_manager.readers["scale"].port == ports[1].device
+    assert detector.serial_manager.readers["press"].port == ports[0].device
+
+
+def test_swapped_devices_are_moved_to_each_others_ports(detector, ports):
+    # The scale streams on ACM0 where the press reader listens (wrong baud rate - unrecognizable):
+    press = detector.serial_manager.readers["press"]
+    press.frames_seen = PROBE_FRAMES
+
+    detector.scan()
+
+    assert press.port == ports[1].device
+    assert detector.serial_manager.readers["scale"].port == ports[0].device
+
+    # Stable afterwards - no further moves:
+    recognize(detector.serial_manager.readers["scale"], 5)
+    detector.scan()
+    assert detector.serial_manager.readers["scale"].port == ports[0].device
+    assert press.port == ports[1].device
+
+
+def test_confirmed_device_keeps_its_port_when_another_is_rejected(detector, ports):
+    scale, press = detector.serial_manager.readers["scale"], detector.serial_manager.readers["press"]
+    recognize(press, 3)
+    scale.frames_seen = PROBE_FRAMES
+
+    detector.scan()
+
+    assert press.port == ports[0].device  # Not swapped away from its recognized output
+    assert scale.port == ports[1].device  # Nowhere else to go
+
+#%%
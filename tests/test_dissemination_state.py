@@ -0,0 +1,32 @@
+"""Dissemination state - registry failures are reported as recoverable output errors"""
+
+#%% Dependencies:
+
+import sqlite3
+
+from app_modules.states.dissemination_state import DisseminationState
+
+from conftest import build_set
+
+#%% Fakes:
+
+class LockedRegistry:
+    """RegistryManager stand-in whose database is locked by another writer"""
+
+    def add_set(self, set_data, receipts=None):
+        raise sqlite3.OperationalError("database is locked")
+
+#%% Registry Failures:
+
+def test_transient_registry_failure_is_recoverable(ctx):
+    state = DisseminationState()
+    state.set_registry(LockedRegistry())
+    state.enter(ctx, build_set("S1"))
+
+    next_state, data = state.execute(ctx)
+
+    assert next_state == "error_state"
+    assert isinstance(data["error"], ctx.errors.DataStorageError)
+    assert data["recoverable"] is True
+
+#%%
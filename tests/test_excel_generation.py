@@ -0,0 +1,80 @@
+"""Excel generators - the shipped classes expose the in-memory API the bridge calls, single and combined workbooks"""
+
+#%% Dependencies:
+
+import re
+import zipfile
+
+import pytest
+from box import Box
+
+jpype = pytest.importorskip("jpype")
+
+from app_modules.output.receipt_generation.receipt_generation_bridge import (EXCEL_CLASSES, OOXML_SCHEMA_CLASS,
+                                                                             ReceiptGenerationBridge)
+
+from app_modules.output.receipt_generation.receipt_cache import ReceiptCache
+
+from conftest import build_set
+
+#%% Fixtures:
+
+@pytest.fixture
+def bridge(ctx, tmp_path):
+    """Bridge with the Excel classpath on a JVM (skipped without one)"""
+
+    try:
+        jpype.getDefaultJVMPath()
+    except jpype.JVMNotFoundException:
+        pytest.skip("No JVM available")
+
+    bridge = ReceiptGenerationBridge()
+    bridge.ctx, bridge.config = ctx, Box({"data_storage": {"receipts_dir": tmp_path / "receipts"}})
+    bridge.cache = ReceiptCache(ctx, tmp_path / "receipts")
+    return bridge
+
+
+@pytest.fixture
+def workbooks(bridge):
+    """Bridge that can actually build workbooks (POI needs the OOXML schema JAR in lib/)"""
+
+    try:
+        bridge.excel_class(OOXML_SCHEMA_CLASS)
+    except Exception:
+        pytest.skip("OOXML schema classes (poi-ooxml-full/-lite) are not in excel_generation/lib")
+    return bridge
+
+#%% Generator Classes:
+
+@pytest.mark.parametrize("class_name", sorted(EXCEL_CLASSES.values()))
+def test_generators_provide_in_memory_api(bridge, class_name):
+    for method in ("generateBytes", "generateFile", "addSheet"):
+        assert bridge.excel_supports(class_name, method), f"{class_name}.class lacks {method}"
+
+
+def test_receipt_is_written_to_the_requested_path(workbooks, tmp_path):
+    data = workbooks._convert_to_receipt_format(build_set())
+    target_path = tmp_path / "receipts" / "excel_receipts" / "S1.xlsx"
+
+    assert workbooks._generate_excel_receipt(data, "cube_compression_testing", target_path) == target_path
+    assert target_path.stat().st_size > 0
+    assert not list(target_path.parent.glob(".receipt-*"))  # No temp file left behind
+
+
+def test_batch_combines_sets_into_workbook_parts(workbooks, monkeypatch):
+    monkeypatch.setattr("app_modules.output.receipt_generation.batch_renderer.EXCEL_SHEETS_PER_WORKBOOK", 2)
+    sets = [build_set("S1"), build_set("B1", protocol="beam_compression_testing"), build_set("S2")]
+
+    result = workbooks.render_batch(sets, "Excel", combine=True)
+
+    assert (result.rendered, result.failures) == (3, [])
+    assert [path.name.endswith(suffix) for path, suffix in zip(result.files, ("_part1.xlsx", "_part2.xlsx"))] == [True] * 2
+
+    sheets = []
+    for path in result.files:
+        with zipfile.ZipFile(path) as workbook:
+            sheets.extend(re.findall(r'<sheet name="([^"]+)"', workbook.read("xl/workbook.xml").decode()))
+    assert len(sheets) == 3 and [name for name in sheets if "B1" in name]
+    assert workbooks.render_batch(sets, "Excel", combine=True).cached == 3  # Same sets -> same workbooks
+
+#%%
@@ -0,0 +1,62 @@
+"""Job queue - background failures reach the user and the state machine"""
+
+#%% Dependencies:
+
+import pytest
+
+from app_modules.core.job_queue import JobQueue
+from app_modules.states.idle_state import IdleState
+
+from conftest import build_set
+
+#%% Helpers:
+
+def failing_job():
+    raise OSError("receipts directory is read-only")
+
+#%% Job Queue:
+
+def test_failed_job_is_kept_and_later_jobs_still_run(ctx, user_messages):
+    ran = []
+    with JobQueue(ctx) as job_queue:
+        job_queue.submit("Set S1", failing_job, payload="S1 data")
+        job_queue.submit("Set S2", lambda: ran.append("S2"))
+
+    failure = job_queue.take_failure()
+
+    assert ran == ["S2"]
+    assert (job_queue.completed, job_queue.failed) == (1, 1)
+    assert failure.label == "Set S1"
+    assert isinstance(failure.error, OSError)
+    assert failure.payload == "S1 data"
+    assert job_queue.take_failure() is None
+    assert ("ERROR", "Set S1: failed - receipts directory is read-only") in user_messages
+
+
+def test_submit_after_close_is_refused(ctx):
+    job_queue = JobQueue(ctx)
+    job_queue.close()
+
+    with pytest.raises(ctx.errors.StateMachineError):
+        job_queue.submit("Set S1", lambda: None)
+
+#%% Idle State:
+
+def test_idle_state_hands_background_failure_to_error_state(ctx):
+    set_data = build_set("S1")
+    with JobQueue(ctx) as job_queue:
+        job_queue.submit("Set S1", failing_job, payload=set_data)
+
+    idle_state = IdleState()
+    idle_state.set_job_queue(job_queue)
+    idle_state.enter(ctx)
+
+    next_state, data = idle_state.execute(ctx)
+
+    assert next_state == "error_state"
+    assert data["source_state"] == "dissemination_state"
+    assert data["set_data"] is set_data
+    assert isinstance(data["error"], OSError)
+    assert job_queue.take_failure() is None
+
+#%%
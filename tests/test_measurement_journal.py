@@ -0,0 +1,94 @@
+"""Measurement journal - crash recovery, keyed lookups and which frames get journaled"""
+
+#%% Dependencies:
+
+import time
+
+import pytest
+
+from app_modules.data_storage.measurement_journal import INDEX_ENTRY, MeasurementJournal
+from app_modules.device_connection.serial_manager import SerialFrame, SerialManager
+
+from conftest import build_set
+
+#%% Fixtures:
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return tmp_path / "journal"
+
+
+def journal_specimens(journal, set_data) -> None:
+    for number, specimen in enumerate(set_data.specimens, 1):
+        journal.record_specimen(set_data.input_data.set_id, number, specimen)
+
+#%% Crash Recovery:
+
+def test_reopen_drops_torn_tail_and_keeps_complete_records(ctx, journal_dir):
+    journal = MeasurementJournal(ctx, journal_dir).open()
+    journal_specimens(journal, build_set("S1"))
+    journal.close()
+
+    # Crash mid-write: half a record in the journal, half an index entry:
+    with open(journal.journal_path, "ab") as f:
+        f.write(b'{"kind": "specimen", "key": "S1", "specim')
+    with open(journal.index_path, "ab") as f:
+        f.write(INDEX_ENTRY.pack(0, 1, 0.0, 0)[:7])
+
+    journal = MeasurementJournal(ctx, journal_dir).open()
+    try:
+        assert len(journal) == 3
+        assert [record["specimen_number"] for record in journal.records_for("S1", kind="specimen")] == [1, 2, 3]
+        assert journal.journal_path.read_bytes().endswith(b"\n")
+
+        # Appends continue cleanly after the repaired tail:
+        journal.append("note", key="S1", text="after crash")
+        assert [record["kind"] for record in journal.replay()] == ["specimen"] * 3 + ["note"]
+    finally:
+        journal.close()
+
+
+def test_reopen_indexes_records_written_after_the_last_index_entry(ctx, journal_dir):
+    journal = MeasurementJournal(ctx, journal_dir).open()
+    journal_specimens(journal, build_set("S1"))
+    journal.close()
+
+    # Crash between the data write and the index write of the last record:
+    index = journal.index_path.read_bytes()
+    journal.index_path.write_bytes(index[:-INDEX_ENTRY.size])
+
+    journal = MeasurementJournal(ctx, journal_dir).open()
+    try:
+        assert len(journal) == 3
+        assert len(journal.records_for("S1")) == 3
+    finally:
+        journal.close()
+
+
+def test_records_for_only_returns_the_requested_set(ctx, journal_dir):
+    with MeasurementJournal(ctx, journal_dir).open() as journal:
+        journal_specimens(journal, build_set("S1"))
+        journal_specimens(journal, build_set("S2", loads_kn=(600.0, 610.0)))
+
+        records = journal.records_for("S2", kind="specimen")
+
+    assert [record["key"] for record in records] == ["S2", "S2"]
+    assert records[1]["data"]["press_data"]["load"] == 610000.0
+
+#%% Frame Journaling:
+
+def test_only_frames_consumed_by_an_acquisition_are_journaled(ctx, journal_dir):
+    with MeasurementJournal(ctx, journal_dir).open() as journal:
+        manager = SerialManager(ctx, journal=journal)
+        buffer = manager.get_buffer("scale")
+        for text in (b"7000.0 g", b"7001.0 g"):
+            buffer.put(SerialFrame("scale", text, time.monotonic(), time.time()))
+
+        frame = manager.read_frame("scale", timeout=0.1)
+
+        frames = list(journal.replay(kind="frame"))
+
+    assert frame.payload == b"7000.0 g"
+    assert [record["payload"] for record in frames] == ["7000.0 g"]
+
+#%%
@@ -0,0 +1,76 @@
+"""Press frame parser - reports split across chunks and lines, partial frames, printed test dates"""
+
+#%% Dependencies:
+
+from datetime import date
+
+import pytest
+
+from app_modules.acquisition.press_parser import MAX_PENDING_BYTES, PressFrameParser
+from app_modules.models.press_data import PressData
+
+#%% Fixtures:
+
+REPORT = b"04/02/25       14:34:36   Fm [ kN    ]: 450.25   Rm [ MPa   ]: 20.01\r\n"
+
+
+@pytest.fixture
+def parser():
+    return PressFrameParser(PressData)
+
+#%% Chunk Boundaries:
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, len(REPORT) - 1])
+def test_report_split_at_any_chunk_boundary(parser, chunk_size):
+    stream = REPORT * 3
+    results = []
+    for start in range(0, len(stream), chunk_size):
+        results.extend(parser.feed(stream[start:start + chunk_size]))
+
+    assert [(result.load, result.strength) for result in results] == [(450250.0, 20.01)] * 3
+    assert parser.last_test_date == date(2025, 2, 4)
+
+
+def test_partial_frame_is_held_until_its_line_ends(parser):
+    assert parser.feed(REPORT[:-12]) == []
+    assert parser.feed(REPORT[-12:-2]) == []
+
+    assert len(parser.feed(REPORT[-2:])) == 1
+
+
+def test_report_fields_on_separate_lines(parser):
+    assert parser.feed_line(b"04/02/25       14:34:36") is None
+    assert parser.feed_line(b"Fm [ kN    ]: 45.32") is None
+
+    press_data = parser.feed_line(b"Rm [ MPa   ]: 2.01")
+    assert (press_data.load, press_data.strength) == (45320.0, 2.01)
+    assert parser.last_test_date == date(2025, 2, 4)
+
+
+def test_reset_drops_partial_lines_and_fields(parser):
+    parser.feed(b"Fm [ kN    ]: 45.32\r\nRm [ MP")
+    parser.reset()
+
+    assert parser.feed(b"a   ]: 2.01\r\n") == []
+
+
+def test_overlong_garbage_is_dropped(parser):
+    parser.feed(b"\xff" * (MAX_PENDING_BYTES + 1))
+
+    assert len(parser.feed(REPORT)) == 1
+
+#%% Test Dates:
+
+def test_date_after_another_slash_is_found(parser):
+    parser.feed(b"Rm [ N/mm2 ] 04/02/25  14:34:36\r\n")
+    parser.feed(b"Fm [ kN    ]: 45.32   Rm [ MPa   ]: 2.01\r\n")
+
+    assert parser.last_test_date == date(2025, 2, 4)
+
+
+def test_invalid_date_is_ignored(parser):
+    parser.feed(b"31/02/25       14:34:36   Fm [ kN    ]: 45.32   Rm [ MPa   ]: 2.01\r\n")
+
+    assert parser.last_test_date is None
+
+#%%
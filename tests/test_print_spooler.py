@@ -0,0 +1,144 @@
+"""Print spooler - offline hold, retry with backoff, giving up, resuming after a restart (fake CUPS backend)"""
+
+#%% Dependencies:
+
+import time
+import subprocess
+
+import pytest
+
+from app_modules.output.printing.printer_plugin import FakeCupsBackend, PrintSpooler
+
+#%% Helpers:
+
+def wait_until(condition, timeout=5.0):
+    """Poll condition until it holds (False on timeout)"""
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def printed_requests(backend):
+    """Request directories the fake printer created"""
+
+    return sorted(path for path in backend.output_dir.iterdir() if path.is_dir())
+
+#%% Fixtures:
+
+@pytest.fixture
+def receipt(tmp_path):
+    """One PDF receipt to print"""
+
+    path = tmp_path / "receipts" / "S1.pdf"
+    path.parent.mkdir()
+    path.write_bytes(b"%PDF-1.4")
+    return path
+
+
+@pytest.fixture
+def backend(ctx, tmp_path):
+    """Fake printer writing under tmp_path/printed"""
+
+    return FakeCupsBackend(ctx, tmp_path / "printed")
+
+
+@pytest.fixture
+def make_spooler(ctx, tmp_path, backend):
+    """Spooler factory with no batch window and short retries; stops every spooler it started"""
+
+    spoolers = []
+
+    def make(**options):
+        spooler = PrintSpooler(ctx, tmp_path / "spool", backend, batch_window=0.0, retry_interval=0.01, **options)
+        spoolers.append(spooler)
+        return spooler
+
+    yield make
+    for spooler in spoolers:
+        spooler.stop()
+
+#%% Print Spooler:
+
+def test_offline_printer_holds_jobs_until_it_returns(make_spooler, backend, receipt):
+    backend.online = False
+    spooler = make_spooler()
+    spooler.start()
+    spooler.submit([receipt], "Set S1")
+
+    time.sleep(0.1)
+    assert spooler.pending == 1 and not printed_requests(backend)
+
+    backend.online = True
+    assert wait_until(lambda: spooler.pending == 0)
+    assert len(printed_requests(backend)) == 1
+    assert not list(spooler.spool_dir.glob("*.json"))
+
+
+def test_failed_submission_is_retried(make_spooler, backend, receipt, monkeypatch):
+    submit = backend.submit
+    failures = iter([OSError("lp: broken pipe")])
+
+    def flaky_submit(*args):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return submit(*args)
+
+    monkeypatch.setattr(backend, "submit", flaky_submit)
+    spooler = make_spooler()
+    spooler.start()
+    spooler.submit([receipt], "Set S1")
+
+    assert wait_until(lambda: spooler.pending == 0)
+    assert len(printed_requests(backend)) == 1
+
+
+def test_hanging_status_check_counts_as_a_failed_attempt(make_spooler, backend, receipt, monkeypatch):
+    def hanging_lpstat():
+        raise subprocess.TimeoutExpired(["lpstat", "-d"], 30)
+
+    monkeypatch.setattr(backend, "is_online", hanging_lpstat)
+    spooler = make_spooler(max_attempts=3)
+    spooler.start()
+    spooler.submit([receipt], "Set S1")
+
+    assert wait_until(lambda: spooler.pending == 0)
+    assert spooler._thread.is_alive()  # The spooler survives and keeps serving new jobs
+    assert len(list(spooler.failed_dir.glob("*.json"))) == 1
+
+
+def test_job_gives_up_after_max_attempts(make_spooler, backend, receipt, monkeypatch):
+    def failing_submit(*args):
+        raise OSError("lp: printer on fire")
+
+    monkeypatch.setattr(backend, "submit", failing_submit)
+    spooler = make_spooler(max_attempts=2)
+    spooler.start()
+    spooler.submit([receipt], "Set S1")
+
+    assert wait_until(lambda: spooler.pending == 0)
+    assert not list(spooler.spool_dir.glob("*.json"))
+    assert len(list(spooler.failed_dir.glob("*.json"))) == 1
+    assert not printed_requests(backend)
+
+
+def test_restart_resumes_spooled_jobs(make_spooler, backend, receipt):
+    backend.online = False
+    first = make_spooler()
+    first.start()
+    first.submit([receipt], "Set S1")
+    first.stop()
+    assert len(list(first.spool_dir.glob("*.json"))) == 1
+
+    backend.online = True
+    second = make_spooler()
+    second.start()
+
+    assert wait_until(lambda: second.pending == 0)
+    assert len(printed_requests(backend)) == 1
+
+#%%
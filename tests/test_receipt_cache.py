@@ -0,0 +1,102 @@
+"""Receipt cache - LRU eviction over receipts and batch outputs, spooled receipts kept, registered ones restorable"""
+
+#%% Dependencies:
+
+import os
+import json
+import time
+
+from box import Box
+
+from app_modules.data_storage.registry_manager import RegistryManager
+from app_modules.models.input_data import InputData
+from app_modules.models.press_data import PressData
+from app_modules.models.scale_data import ScaleData
+from app_modules.models.set_data import SetData
+from app_modules.models.specimen_data import SpecimenData
+from app_modules.output.receipt_generation.receipt_cache import ReceiptCache
+from app_modules.output.receipt_generation.receipt_generation_bridge import ReceiptGenerationBridge
+
+from conftest import build_set
+
+DATA_MODELS = (InputData, ScaleData, PressData, SpecimenData, SetData)
+
+#%% Helpers:
+
+def write_receipt(path, age_seconds, size=1024):
+    """Receipt file last used age_seconds ago"""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    used = time.time() - age_seconds
+    os.utime(path, (used, used))
+    return path
+
+#%% Receipt Cache:
+
+def test_eviction_drops_least_recently_used_receipt(ctx, tmp_path):
+    receipts_dir = tmp_path / "receipts"
+    oldest = write_receipt(receipts_dir / "pdf_receipts" / "S1.pdf", 300)
+    middle = write_receipt(receipts_dir / "pdf_receipts" / "S2.pdf", 200)
+    newest = write_receipt(receipts_dir / "excel_receipts" / "S3.xlsx", 100)
+    cache = ReceiptCache(ctx, receipts_dir, max_size_mb=2.5 / 1024)
+
+    assert cache.lookup(oldest) == oldest  # A hit makes it the most recently used
+    removed, freed = cache.evict()
+
+    assert (removed, freed) == (1, 1024)
+    assert oldest.exists() and newest.exists()
+    assert not middle.exists()
+
+
+def test_batch_outputs_count_towards_the_budget(ctx, tmp_path):
+    receipts_dir = tmp_path / "receipts"
+    batch = write_receipt(receipts_dir / "batch_receipts" / "batch_20250515_abc.pdf", 300)
+    receipt = write_receipt(receipts_dir / "pdf_receipts" / "S1.pdf", 100)
+    cache = ReceiptCache(ctx, receipts_dir, max_size_mb=1.5 / 1024)
+
+    assert cache.evict() == (1, 1024)
+    assert not batch.exists()
+    assert receipt.exists()
+
+
+def test_registered_receipt_is_evicted_and_restored_on_demand(ctx, tmp_path):
+    receipts_dir = tmp_path / "receipts"
+    cache = ReceiptCache(ctx, receipts_dir, max_size_mb=1.5 / 1024)
+    bridge = ReceiptGenerationBridge()
+    bridge.ctx, bridge.config, bridge.cache = ctx, Box({"data_storage": {"receipts_dir": receipts_dir}}), cache
+
+    set_data = build_set("S1")
+    registered = write_receipt(cache.path_for(set_data, "PDF"), 300)
+    newer = write_receipt(receipts_dir / "pdf_receipts" / "S2.pdf", 100)
+
+    with RegistryManager(ctx, tmp_path / "registry.sqlite3").open() as registry:
+        registry.add_set(set_data, [registered])
+
+        assert cache.evict() == (1, 1024)  # Over budget: the registry entry does not pin its receipt
+        assert not registered.exists() and newer.exists()
+
+        row = registry.query(set_id="S1")[0]
+        assert bridge.registered_receipts(registry, row, DATA_MODELS) == [registered]
+        assert registered.read_bytes().startswith(b"%PDF")
+
+
+def test_spooled_receipts_are_never_evicted(ctx, tmp_path):
+    receipts_dir = tmp_path / "receipts"
+    spooled = write_receipt(receipts_dir / "pdf_receipts" / "S2.pdf", 10 * 86400)
+    failed = write_receipt(receipts_dir / "excel_receipts" / "S3.xlsx", 10 * 86400)
+    orphan = write_receipt(receipts_dir / "pdf_receipts" / "S4.pdf", 10 * 86400)
+
+    spool_dir = tmp_path / "print_spool"
+    (spool_dir / "failed").mkdir(parents=True)
+    (spool_dir / "1-0001.json").write_text(json.dumps({"job_id": "1-0001", "files": [str(spooled)], "title": "S2"}))
+    (spool_dir / "failed" / "1-0002.json").write_text(json.dumps({"job_id": "1-0002", "files": [str(failed)],
+                                                                    "title": "S3"}))
+
+    cache = ReceiptCache(ctx, receipts_dir, max_age_days=1, spool_dir=spool_dir)
+
+    assert cache.evict() == (1, 1024)
+    assert spooled.exists() and failed.exists()
+    assert not orphan.exists()
+
+#%%
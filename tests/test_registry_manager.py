@@ -0,0 +1,66 @@
+"""Registry manager - set insertion and indexed date-range queries"""
+
+#%% Dependencies:
+
+from datetime import date
+
+import pytest
+
+from app_modules.data_storage.registry_manager import RegistryManager
+
+from conftest import build_set
+
+#%% Fixtures:
+
+@pytest.fixture
+def registry(ctx, tmp_path):
+    """Registry with sets tested in April, May and June 2025"""
+
+    with RegistryManager(ctx, tmp_path / "registry.sqlite3").open() as registry:
+        registry.add_set(build_set("A1", testing_date="30.04.2025", client="Alpha"))
+        registry.add_set(build_set("B1", testing_date="01.05.2025", client="Beta"), ["data/receipts/B1.pdf"])
+        registry.add_set(build_set("A2", testing_date="31.05.2025", client="Alpha", concrete_class="C30/37"))
+        registry.add_set(build_set("A3", testing_date="01.06.2025", client="Alpha"))
+        yield registry
+
+#%% Insertion:
+
+def test_insert_stores_set_specimens_and_statistics(registry):
+    row = registry.query(set_id="B1")[0]
+
+    assert (row["client"], row["testing_date"], row["sampling_date"]) == ("Beta", "2025-05-01", "2025-04-17")
+    assert (row["set_size"], row["specimen_count"]) == (3, 3)
+    assert row["min_strength"] == pytest.approx(20.0)
+    assert row["max_strength"] == pytest.approx(500000.0 / 22500.0)
+    assert row["avg_strength"] == pytest.approx(475000.0 / 22500.0)
+    assert row["receipts"] == ["data/receipts/B1.pdf"]
+    assert row["input_data"]["set_id"] == "B1"
+    assert [specimen["load"] for specimen in registry.get_specimens(row["id"])] == [450000.0, 500000.0, 475000.0]
+
+#%% Date-Range Queries:
+
+def test_date_range_is_inclusive_and_newest_first(registry):
+    rows = registry.query(date_from="01.05.2025", date_to=date(2025, 5, 31))
+
+    assert [row["set_id"] for row in rows] == ["A2", "B1"]
+    assert registry.count(date_from="01.05.2025", date_to="31.05.2025") == 2
+
+
+def test_date_range_combines_with_filters(registry):
+    assert [row["set_id"] for row in registry.query(date_from="01.05.2025", client="Alpha")] == ["A3", "A2"]
+    assert registry.count(date_to="31.05.2025", client="Alpha", concrete_class="C25/30") == 1
+    assert [row["set_id"] for row in registry.query(limit=1)] == ["A3"]
+
+
+def test_specimen_rows_are_oldest_first(registry):
+    rows = registry.specimen_rows(date_from="01.05.2025", date_to="31.05.2025")
+
+    assert [set_row["set_id"] for set_row, _ in rows] == ["B1", "A2"]
+    assert all(len(specimens) == 3 for _, specimens in rows)
+
+
+def test_unknown_filter_is_rejected(ctx, registry):
+    with pytest.raises(ctx.errors.DataStorageError):
+        registry.query(operator="X")
+
+#%%
@@ -0,0 +1,112 @@
+"""Serial manager - line framing across chunks, the bounded frame buffer and the port reader thread"""
+
+#%% Dependencies:
+
+import time
+
+import serial
+from box import Box
+
+from app_modules.device_connection.serial_manager import (FRAME_SIGNATURES, FrameBuffer, LineFramer, SerialFrame,
+                                                          SerialPortReader)
+
+#%% Fakes:
+
+class FakeSerial:
+    """pyserial stand-in replaying scripted chunks, then failing like an unplugged port"""
+
+    chunks = []   # Shared script, consumed across reopen attempts
+    opened = 0
+
+    def __init__(self, **settings):
+        if not FakeSerial.chunks:
+            raise serial.SerialException("could not open port")
+        FakeSerial.opened += 1
+
+    @property
+    def in_waiting(self) -> int:
+        return len(FakeSerial.chunks[0]) if FakeSerial.chunks else 0
+
+    def read(self, size: int) -> bytes:
+        if not FakeSerial.chunks:
+            raise serial.SerialException("device reports readiness to read but returned no data")
+        return FakeSerial.chunks.pop(0)
+
+    def close(self) -> None:
+        pass
+
+
+def frame(timestamp: float, payload: bytes = b"7649.0 g") -> SerialFrame:
+    """Frame completed at a given monotonic time"""
+
+    return SerialFrame("scale", payload, timestamp, timestamp)
+
+#%% Line Framer:
+
+def test_lines_split_across_chunks_are_reassembled():
+    framer = LineFramer()
+
+    assert framer.feed(b"764") == []
+    assert framer.feed(b"9.0 g\r\n75") == [b"7649.0 g"]
+    assert framer.feed(b"10.5 g\r\n\r\nFm [ kN ]: 4") == [b"7510.5 g"]  # Blank lines are skipped
+    assert framer.feed(b"5.32\n") == [b"Fm [ kN ]: 45.32"]
+
+
+def test_reset_drops_the_partial_line():
+    framer = LineFramer()
+    framer.feed(b"7649")
+    framer.reset()
+
+    assert framer.feed(b".0 g\n") == [b".0 g"]
+
+#%% Frame Buffer:
+
+def test_full_buffer_overwrites_and_counts_the_oldest_frames():
+    buffer = FrameBuffer(maxlen=2)
+    for timestamp in (1.0, 2.0, 3.0):
+        buffer.put(frame(timestamp))
+
+    assert buffer.dropped == 1
+    assert [item.timestamp for item in buffer.drain()] == [2.0, 3.0]
+
+
+def test_get_skips_frames_older_than_the_prompt():
+    buffer = FrameBuffer()
+    for timestamp in (1.0, 2.0, 3.0):
+        buffer.put(frame(timestamp))
+
+    assert buffer.get(timeout=0, newer_than=2.5).timestamp == 3.0
+    assert len(buffer) == 0
+
+
+def test_get_times_out_on_an_empty_buffer():
+    started = time.monotonic()
+
+    assert FrameBuffer().get(timeout=0.05) is None
+    assert time.monotonic() - started >= 0.05
+
+#%% Port Reader:
+
+def test_reader_frames_chunks_and_reports_connection_changes(ctx, monkeypatch):
+    monkeypatch.setattr(serial, "Serial", FakeSerial)
+    FakeSerial.chunks, FakeSerial.opened = [b"7649.0 g\r\n76", b"50.5\r\n", b"7651"], 0
+
+    events = []
+    config = Box({"port": "/dev/ttyACM1", "baudrate": 9600, "timeout": 0.01, "reconnect_delay": 60})
+    reader = SerialPortReader(ctx, "scale", config, on_event=events.append, signature=FRAME_SIGNATURES["scale"])
+    reader.start()
+    try:
+        assert reader.buffer.get(timeout=2).payload == b"7649.0 g"
+        assert reader.buffer.get(timeout=2).payload == b"7650.5"
+        assert reader.buffer.get(timeout=0.1) is None  # "7651" never completed a line
+
+        deadline = time.monotonic() + 2
+        while reader.connected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not reader.connected
+        assert [event.connected for event in events] == [True, False]
+        assert reader.frames_recognized == 2
+    finally:
+        reader.stop()
+
+#%%
@@ -0,0 +1,115 @@
+"""Scale/press scheduling - committed masses and results stay tied to the right specimen"""
+
+#%% Dependencies:
+
+import threading
+
+from app_modules.acquisition.scale_stability import ScaleStabilityDetector, OCCUPIED, STABLE
+from app_modules.acquisition.specimen_scheduler import SpecimenScheduler
+from app_modules.models.press_data import PressData
+from app_modules.models.scale_data import ScaleData
+from app_modules.models.specimen_data import SpecimenData
+from app_modules.states.acquisition_state import CubeCompressionHandler
+
+from conftest import ScriptedDeviceManager
+
+#%% Helpers:
+
+SCALE_RATE = 10  # Frames per second of the scripted scale stream
+
+
+def grams(mass: float, seconds: float) -> list:
+    """Scale frames for a constant reading held for a number of seconds"""
+
+    return [f"{mass:.1f} g"] * int(seconds * SCALE_RATE)
+
+
+def press_report(load_kn: float, strength: float) -> list:
+    """Press frames of one test report"""
+
+    return [f"Fm [ kN    ]: {load_kn:.2f}", f"Rm [ MPa   ]: {strength:.2f}"]
+
+
+def handler_for(frames: dict) -> CubeCompressionHandler:
+    return CubeCompressionHandler(ScaleData, PressData, SpecimenData, ScriptedDeviceManager(frames))
+
+#%% Stability Detector:
+
+def test_detector_ignores_previous_specimen_until_removed():
+    detector = ScaleStabilityDetector(window_size=5)
+    detector.expect_removal(7.0)
+
+    assert {detector.update(7.0) for _ in range(20)} == {OCCUPIED}
+    detector.update(0.0)
+    statuses = [detector.update(7.5) for _ in range(5)]
+
+    assert statuses[-1] == STABLE
+    assert detector.committed == 7.5
+
+
+def test_detector_accepts_clearly_different_mass_without_removal():
+    detector = ScaleStabilityDetector(window_size=5, min_change=0.05)
+    detector.expect_removal(7.0)
+
+    statuses = [detector.update(7.5) for _ in range(5)]
+
+    assert statuses[-1] == STABLE
+    assert detector.committed == 7.5
+
+#%% Handler:
+
+def test_next_specimen_does_not_recommit_previous_mass(ctx, user_messages):
+    # 7000 g stays on the pan for 2 s after its reading, then the scale empties and 7500 g is placed:
+    handler = handler_for({"scale": grams(7000.0, 2) + grams(0.0, 0.3) + grams(7500.0, 1)})
+
+    first = handler.read_scale(ctx, 1)
+    second = handler.read_scale(ctx, 2)
+
+    assert first.mass == 7.0
+    assert second.mass == 7.5
+    assert any("Remove the previous specimen" in message for _, message in user_messages)
+
+
+def test_press_report_date_is_checked_against_the_testing_date(ctx, user_messages):
+    handler = handler_for({"press": ["04/02/25       14:34:36"] + press_report(450.0, 20.0)})
+    handler.testing_date = "05.02.2025"
+
+    assert handler.read_press(ctx, 1).load == 450000.0
+    assert any("Press report dated 04.02.2025" in message for _, message in user_messages)
+
+#%% Scheduler:
+
+def test_scheduler_keeps_masses_and_loads_with_their_specimens(ctx):
+    frames = {"scale": grams(7000.0, 2) + grams(0.0, 0.3) + grams(7500.0, 2) + grams(0.0, 0.3) + grams(7200.0, 1),
+              "press": press_report(450.0, 20.0) + press_report(500.0, 22.22) + press_report(475.0, 21.11)}
+    scheduler = SpecimenScheduler(ctx, handler_for(frames), first_index=0, set_size=3)
+
+    results = list(scheduler.run())
+
+    assert [index for index, _ in results] == [0, 1, 2]
+    assert [specimen.scale_data.mass for _, specimen in results] == [7.0, 7.5, 7.2]
+    assert [specimen.press_data.load for _, specimen in results] == [450000.0, 500000.0, 475000.0]
+    assert scheduler.tracker.weighed == scheduler.tracker.pressed == [0, 1, 2]
+
+
+def test_scheduler_presses_in_weighing_order_when_the_press_is_slow(ctx):
+    class SlowPressHandler:
+        cancelled = threading.Event()
+
+        def weigh_specimen(self, ctx, number):
+            return ScaleData(mass=float(number))
+
+        def press_specimen(self, ctx, number, scale_data):
+            if number == 1:
+                self.cancelled.wait(0.05)  # Scale runs ahead while the first specimen is in the press
+            return SpecimenData(scale_data=scale_data, press_data=PressData(load=number * 1000.0, strength=number))
+
+    scheduler = SpecimenScheduler(ctx, SlowPressHandler(), first_index=1, set_size=4)
+
+    results = list(scheduler.run())
+
+    assert [index for index, _ in results] == [1, 2, 3]
+    assert [specimen.scale_data.mass for _, specimen in results] == [2.0, 3.0, 4.0]
+    assert [specimen.press_data.load for _, specimen in results] == [2000.0, 3000.0, 4000.0]
+
+#%%
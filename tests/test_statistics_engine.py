@@ -0,0 +1,75 @@
+"""Statistics engine - receipt averages, running set statistics and conformity scope"""
+
+#%% Dependencies:
+
+import statistics
+
+import pytest
+
+from app_modules.models.statistics_engine import class_statistics, statistics_for
+from app_modules.output.receipt_generation.pdf_generation import BeamCompression, BeamFlexural, CubeCompression
+from app_modules.output.receipt_generation.receipt_generation_bridge import ReceiptGenerationBridge
+
+from conftest import build_set
+
+#%% Fixtures:
+
+@pytest.fixture
+def receipt_data(ctx):
+    """The bridge's receipt format for a SetData (what the PDF modules receive)"""
+
+    bridge = ReceiptGenerationBridge()
+    bridge.ctx = ctx
+    return bridge._convert_to_receipt_format
+
+#%% Receipt Averages:
+
+def test_cube_receipt_averages_are_computed_from_printed_values(receipt_data):
+    set_data = build_set(loads_kn=(450.123, 500.0, 475.0))
+    set_data.specimens[1].scale_data.mass = 7.561
+    processed = CubeCompression.process_test_data(receipt_data(set_data))
+
+    assert processed["forces"] == [450100.0, 500000.0, 475000.0]  # kN printed with one decimal
+    assert processed["averages"]["force"] == 475033.33
+    assert processed["averages"]["density"] == round(statistics.fmean(processed["densities"]), 2)
+    assert processed["averages"]["weight"] == round(statistics.fmean(processed["weights"]), 2)
+
+
+@pytest.mark.parametrize("module, columns", [(BeamCompression, 6), (BeamFlexural, 3)])
+def test_beam_receipt_average_matches_displayed_columns(receipt_data, module, columns):
+    loads = tuple(400.0 + 10.0 * index for index in range(columns + 2))  # More specimens than the receipt shows
+    processed = module.process_test_data(receipt_data(build_set(loads_kn=loads, protocol="beam_compression_testing")))
+
+    displayed = processed["forces"]
+    assert len(displayed) == columns
+    assert processed["averages"]["force"] == pytest.approx(statistics.fmean(displayed))
+    assert processed["averages"]["strength"] == pytest.approx(statistics.fmean(processed["strengths"]), abs=0.005)
+
+#%% Running Set Statistics:
+
+def test_running_statistics_follow_specimen_changes():
+    set_data = build_set(loads_kn=(450.0, 500.0, 475.0))
+    other = build_set(loads_kn=(300.0, 600.0)).specimens
+    assert set_data.statistics.load.mean == pytest.approx(475000.0)
+
+    set_data.specimens[0] = other[0]  # Replaced in place - same count
+    assert set_data.statistics.load.mean == pytest.approx(425000.0)
+
+    set_data.specimens.pop(1)  # Removed and refilled - same count again
+    set_data.specimens.append(other[1])
+    assert set_data.statistics.load.mean == pytest.approx(458333.333)
+
+    set_data.specimens.append(other[1])  # Appended directly (loaders) - folded in
+    assert set_data.statistics.load.count == 4
+
+#%% Conformity Scope:
+
+def test_conformity_is_only_checked_for_cube_compression():
+    cube = statistics_for(build_set("C1", (900.0, 920.0, 940.0)))
+    beam = statistics_for(build_set("B1", (900.0, 920.0, 940.0), protocol="beam_compression_testing"))
+
+    assert cube.conformity is not None
+    assert beam.conformity is None
+    assert class_statistics([cube, beam])["C25/30"].sets == 1
+
+#%%